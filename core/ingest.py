@@ -1,5 +1,5 @@
 #!/usr/bin/env python
-import os,sys,asyncio,httpx
+import os,sys,glob,time,asyncio,httpx
 from dotenv import load_dotenv
 load_dotenv()
 OLLAMA=os.getenv("LLM_BINDING_HOST","http://ollama:11434")
@@ -9,33 +9,140 @@ EMB=os.getenv("EMBEDDING_MODEL","nomic-embed-text")
 DIM=int(os.getenv("EMBEDDING_DIM","768"))
 WDIR=os.getenv("WORKING_DIR","./rag_storage")
 ODIR=os.getenv("OUTPUT_DIR","./output")
+EMB_BATCH_TOKENS=int(os.getenv("EMBEDDING_BATCH_TOKENS","8192"))  # ~4 chars/token estimate
+EMB_BATCH_MAX=int(os.getenv("EMBEDDING_BATCH_MAX","64"))
+EMB_CONCURRENCY=int(os.getenv("EMBEDDING_CONCURRENCY","4"))
+PARSE_WORKERS=int(os.getenv("INGEST_PARSE_WORKERS","2"))
+DESCRIBE_WORKERS=int(os.getenv("INGEST_DESCRIBE_WORKERS","4"))
+INSERT_WORKERS=int(os.getenv("INGEST_INSERT_WORKERS","1"))  # LightRAG serialises inserts; >1 only overlaps embedding I/O
+QUEUE_SIZE=int(os.getenv("INGEST_QUEUE_SIZE","4"))  # parsed docs held in memory between stages
+REPORT_S=float(os.getenv("INGEST_REPORT_INTERVAL_S","30"))
 from raganything import RAGAnything,RAGAnythingConfig
+from raganything.utils import separate_content,insert_text_content
 from lightrag.utils import EmbeddingFunc
+_client=None
+_emb_sem=None
+def client():
+    # One pooled client for all generate/embed calls (keep-alive, no per-call TLS/TCP setup)
+    global _client
+    if _client is None:_client=httpx.AsyncClient(timeout=600,limits=httpx.Limits(max_connections=32,max_keepalive_connections=16))
+    return _client
 async def ogen(model,prompt,sys_p=None,imgs=None):
-    async with httpx.AsyncClient(timeout=600) as c:
-        p={"model":model,"prompt":prompt,"stream":False,"options":{"temperature":0,"num_ctx":4096}}
-        if sys_p:p["system"]=sys_p
-        if imgs:p["images"]=imgs
-        r=await c.post(f"{OLLAMA}/api/generate",json=p)
-        return r.json().get("response","")
+    p={"model":model,"prompt":prompt,"stream":False,"options":{"temperature":0,"num_ctx":4096}}
+    if sys_p:p["system"]=sys_p
+    if imgs:p["images"]=imgs
+    r=await client().post(f"{OLLAMA}/api/generate",json=p)
+    return r.json().get("response","")
+def emb_batches(texts):
+    # Token-budgeted batches of indices; a single oversized text still gets its own batch
+    b,tok=[],0
+    for i,t in enumerate(texts):
+        n=len(t)//4+1
+        if b and (tok+n>EMB_BATCH_TOKENS or len(b)>=EMB_BATCH_MAX):yield b;b,tok=[],0
+        b.append(i);tok+=n
+    if b:yield b
+async def emb_batch(texts,idx):
+    global _emb_sem
+    if _emb_sem is None:_emb_sem=asyncio.Semaphore(EMB_CONCURRENCY)
+    async with _emb_sem:
+        t0=time.perf_counter()
+        r=await client().post(f"{OLLAMA}/api/embed",json={"model":EMB,"input":[texts[i] for i in idx]})
+        r.raise_for_status()
+        embs=r.json()["embeddings"]
+        print(f"  embed batch: {len(idx)} texts in {(time.perf_counter()-t0)*1000:.0f}ms")
+    return embs
 async def oemb(texts):
-    embs=[]
-    async with httpx.AsyncClient(timeout=300) as c:
-        for t in texts:
-            r=await c.post(f"{OLLAMA}/api/embed",json={"model":EMB,"input":t})
-            embs.append(r.json()["embeddings"][0])
+    batches=list(emb_batches(texts))
+    results=await asyncio.gather(*[emb_batch(texts,b) for b in batches])
+    embs=[None]*len(texts)
+    for b,r in zip(batches,results):
+        for i,e in zip(b,r):embs[i]=e
     return embs
 async def llm_fn(prompt,system_prompt=None,**kw):
     return await ogen(LLM,prompt,system_prompt)
 async def vlm_fn(prompt,system_prompt=None,image_data=None,**kw):
     if image_data:return await ogen(VLM,prompt,system_prompt,[image_data])
     return await llm_fn(prompt,system_prompt)
-async def process(fpath):
-    print(f"Processing:{fpath}")
+def expand(args,exts):
+    # Files as given; directories walked recursively and globs expanded, both filtered by extension
+    out=[]
+    for a in args:
+        if os.path.isdir(a):ps=[os.path.join(d,f) for d,_,fs in os.walk(a) for f in fs]
+        elif any(c in a for c in "*?["):ps=glob.glob(a,recursive=True)
+        else:out.append(a);continue
+        out+=sorted(p for p in ps if os.path.isfile(p) and os.path.splitext(p)[1].lower() in exts)
+    return list(dict.fromkeys(out))
+STATS={s:{"done":0,"skipped":0,"failed":0,"busy":0.0} for s in ("parse","describe","insert")}
+async def stage(name,fn,qin,qout,workers,next_workers):
+    # Pull until a None sentinel per worker, then hand one sentinel to each downstream worker
+    st=STATS[name]
+    async def worker():
+        while (doc:=await qin.get()) is not None:
+            t0=time.perf_counter()
+            try:out=await fn(doc)
+            except Exception as e:
+                st["failed"]+=1;print(f"  [{name}] {doc['path']} failed: {e}");continue
+            finally:st["busy"]+=time.perf_counter()-t0
+            if out is None:st["skipped"]+=1;continue
+            st["done"]+=1
+            if qout is not None:await qout.put(out)
+    await asyncio.gather(*[worker() for _ in range(workers)])
+    if qout is not None:
+        for _ in range(next_workers):await qout.put(None)
+def report(t0,queues=None):
+    wall=time.perf_counter()-t0
+    q=" | queues "+" ".join(f"{k}={v.qsize()}" for k,v in queues.items()) if queues else ""
+    print(f"[{wall:.0f}s]"+q)
+    for name,st in STATS.items():
+        rate=st["done"]/wall*60 if wall else 0
+        per=st["busy"]/max(st["done"]+st["failed"],1)
+        print(f"  {name:<8} done={st['done']} skipped={st['skipped']} failed={st['failed']} {rate:.1f} docs/min {per:.1f}s/doc busy={st['busy']:.0f}s")
+async def pipeline(rag,paths):
+    q_parse,q_describe,q_insert=asyncio.Queue(QUEUE_SIZE),asyncio.Queue(QUEUE_SIZE),asyncio.Queue(QUEUE_SIZE)
+    async def parse(doc):
+        cl,doc_id=await rag.parse_document(doc["path"],ODIR,"auto",False)
+        text,items=separate_content(cl)
+        return {**doc,"content_list":cl,"doc_id":doc_id,"text":text,"items":items,"ref":rag._get_file_reference(doc["path"])}
+    async def describe(doc):
+        # VLM/LLM calls only; storage writes are left to the insert stage
+        if await rag.is_document_fully_processed(doc["doc_id"]):print(f"  [describe] {doc['path']} already processed");return None
+        doc["descriptions"]=await rag.generate_multimodal_descriptions(doc["items"],doc["ref"],doc["content_list"]) if doc["items"] else []
+        doc["content_list"]=None
+        return doc
+    async def insert(doc):
+        if doc["text"].strip():await insert_text_content(rag.lightrag,input=doc["text"],file_paths=doc["ref"],ids=doc["doc_id"])
+        await rag.insert_multimodal_descriptions(doc["descriptions"],doc["ref"],doc["doc_id"])
+        await rag._mark_multimodal_processing_complete(doc["doc_id"])
+        print(f"  [insert] {doc['path']} ({len(doc['descriptions'])} multimodal)")
+        return doc
+    async def feed():
+        for p in paths:await q_parse.put({"path":p})
+        for _ in range(PARSE_WORKERS):await q_parse.put(None)
+    t0=time.perf_counter()
+    async def reporter():
+        while True:await asyncio.sleep(REPORT_S);report(t0,{"parse":q_parse,"describe":q_describe,"insert":q_insert})
+    rep=asyncio.create_task(reporter())
+    try:
+        await asyncio.gather(feed(),
+            stage("parse",parse,q_parse,q_describe,PARSE_WORKERS,DESCRIBE_WORKERS),
+            stage("describe",describe,q_describe,q_insert,DESCRIBE_WORKERS,INSERT_WORKERS),
+            stage("insert",insert,q_insert,None,INSERT_WORKERS,0))
+    finally:rep.cancel()
+    report(t0)
+async def process(args):
     cfg=RAGAnythingConfig(working_dir=WDIR,parser="mineru",parse_method="auto",enable_image_processing=True,enable_table_processing=True,enable_equation_processing=True)
+    paths=expand(args,{e.strip().lower() for e in cfg.supported_file_extensions})
+    if not paths:print("No matching files");return
+    print(f"Processing {len(paths)} file(s): parse={PARSE_WORKERS} describe={DESCRIBE_WORKERS} insert={INSERT_WORKERS} queue={QUEUE_SIZE}")
     rag=RAGAnything(config=cfg,llm_model_func=llm_fn,vision_model_func=vlm_fn,embedding_func=EmbeddingFunc(embedding_dim=DIM,max_token_size=8192,func=oemb))
-    await rag.process_document_complete(file_path=fpath,output_dir=ODIR,parse_method="auto",display_stats=True)
+    try:
+        r=await rag._ensure_lightrag_initialized()
+        if r and not r.get("success",True):print(r["error"]);return
+        await pipeline(rag,paths)
+    finally:
+        await rag.finalize_storages()
+        if _client is not None:await _client.aclose()
     print("Done!")
 if __name__=="__main__":
-    if len(sys.argv)<2:print("Usage:python ingest.py <file>");sys.exit(1)
-    asyncio.run(process(sys.argv[1]))
+    if len(sys.argv)<2:print("Usage:python ingest.py <file|dir|glob> [...]");sys.exit(1)
+    asyncio.run(process(sys.argv[1:]))
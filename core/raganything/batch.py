@@ -26,6 +26,7 @@ class BatchMixin:
     # Type hints for methods that will be available from other mixins
     async def _ensure_lightrag_initialized(self) -> None: ...
     async def process_document_complete(self, file_path: str, **kwargs) -> None: ...
+    async def flush_doc_status(self) -> None: ...
 
     # ==========================================
     # ORIGINAL BATCH PROCESSING METHOD (RESTORED)
@@ -144,6 +145,9 @@ class BatchMixin:
         # Wait for all tasks to complete
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        # Batch boundary: write the doc_status updates buffered for these files
+        await self.flush_doc_status()
+
         # Process results
         successful_files = []
         failed_files = []
@@ -212,6 +216,10 @@ class BatchMixin:
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            group_small_files=self.config.batch_group_small_files,
+            small_file_max_pages=self.config.batch_small_file_max_pages,
+            small_file_max_mb=self.config.batch_small_file_max_mb,
+            max_group_size=self.config.batch_max_group_size,
         )
 
         # Process batch
@@ -264,6 +272,10 @@ class BatchMixin:
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            group_small_files=self.config.batch_group_small_files,
+            small_file_max_pages=self.config.batch_small_file_max_pages,
+            small_file_max_mb=self.config.batch_small_file_max_mb,
+            max_group_size=self.config.batch_max_group_size,
         )
 
         # Process batch asynchronously
@@ -390,6 +402,9 @@ class BatchMixin:
                         "processed": False,
                     }
 
+        # Batch boundary: write the doc_status updates buffered for these files
+        await self.flush_doc_status()
+
         processing_time = time.time() - start_time
 
         return {
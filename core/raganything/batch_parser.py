@@ -5,6 +5,8 @@ This module provides functionality for processing multiple documents in parallel
 with progress reporting and error handling.
 """
 
+import os
+import shutil
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -15,7 +17,7 @@ import time
 
 from tqdm import tqdm
 
-from .parser import MineruParser, DoclingParser
+from .parser import MineruParser, DoclingParser, MineruExecutionError
 
 
 @dataclass
@@ -63,6 +65,10 @@ class BatchParser:
         show_progress: bool = True,
         timeout_per_file: int = 300,
         skip_installation_check: bool = False,
+        group_small_files: bool = False,
+        small_file_max_pages: int = 20,
+        small_file_max_mb: float = 5.0,
+        max_group_size: int = 16,
     ):
         """
         Initialize batch parser
@@ -73,11 +79,20 @@ class BatchParser:
             show_progress: Whether to show progress bars
             timeout_per_file: Timeout in seconds for each file
             skip_installation_check: Skip parser installation check (useful for testing)
+            group_small_files: Parse small PDFs/images in groups, one MinerU
+                invocation per group (MinerU only)
+            small_file_max_pages: PDFs with more pages are parsed individually
+            small_file_max_mb: Files larger than this are parsed individually
+            max_group_size: Maximum number of files per MinerU invocation
         """
         self.parser_type = parser_type
         self.max_workers = max_workers
         self.show_progress = show_progress
         self.timeout_per_file = timeout_per_file
+        self.group_small_files = group_small_files and parser_type == "mineru"
+        self.small_file_max_pages = small_file_max_pages
+        self.small_file_max_mb = small_file_max_mb
+        self.max_group_size = max_group_size
         self.logger = logging.getLogger(__name__)
 
         # Initialize parser
@@ -178,6 +193,11 @@ class BatchParser:
             file_output_dir = Path(output_dir) / file_name
             file_output_dir.mkdir(parents=True, exist_ok=True)
 
+            # MinerU kills its own process group at the per-file timeout,
+            # so a stuck parse does not keep running after as_completed gives up
+            if isinstance(self.parser, MineruParser):
+                kwargs.setdefault("timeout", self.timeout_per_file)
+
             # Parse the document
             content_list = self.parser.parse_document(
                 file_path=file_path,
@@ -200,6 +220,171 @@ class BatchParser:
             self.logger.error(error_msg)
             return False, file_path, error_msg
 
+    # Formats MinerU reads directly from a staging directory
+    GROUPABLE_FORMATS = {".pdf", ".png", ".jpg", ".jpeg"}
+
+    def _is_small_file(self, file_path: str) -> bool:
+        path = Path(file_path)
+        if path.suffix.lower() not in self.GROUPABLE_FORMATS:
+            return False
+        if path.stat().st_size > self.small_file_max_mb * 1024 * 1024:
+            return False
+        if path.suffix.lower() == ".pdf":
+            pages = MineruParser._count_pdf_pages(path)
+            if pages is not None and pages > self.small_file_max_pages:
+                return False
+        return True
+
+    def plan_file_groups(
+        self, file_paths: List[str], parse_method: str = "auto"
+    ) -> Tuple[List[Tuple[str, List[str]]], List[str]]:
+        """
+        Split files into MinerU groups and files to parse one by one
+
+        Small files are grouped per parse method (images always use OCR, like
+        parse_image). A group never holds two files with the same stem, since
+        MinerU names its output directories by stem.
+
+        Returns:
+            Tuple of ([(method, group files)], individual files)
+        """
+        groups: List[Tuple[str, List[str]]] = []
+        open_groups: Dict[str, List[Tuple[List[str], set]]] = {}
+        singles = []
+
+        for file_path in file_paths:
+            if not self._is_small_file(file_path):
+                singles.append(file_path)
+                continue
+            path = Path(file_path)
+            method = "ocr" if path.suffix.lower() != ".pdf" else parse_method
+            for files, stems in open_groups.setdefault(method, []):
+                if len(files) < self.max_group_size and path.stem not in stems:
+                    break
+            else:
+                files, stems = [], set()
+                open_groups[method].append((files, stems))
+                groups.append((method, files))
+            files.append(file_path)
+            stems.add(path.stem)
+
+        # A group of one gains nothing over the normal path
+        for method, files in list(groups):
+            if len(files) == 1:
+                groups.remove((method, files))
+                singles.extend(files)
+        return groups, singles
+
+    def process_file_group(
+        self,
+        file_paths: List[str],
+        output_dir: str,
+        parse_method: str = "auto",
+        group_index: int = 0,
+        **kwargs,
+    ) -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Parse several small files with a single MinerU invocation
+
+        The files are linked into a staging directory that is passed to
+        ``mineru -p``. Each file's output is then moved to where
+        process_single_file would have written it and read back with
+        _read_output_files. Files without output, or all files when the
+        invocation fails, are parsed individually instead.
+
+        Args:
+            file_paths: Files of one group (unique stems)
+            output_dir: Base output directory
+            parse_method: Parsing method for the group
+            group_index: Used to name the staging directory
+            **kwargs: Additional parser arguments
+
+        Returns:
+            List of (success, file_path, error_message) per file
+        """
+        start_time = time.time()
+        staging_root = Path(output_dir) / ".batch_staging" / f"group_{group_index:04d}"
+        input_dir = staging_root / "input"
+        group_output = staging_root / "output"
+        shutil.rmtree(staging_root, ignore_errors=True)
+        input_dir.mkdir(parents=True)
+        group_output.mkdir(parents=True)
+
+        results = []
+        try:
+            for file_path in file_paths:
+                source = Path(file_path).resolve()
+                staged = input_dir / source.name
+                try:
+                    os.link(source, staged)
+                except OSError:
+                    try:
+                        os.symlink(source, staged)
+                    except OSError:
+                        shutil.copy2(source, staged)
+
+            group_kwargs = dict(kwargs)
+            group_kwargs.setdefault("timeout", self.timeout_per_file * len(file_paths))
+            self.parser._run_mineru_command(
+                input_path=input_dir,
+                output_dir=group_output,
+                method=parse_method,
+                **group_kwargs,
+            )
+
+            read_method = (
+                "vlm" if (kwargs.get("backend") or "").startswith("vlm-") else parse_method
+            )
+            for file_path in file_paths:
+                stem = Path(file_path).stem
+                # Same layout as process_single_file: <output>/<stem>/<stem>/<method>
+                file_output_dir = Path(output_dir) / stem
+                target = file_output_dir / stem
+                produced = group_output / stem
+                if not produced.exists():
+                    continue
+                try:
+                    file_output_dir.mkdir(parents=True, exist_ok=True)
+                    shutil.rmtree(target, ignore_errors=True)
+                    shutil.move(str(produced), str(target))
+
+                    content_list, _ = self.parser._read_output_files(
+                        file_output_dir, stem, method=read_method
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Could not collect group output for {file_path}: {e}"
+                    )
+                    continue
+                if content_list:
+                    results.append((True, file_path, None))
+
+            self.logger.info(
+                f"Parsed group of {len(file_paths)} files with one MinerU run "
+                f"({len(results)} ok, {len(file_paths) - len(results)} to retry, "
+                f"{time.time() - start_time:.2f}s)"
+            )
+
+        except (MineruExecutionError, RuntimeError, OSError) as e:
+            self.logger.warning(
+                f"Group of {len(file_paths)} files failed ({e}), parsing them individually"
+            )
+        finally:
+            shutil.rmtree(staging_root, ignore_errors=True)
+            try:
+                staging_root.parent.rmdir()  # Last group out removes .batch_staging
+            except OSError:
+                pass
+
+        # Every file the group run did not deliver is parsed on its own
+        parsed = {file_path for _, file_path, _ in results}
+        fallback = [file_path for file_path in file_paths if file_path not in parsed]
+        for file_path in fallback:
+            results.append(
+                self.process_single_file(file_path, output_dir, parse_method, **kwargs)
+            )
+        return results
+
     def process_batch(
         self,
         file_paths: List[str],
@@ -257,45 +442,73 @@ class BatchParser:
                 unit="file",
             )
 
+        # Group small files into shared MinerU invocations if enabled
+        if self.group_small_files:
+            groups, single_files = self.plan_file_groups(supported_files, parse_method)
+            if groups:
+                self.logger.info(
+                    f"Parsing {sum(len(f) for _, f in groups)} small files in "
+                    f"{len(groups)} groups, {len(single_files)} individually"
+                )
+        else:
+            groups, single_files = [], supported_files
+
+        # Tasks queue behind max_workers, so the wait covers every wave of the
+        # longest task. A group may also re-parse all its files individually.
+        task_budgets = [2 * self.timeout_per_file * len(files) for _, files in groups]
+        task_budgets += [self.timeout_per_file] * len(single_files)
+        waves = -(-len(task_budgets) // self.max_workers)
+        batch_timeout = max(task_budgets) * waves
+
+        future_to_file = {}
         try:
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_file = {
-                    executor.submit(
+                # Submit all tasks; each future maps to the files it covers
+                for index, (method, group_files) in enumerate(groups):
+                    future = executor.submit(
+                        self.process_file_group,
+                        group_files,
+                        output_dir,
+                        method,
+                        index,
+                        **kwargs,
+                    )
+                    future_to_file[future] = group_files
+                for file_path in single_files:
+                    future = executor.submit(
                         self.process_single_file,
                         file_path,
                         output_dir,
                         parse_method,
                         **kwargs,
-                    ): file_path
-                    for file_path in supported_files
-                }
+                    )
+                    future_to_file[future] = [file_path]
 
                 # Process completed tasks
-                for future in as_completed(
-                    future_to_file, timeout=self.timeout_per_file
-                ):
-                    success, file_path, error_msg = future.result()
-
-                    if success:
-                        successful_files.append(file_path)
-                    else:
-                        failed_files.append(file_path)
-                        errors[file_path] = error_msg
+                for future in as_completed(future_to_file, timeout=batch_timeout):
+                    outcome = future.result()
+                    outcomes = outcome if isinstance(outcome, list) else [outcome]
+
+                    for success, file_path, error_msg in outcomes:
+                        if success:
+                            successful_files.append(file_path)
+                        else:
+                            failed_files.append(file_path)
+                            errors[file_path] = error_msg
 
                     if pbar:
-                        pbar.update(1)
+                        pbar.update(len(outcomes))
 
         except Exception as e:
             self.logger.error(f"Batch processing failed: {str(e)}")
             # Mark remaining files as failed
-            for future in future_to_file:
+            for future, files in future_to_file.items():
                 if not future.done():
-                    file_path = future_to_file[future]
-                    failed_files.append(file_path)
-                    errors[file_path] = f"Processing interrupted: {str(e)}"
+                    for file_path in files:
+                        failed_files.append(file_path)
+                        errors[file_path] = f"Processing interrupted: {str(e)}"
                     if pbar:
-                        pbar.update(1)
+                        pbar.update(len(files))
 
         finally:
             if pbar:
@@ -386,6 +599,26 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=300, help="Timeout per file (seconds)"
     )
+    parser.add_argument(
+        "--group-small-files",
+        action="store_true",
+        help="Parse small PDFs/images with one MinerU run per group",
+    )
+    parser.add_argument(
+        "--small-file-max-pages",
+        type=int,
+        default=20,
+        help="Max pages of a PDF to be grouped",
+    )
+    parser.add_argument(
+        "--small-file-max-mb",
+        type=float,
+        default=5.0,
+        help="Max size (MB) of a file to be grouped",
+    )
+    parser.add_argument(
+        "--max-group-size", type=int, default=16, help="Max files per MinerU run"
+    )
 
     args = parser.parse_args()
 
@@ -402,6 +635,10 @@ def main():
             max_workers=args.workers,
             show_progress=not args.no_progress,
             timeout_per_file=args.timeout,
+            group_small_files=args.group_small_files,
+            small_file_max_pages=args.small_file_max_pages,
+            small_file_max_mb=args.small_file_max_mb,
+            max_group_size=args.max_group_size,
         )
 
         # Process files
@@ -5,7 +5,7 @@ Contains configuration dataclasses with environment variable support
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 from lightrag.utils import get_env_value
 
 
@@ -29,11 +29,62 @@ class RAGAnythingConfig:
     parser: str = field(default=get_env_value("PARSER", "mineru", str))
     """Parser selection: 'mineru' or 'docling'."""
 
+    mineru_timeout: int = field(default=get_env_value("MINERU_TIMEOUT", 0, int))
+    """Seconds before a MinerU parse is killed (whole process group); 0 disables."""
+
+    mineru_workers: int = field(default=get_env_value("MINERU_WORKERS", 0, int))
+    """Warm MinerU worker processes that keep models loaded; 0 runs the CLI per document."""
+
+    mineru_worker_max_jobs: int = field(
+        default=get_env_value("MINERU_WORKER_MAX_JOBS", 50, int)
+    )
+    """Recycle a MinerU worker after this many documents (0 = never)."""
+
+    mineru_worker_max_memory_mb: int = field(
+        default=get_env_value("MINERU_WORKER_MAX_MEMORY_MB", 2048, int)
+    )
+    """Recycle a MinerU worker whose memory grew this much after loading models (0 = never)."""
+
+    pdf_shard_pages: int = field(default=get_env_value("PDF_SHARD_PAGES", 0, int))
+    """Parse PDFs longer than this many pages as concurrent page-range shards (MinerU); 0 disables."""
+
+    pdf_max_parallel_shards: int = field(
+        default=get_env_value("PDF_MAX_PARALLEL_SHARDS", 0, int)
+    )
+    """Shards parsed at once; each is a full MinerU run, so bound by memory (0 = half the CPU cores)."""
+
+    office_converter_instances: int = field(
+        default=get_env_value("OFFICE_CONVERTER_INSTANCES", 0, int)
+    )
+    """Long-running headless LibreOffice instances for Office-to-PDF conversion; 0 runs the CLI per document."""
+
+    office_conversion_timeout: int = field(
+        default=get_env_value("OFFICE_CONVERSION_TIMEOUT", 60, int)
+    )
+    """Seconds per Office conversion before the LibreOffice instance is restarted."""
+
+    native_text_extensions: List[str] = field(
+        default_factory=lambda: [
+            ext.strip().lower()
+            for ext in get_env_value("NATIVE_TEXT_EXTENSIONS", "", str).split(",")
+            if ext.strip()
+        ]
+    )
+    """Text extensions (.txt, .md) parsed directly into content_list instead of rendered to PDF and parsed by MinerU/Docling."""
+
+    text_page_chars: int = field(default=get_env_value("TEXT_PAGE_CHARS", 3000, int))
+    """Characters per page_idx for natively parsed text files (form feeds always start a new page)."""
+
     display_content_stats: bool = field(
         default=get_env_value("DISPLAY_CONTENT_STATS", True, bool)
     )
     """Whether to display content statistics during parsing."""
 
+    parse_cache_max_mb: int = field(
+        default=get_env_value("PARSE_CACHE_MAX_MB", 1024, int)
+    )
+    """Compressed size limit of the parse cache before least recently used entries are evicted (0 = unlimited)."""
+
     # Multimodal Processing Configuration
     # ---
     enable_image_processing: bool = field(
@@ -51,6 +102,43 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    multimodal_streaming: bool = field(
+        default=get_env_value("MULTIMODAL_STREAMING", False, bool)
+    )
+    """Extract entities from each multimodal description as soon as it is generated instead of after all descriptions."""
+
+    multimodal_merge_batch_size: int = field(
+        default=get_env_value("MULTIMODAL_MERGE_BATCH_SIZE", 8, int)
+    )
+    """Number of extracted multimodal chunks merged into the graph at a time in streaming mode."""
+
+    concurrent_text_multimodal: bool = field(
+        default=get_env_value("CONCURRENT_TEXT_MULTIMODAL", False, bool)
+    )
+    """Generate multimodal descriptions while the document's text is being inserted."""
+
+    multimodal_description_max_async: int = field(
+        default=get_env_value("MULTIMODAL_DESCRIPTION_MAX_ASYNC", 0, int)
+    )
+    """Concurrent multimodal description calls (0 = LightRAG's max_parallel_insert)."""
+
+    # Embedding Cache Configuration
+    # ---
+    enable_embedding_cache: bool = field(
+        default=get_env_value("ENABLE_EMBEDDING_CACHE", False, bool)
+    )
+    """Wrap the embedding function with a persistent on-disk cache in working_dir."""
+
+    embedding_cache_model: Optional[str] = field(
+        default=get_env_value("EMBEDDING_MODEL", None, str)
+    )
+    """Embedding model name keying the embedding cache when the embedding function does not expose one."""
+
+    embedding_cache_max_mb: int = field(
+        default=get_env_value("EMBEDDING_CACHE_MAX_MB", 1024, int)
+    )
+    """Maximum size of cached vectors in MB before LRU eviction."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -72,6 +160,31 @@ class RAGAnythingConfig:
     )
     """Whether to recursively process subfolders in batch mode."""
 
+    batch_group_small_files: bool = field(
+        default=get_env_value("BATCH_GROUP_SMALL_FILES", False, bool)
+    )
+    """Parse small PDFs/images in batch mode with one MinerU invocation per group."""
+
+    batch_small_file_max_pages: int = field(
+        default=get_env_value("BATCH_SMALL_FILE_MAX_PAGES", 20, int)
+    )
+    """Maximum pages of a PDF that is grouped with other small files."""
+
+    batch_small_file_max_mb: float = field(
+        default=get_env_value("BATCH_SMALL_FILE_MAX_MB", 5.0, float)
+    )
+    """Maximum size in MB of a file that is grouped with other small files."""
+
+    batch_max_group_size: int = field(
+        default=get_env_value("BATCH_MAX_GROUP_SIZE", 16, int)
+    )
+    """Maximum number of files per grouped MinerU invocation."""
+
+    doc_status_flush_interval: float = field(
+        default=get_env_value("DOC_STATUS_FLUSH_INTERVAL", 2.0, float)
+    )
+    """Seconds doc_status updates are buffered and merged per document before being written (0 = write through)."""
+
     # Context Extraction Configuration
     # ---
     context_window: int = field(default=get_env_value("CONTEXT_WINDOW", 1, int))
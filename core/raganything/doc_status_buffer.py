@@ -0,0 +1,156 @@
+"""
+Write-behind buffer for LightRAG's doc_status storage
+
+Every status transition of a document (chunks added, multimodal done, API
+status changes) used to be its own get_by_id -> upsert -> index_done_callback,
+so one document persisted the doc-status store several times. DocStatusBuffer
+keeps the changed fields per doc_id in memory and writes all pending
+documents with a single upsert + index_done_callback when its timer fires,
+at batch boundaries, or on finalize. Reads through the buffer overlay the
+pending fields on the stored record, so this process always sees its own
+updates.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from lightrag.utils import logger
+
+
+class DocStatusBuffer:
+    """
+    Coalesces doc_status field updates per document
+
+    Args:
+        storage: LightRAG doc_status storage (get_by_id/upsert/index_done_callback)
+        flush_interval: Seconds pending updates may wait before they are
+            written; 0 or less writes every update through immediately
+    """
+
+    def __init__(self, storage, flush_interval: float = 2.0):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_creates: Set[str] = set()
+        # Batch being written, still visible to readers until the write is done
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._inflight_creates: Set[str] = set()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self._timer: Optional[asyncio.Task] = None
+        self.updates = 0
+        self.flushes = 0
+        self.records_written = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio.Lock binds to the loop it is first used on; close() may run
+        # the final flush on a fresh loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _overlay(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        if doc_id not in self._pending and doc_id not in self._inflight:
+            return None
+        return {**self._inflight.get(doc_id, {}), **self._pending.get(doc_id, {})}
+
+    async def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Stored record with this process's unwritten updates applied"""
+        record = await self.storage.get_by_id(doc_id)
+        overlay = self._overlay(doc_id)
+        if overlay is None:
+            return record
+        if record is None:
+            if doc_id in self._pending_creates or doc_id in self._inflight_creates:
+                return overlay
+            # Updates to a record that no longer exists are dropped on flush
+            return None
+        return {**record, **overlay}
+
+    async def update(
+        self, doc_id: str, fields: Dict[str, Any], create: bool = False
+    ) -> None:
+        """
+        Merge ``fields`` into the pending update of ``doc_id``
+
+        Without ``create`` the update only applies if the record exists when
+        it is flushed, like the get_by_id-then-upsert it replaces.
+        """
+        self._pending.setdefault(doc_id, {}).update(fields)
+        if create:
+            self._pending_creates.add(doc_id)
+        self.updates += 1
+
+        if self.flush_interval <= 0:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Deferred doc_status flush failed, will retry: {e}")
+            if self._pending:
+                self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> int:
+        """Write all pending updates with one upsert; returns the records written"""
+        async with self._get_lock():
+            if not self._pending:
+                return 0
+            self._inflight, self._pending = self._pending, {}
+            self._inflight_creates, self._pending_creates = self._pending_creates, set()
+            try:
+                records = {}
+                for doc_id, fields in self._inflight.items():
+                    current = await self.storage.get_by_id(doc_id)
+                    if current is None and doc_id not in self._inflight_creates:
+                        self.dropped += 1
+                        continue
+                    records[doc_id] = {**(current or {}), **fields}
+
+                if records:
+                    await self.storage.upsert(records)
+                    await self.storage.index_done_callback()
+            except BaseException:
+                # Put the batch back underneath anything updated meanwhile
+                for doc_id, fields in self._inflight.items():
+                    self._pending[doc_id] = {**fields, **self._pending.get(doc_id, {})}
+                self._pending_creates |= self._inflight_creates
+                raise
+            finally:
+                self._inflight = {}
+                self._inflight_creates = set()
+
+            self.flushes += 1
+            self.records_written += len(records)
+            logger.debug(f"Flushed doc_status updates for {len(records)} document(s)")
+            return len(records)
+
+    async def close(self) -> None:
+        """Stop the timer and write whatever is pending"""
+        timer, self._timer = self._timer, None
+        if timer is not None and not timer.done():
+            try:
+                if timer.get_loop() is asyncio.get_running_loop():
+                    timer.cancel()
+            except RuntimeError:
+                pass
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "updates": self.updates,
+            "flushes": self.flushes,
+            "records_written": self.records_written,
+            "dropped": self.dropped,
+        }
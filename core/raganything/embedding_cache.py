@@ -0,0 +1,396 @@
+"""
+Persistent content-addressed embedding cache for RAGAnything
+
+Stores embeddings keyed by (embedding model, dimension, sha256 of the text) so
+re-ingesting a revised document only embeds the chunks whose text changed.
+Vectors live in a float16 memory-mapped array. The index is a JSON snapshot
+plus an append-only log of changes, so a flush costs the changes since the
+last one rather than a rewrite of the whole index.
+"""
+
+import os
+import re
+import json
+import hashlib
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from lightrag.utils import EmbeddingFunc, logger
+
+
+CACHE_FORMAT_VERSION = 2
+
+# Snapshot versions whose entries can still be read
+_READABLE_VERSIONS = (1, CACHE_FORMAT_VERSION)
+
+# Rows of a new vectors file; it doubles as entries are added
+_INITIAL_CAPACITY = 1024
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding store for one (model, dimension) pair
+
+    Layout inside ``<cache_dir>/<model>_<dim>/``:
+        vectors.f16  - float16 array of shape (capacity, dim), memory-mapped
+        index.json   - snapshot: text hash -> [slot, last access tick]
+        index.<n>.log - JSON lines [hash, slot, tick] (slot null = evicted)
+                       appended by flush() on top of snapshot generation n,
+                       folded into a new snapshot by compact()
+
+    When the vectors would exceed ``max_bytes``, the least recently used
+    entries are evicted and their slots reused. Evictions are logged and
+    fsynced before a freed slot is overwritten, so a replayed index never
+    maps a key to another text's vector.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        embedding_dim: int,
+        max_bytes: int = 1024 * 1024 * 1024,
+        flush_every: int = 1024,
+    ):
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.max_entries = max(1, max_bytes // (embedding_dim * 2))
+        self.flush_every = flush_every
+
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(cache_dir, f"{safe_model}_{embedding_dim}")
+        self.vectors_path = os.path.join(self.directory, "vectors.f16")
+        self.index_path = os.path.join(self.directory, "index.json")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._entries: Dict[str, List[int]] = {}
+        self._free: List[int] = []
+        self._capacity = 0
+        self._tick = 0
+        self._dirty = 0
+        self._changed: Set[str] = set()
+        self._unlogged_evictions = False
+        self._generation = 0
+        self._log_lines = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+        self._open_vectors(min(_INITIAL_CAPACITY, self.max_entries))
+        used = {slot for slot, _ in self._entries.values()}
+        self._free = [s for s in range(self._capacity - 1, -1, -1) if s not in used]
+
+        # A log much longer than the index only slows down the next start
+        if self._log_lines > 2 * len(self._entries) + self.flush_every:
+            self.compact()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_index(self):
+        index = None
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    f"Embedding cache index unreadable, starting empty: {e}"
+                )
+
+        if index is not None and (
+            index.get("version") not in _READABLE_VERSIONS
+            or index.get("model") != self.model_name
+            or index.get("dim") != self.embedding_dim
+        ):
+            logger.info("Embedding cache index is incompatible, starting empty")
+            index = None
+
+        if index is not None:
+            self._entries = {k: list(v) for k, v in index.get("entries", {}).items()}
+            self._tick = int(index.get("tick", 0))
+            self._generation = int(index.get("generation", 0))
+            self._replay_log()
+
+        # Logs of other generations belong to replaced (or dropped) snapshots
+        for name in os.listdir(self.directory):
+            if re.fullmatch(r"index\.\d+\.log", name) and (
+                index is None or os.path.join(self.directory, name) != self.log_path
+            ):
+                os.remove(os.path.join(self.directory, name))
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.directory, f"index.{self._generation}.log")
+
+    def _replay_log(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    key, slot, tick = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                self._log_lines += 1
+                if slot is None:
+                    self._entries.pop(key, None)
+                else:
+                    self._entries[key] = [slot, tick]
+                    self._tick = max(self._tick, tick)
+
+    def _open_vectors(self, capacity: int):
+        """(Re)open the memmap, growing the backing file to ``capacity`` rows."""
+        row_bytes = self.embedding_dim * 2
+        mode = "r+b" if os.path.exists(self.vectors_path) else "w+b"
+        with open(self.vectors_path, mode) as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < capacity * row_bytes:
+                f.truncate(capacity * row_bytes)
+            else:
+                # An existing file keeps its size; its rows hold cached vectors
+                capacity = f.tell() // row_bytes
+
+        self._vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.float16,
+            mode="r+",
+            shape=(capacity, self.embedding_dim),
+        )
+        self._capacity = capacity
+
+    def flush(self, sync: bool = False):
+        """
+        Persist vectors and append index changes to the log. Safe to call repeatedly.
+
+        With ``sync`` the log is fsynced before returning.
+        """
+        self._vectors.flush()
+        if not os.path.exists(self.index_path):
+            self.compact()
+            return
+        if self._changed:
+            lines = []
+            for key in self._changed:
+                entry = self._entries.get(key)
+                record = [key, None, 0] if entry is None else [key, *entry]
+                lines.append(json.dumps(record) + "\n")
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._log_lines += len(lines)
+            self._changed.clear()
+        self._unlogged_evictions = False
+        self._dirty = 0
+
+    def compact(self):
+        """Write the full index as a new snapshot and start an empty log."""
+        self._vectors.flush()
+        old_log_path = self.log_path
+        index = {
+            "version": CACHE_FORMAT_VERSION,
+            "model": self.model_name,
+            "dim": self.embedding_dim,
+            "generation": self._generation + 1,
+            "tick": self._tick,
+            "entries": self._entries,
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # The new snapshot names a new log, so the old one is never replayed on it
+        os.replace(tmp_path, self.index_path)
+        self._generation += 1
+        if os.path.exists(old_log_path):
+            os.remove(old_log_path)
+        self._log_lines = 0
+        self._changed.clear()
+        self._unlogged_evictions = False
+        self._dirty = 0
+
+    # ------------------------------------------------------------------
+    # Lookup and insertion
+    # ------------------------------------------------------------------
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Recency of hits is kept in memory only; compact() persists it
+        self._tick += 1
+        entry[1] = self._tick
+        return np.asarray(self._vectors[entry[0]], dtype=np.float32)
+
+    def put(self, key: str, vector: np.ndarray):
+        entry = self._entries.get(key)
+        if entry is None:
+            slot = self._allocate_slot()
+            entry = self._entries[key] = [slot, 0]
+        self._tick += 1
+        entry[1] = self._tick
+        self._vectors[entry[0]] = vector
+        self._changed.add(key)
+
+        self._dirty += 1
+        if self._dirty >= self.flush_every:
+            self.flush()
+
+    def _allocate_slot(self) -> int:
+        if len(self._entries) >= self.max_entries:
+            self._evict(max(1, self.max_entries // 10))
+        if self._free:
+            if self._unlogged_evictions:
+                # The evicted keys must be gone from the durable index
+                # before their slot holds a different vector
+                self.flush(sync=True)
+            return self._free.pop()
+
+        used = len(self._entries)
+        if used >= self._capacity:
+            self._vectors.flush()
+            del self._vectors
+            self._open_vectors(min(self._capacity * 2, self.max_entries))
+        # Slots [0, used) are all taken when the free list is empty
+        return used
+
+    def _evict(self, count: int):
+        """Drop the ``count`` least recently used entries."""
+        oldest = sorted(self._entries.items(), key=lambda item: item[1][1])[:count]
+        for key, (slot, _) in oldest:
+            del self._entries[key]
+            self._free.append(slot)
+            self._changed.add(key)
+        self._unlogged_evictions = bool(oldest)
+        self.evictions += len(oldest)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "size_mb": round(len(self._entries) * self.embedding_dim * 2 / 2**20, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@dataclass
+class CachedEmbedding:
+    """Callable that serves embeddings from an EmbeddingCache, computing misses"""
+
+    embedding_func: EmbeddingFunc
+    cache: EmbeddingCache
+
+    async def __call__(self, texts: List[str], **kwargs) -> np.ndarray:
+        keys = [self.cache.key(text) for text in texts]
+        result = np.empty((len(texts), self.cache.embedding_dim), dtype=np.float32)
+
+        # Deduplicate misses so repeated chunks are embedded once
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            vector = self.cache.get(key)
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                result[i] = vector
+
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            fresh = np.asarray(
+                await self.embedding_func(miss_texts, **kwargs), dtype=np.float32
+            )
+            for (key, positions), vector in zip(missing.items(), fresh):
+                self.cache.put(key, vector)
+                # Return the stored precision so hits and misses agree exactly
+                result[positions] = vector.astype(np.float16).astype(np.float32)
+
+        return result
+
+
+def resolve_model_name(embedding_func: EmbeddingFunc) -> Optional[str]:
+    """
+    Model name the embedding function actually calls, if it can be told
+
+    Looks at ``model_name`` on the EmbeddingFunc and its inner function, then
+    at a ``model``/``model_name`` keyword bound with functools.partial.
+    """
+    for obj in (embedding_func, getattr(embedding_func, "func", None)):
+        name = getattr(obj, "model_name", None)
+        if isinstance(name, str) and name:
+            return name
+
+    func = getattr(embedding_func, "func", None)
+    while isinstance(func, functools.partial):
+        for keyword in ("model", "model_name"):
+            name = func.keywords.get(keyword)
+            if isinstance(name, str) and name:
+                return name
+        func = func.func
+    return None
+
+
+def wrap_embedding_func(
+    embedding_func: EmbeddingFunc,
+    cache_dir: str,
+    model_name: Optional[str] = None,
+    max_bytes: int = 1024 * 1024 * 1024,
+) -> EmbeddingFunc:
+    """
+    Wrap any EmbeddingFunc with a persistent embedding cache
+
+    Args:
+        embedding_func: The embedding function to cache
+        cache_dir: Directory for cache files (e.g. inside WORKING_DIR)
+        model_name: Embedding model name, used when it cannot be read from
+            ``embedding_func``; part of the cache identity
+        max_bytes: Size limit for stored vectors before LRU eviction
+
+    Returns:
+        EmbeddingFunc: Drop-in replacement with the same dimension and limits.
+        The cache itself is available as ``.func.cache``. If no model name is
+        known, ``embedding_func`` is returned unwrapped, since vectors of
+        different models would otherwise share one cache.
+    """
+    resolved = resolve_model_name(embedding_func)
+    if resolved and model_name and resolved != model_name:
+        logger.warning(
+            f"Embedding cache model '{model_name}' does not match the "
+            f"embedding function's model '{resolved}', keying on the latter"
+        )
+    model_name = resolved or model_name
+    if not model_name:
+        logger.warning(
+            "Embedding cache disabled: cannot determine the embedding model; "
+            "set EMBEDDING_MODEL or pass model_name"
+        )
+        return embedding_func
+
+    cache = EmbeddingCache(
+        cache_dir, model_name, embedding_func.embedding_dim, max_bytes=max_bytes
+    )
+    logger.info(
+        f"Embedding cache at {cache.directory} ({len(cache)} entries)"
+    )
+    return EmbeddingFunc(
+        embedding_dim=embedding_func.embedding_dim,
+        max_token_size=embedding_func.max_token_size,
+        func=CachedEmbedding(embedding_func, cache),
+    )
@@ -0,0 +1,313 @@
+"""
+Warm MinerU worker pool
+
+Every ``mineru`` CLI invocation reloads the layout/OCR models, which dominates
+the parse time of short documents. The pool keeps N long-lived worker
+processes that call MinerU's Python API (``do_parse``) directly, so models stay
+loaded between documents. Jobs and results travel over multiprocessing pipes.
+
+Workers are recycled after a number of jobs or once their resident memory has
+grown past a limit (where current RSS can be read: psutil or /proc). If MinerU cannot be imported in a worker, or a worker dies
+mid-job, the caller gets MineruWorkerUnavailable and should use the CLI.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import asyncio
+import logging
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a fresh worker to import MinerU
+WORKER_START_TIMEOUT = 300
+
+# Seconds between checks for an idle worker while an async job waits
+ACQUIRE_POLL_INTERVAL = 0.05
+
+
+class MineruWorkerUnavailable(Exception):
+    """The pool cannot run this job; fall back to the mineru CLI"""
+
+
+def _rss_mb() -> Optional[float]:
+    """
+    Current resident memory of this process in MB, or None if unknown
+
+    Uses psutil when installed, otherwise /proc/self/statm. Peak RSS
+    (ru_maxrss) is not a substitute: it never shrinks, so a worker past the
+    limit would be recycled after every job.
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _parse_job(do_parse, read_fn, job: Dict[str, Any]) -> None:
+    """Run one parse with the same options and output layout as the CLI"""
+    if job.get("device"):
+        os.environ["MINERU_DEVICE_MODE"] = job["device"]
+    if job.get("source"):
+        os.environ["MINERU_MODEL_SOURCE"] = job["source"]
+
+    input_path = Path(job["input_path"])
+    do_parse(
+        output_dir=str(job["output_dir"]),
+        pdf_file_names=[input_path.stem],
+        pdf_bytes_list=[read_fn(input_path)],
+        p_lang_list=[job.get("lang") or "ch"],
+        backend=job.get("backend") or "pipeline",
+        parse_method=job.get("method") or "auto",
+        formula_enable=job.get("formula", True),
+        table_enable=job.get("table", True),
+        server_url=job.get("vlm_url"),
+        start_page_id=job.get("start_page") or 0,
+        end_page_id=job.get("end_page"),
+    )
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: import MinerU once, then parse jobs until told to stop"""
+    try:
+        from mineru.cli.common import do_parse, read_fn
+    except Exception as e:
+        conn.send({"ok": False, "error": f"MinerU Python API unavailable: {e}"})
+        return
+    conn.send({"ok": True, "rss_mb": _rss_mb()})
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        try:
+            _parse_job(do_parse, read_fn, job)
+            conn.send({"ok": True, "rss_mb": _rss_mb()})
+        except Exception as e:
+            conn.send(
+                {"ok": False, "error": f"{type(e).__name__}: {e}", "rss_mb": _rss_mb()}
+            )
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe"""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs = 0
+        self.baseline_rss_mb: Optional[float] = None
+        self.rss_mb: Optional[float] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=10)
+        self.kill()
+
+
+class MineruWorkerPool:
+    """
+    Pool of warm MinerU worker processes
+
+    Args:
+        size: Number of worker processes
+        max_jobs_per_worker: Recycle a worker after this many jobs (0 = never)
+        max_memory_growth_mb: Recycle a worker once its RSS has grown this much
+            beyond the value after its first job, i.e. with models loaded
+            (0 = never; also off where current RSS cannot be read)
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_jobs_per_worker: int = 50,
+        max_memory_growth_mb: int = 2048,
+    ):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.available = True
+        self.unavailable_reason: Optional[str] = None
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self.jobs_done = 0
+        self.recycled = 0
+        for _ in range(size):
+            self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _retire(self, worker: _Worker, reason: str):
+        logger.info(
+            f"Recycling MinerU worker pid={worker.process.pid} after "
+            f"{worker.jobs} jobs ({reason})"
+        )
+        worker.stop()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        self.recycled += 1
+        if self.available:
+            self._add_worker()
+
+    def _release(self, worker: _Worker):
+        if not worker.alive:
+            self._retire(worker, "exited")
+        elif self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker:
+            self._retire(worker, "job limit")
+        elif (
+            self.max_memory_growth_mb
+            and worker.baseline_rss_mb is not None
+            and worker.rss_mb is not None
+            and worker.rss_mb - worker.baseline_rss_mb > self.max_memory_growth_mb
+        ):
+            self._retire(worker, f"memory {worker.rss_mb:.0f} MB")
+        else:
+            self._idle.put(worker)
+
+    def _mark_unavailable(self, reason: str):
+        if self.available:
+            logger.warning(f"MinerU worker pool disabled, using CLI: {reason}")
+        self.available = False
+        self.unavailable_reason = reason
+
+    def _run_on(self, worker: _Worker, job: Dict[str, Any], timeout: Optional[float]):
+        # Imported here because parser.py imports this module
+        from raganything.parser import MineruExecutionError, MineruTimeoutError
+
+        if not worker.ready:
+            if not worker.conn.poll(WORKER_START_TIMEOUT):
+                worker.kill()
+                raise MineruWorkerUnavailable("worker did not start")
+            try:
+                hello = worker.conn.recv()
+            except EOFError:
+                raise MineruWorkerUnavailable("worker exited during startup")
+            if not hello.get("ok"):
+                self._mark_unavailable(hello.get("error", "startup failed"))
+                raise MineruWorkerUnavailable(self.unavailable_reason)
+            worker.ready = True
+
+        try:
+            worker.conn.send(job)
+            if not worker.conn.poll(timeout or None):
+                worker.kill()
+                raise MineruTimeoutError(timeout)
+            result = worker.conn.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            raise MineruWorkerUnavailable("worker died while parsing")
+
+        worker.jobs += 1
+        worker.rss_mb = result.get("rss_mb")
+        if worker.baseline_rss_mb is None:
+            worker.baseline_rss_mb = worker.rss_mb
+        self.jobs_done += 1
+
+        if not result["ok"]:
+            raise MineruExecutionError(1, [result["error"]])
+
+    def _acquire(self) -> _Worker:
+        # Re-check periodically: retired workers are not replaced once disabled
+        while True:
+            if not self.available:
+                raise MineruWorkerUnavailable(self.unavailable_reason)
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+    async def _acquire_async(self) -> _Worker:
+        # Polls on the event loop: no thread is parked per queued job, and a
+        # cancelled wait cannot take a worker that nobody will release
+        while True:
+            if not self.available:
+                raise MineruWorkerUnavailable(self.unavailable_reason)
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                await asyncio.sleep(ACQUIRE_POLL_INTERVAL)
+
+    def run(self, job: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        """Parse one document on a warm worker (blocking)"""
+        worker = self._acquire()
+        try:
+            self._run_on(worker, job, timeout)
+        finally:
+            self._release(worker)
+
+    async def run_async(
+        self, job: Dict[str, Any], timeout: Optional[float] = None
+    ) -> None:
+        """Parse one document on a warm worker; cancelling kills the worker"""
+        worker = await self._acquire_async()
+        try:
+            await asyncio.to_thread(self._run_on, worker, job, timeout)
+        except asyncio.CancelledError:
+            # The waiting thread sees EOF and returns once the worker is gone
+            await asyncio.to_thread(worker.kill)
+            raise
+        finally:
+            # Retiring joins and respawns processes; keep that off the loop
+            await asyncio.to_thread(self._release, worker)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            workers = list(self._workers)
+        return {
+            "size": self.size,
+            "available": self.available,
+            "unavailable_reason": self.unavailable_reason,
+            "jobs_done": self.jobs_done,
+            "recycled": self.recycled,
+            "workers": [
+                {"pid": w.process.pid, "jobs": w.jobs, "rss_mb": round(w.rss_mb, 1)}
+                for w in workers
+            ],
+        }
+
+    def shutdown(self):
+        self.available = False
+        self.unavailable_reason = "shut down"
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
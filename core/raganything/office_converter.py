@@ -0,0 +1,328 @@
+"""
+Persistent LibreOffice converter for Office documents
+
+``soffice --headless --convert-to pdf`` pays LibreOffice's cold start (seconds)
+for every document. OfficeConverterPool keeps one or more headless instances
+running and sends conversions to them over UNO, via office_worker.py running
+under a UNO-capable Python. Instances are restarted when they crash or a
+conversion times out, and every conversion's latency is logged and counted.
+
+When no UNO interpreter or LibreOffice executable is found, the pool reports
+itself unavailable and Parser.convert_office_to_pdf uses the CLI as before.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import signal
+import socket
+import logging
+import tempfile
+import threading
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("office_worker.py")
+
+# Seconds to wait for a fresh instance to accept conversions
+INSTANCE_START_TIMEOUT = 60
+
+
+@lru_cache(maxsize=None)
+def resolve_office_executable() -> Optional[str]:
+    """Locate the LibreOffice executable once per process"""
+    for name in ("libreoffice", "soffice"):
+        found = shutil.which(name)
+        if found:
+            return found
+    for candidate in (
+        "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+        r"C:\Program Files\LibreOffice\program\soffice.exe",
+        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+    ):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def resolve_uno_python() -> Optional[str]:
+    """Find a Python interpreter that can import uno (checked once per process)"""
+    candidates = [os.getenv("LIBREOFFICE_PYTHON"), sys.executable]
+    soffice = resolve_office_executable()
+    if soffice:
+        program_dir = Path(os.path.realpath(soffice)).parent
+        candidates += [str(program_dir / "python"), str(program_dir / "python.exe")]
+    candidates += [shutil.which("python3")]
+
+    for python in dict.fromkeys(c for c in candidates if c):
+        try:
+            subprocess.run(
+                [python, "-c", "import uno"],
+                check=True,
+                capture_output=True,
+                timeout=30,
+            )
+            return python
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _OfficeInstance:
+    """One office_worker.py process and the soffice it controls"""
+
+    def __init__(self, index: int, python: str, soffice: str):
+        self.index = index
+        self.python = python
+        self.soffice = soffice
+        self.process: Optional[subprocess.Popen] = None
+        self.profile_dir: Optional[str] = None
+        self._replies: "queue.Queue[dict]" = queue.Queue()
+
+    def start(self):
+        self.profile_dir = tempfile.mkdtemp(prefix=f"raganything_office_{self.index}_")
+        self._replies = queue.Queue()
+        kwargs = {}
+        if os.name == "posix":
+            kwargs["start_new_session"] = True  # soffice dies with its worker
+        else:
+            kwargs["creationflags"] = (
+                subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+            )
+        self.process = subprocess.Popen(
+            [self.python, str(WORKER_SCRIPT), self.soffice, str(_free_port()), self.profile_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            **kwargs,
+        )
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+        hello = self._wait_reply(INSTANCE_START_TIMEOUT)
+        if not hello or not hello.get("ok"):
+            self.stop()
+            raise RuntimeError(
+                (hello or {}).get("error", "office instance did not start in time")
+            )
+
+    def _read_replies(self):
+        process = self.process
+        replies = self._replies
+        for line in process.stdout:
+            try:
+                replies.put(json.loads(line))
+            except ValueError:
+                continue
+        replies.put({"ok": False, "exited": True, "error": "office instance exited"})
+
+    def _wait_reply(self, timeout: float) -> Optional[dict]:
+        """Next reply from the worker, or None on timeout"""
+        try:
+            return self._replies.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def convert(self, input_path: Path, output_path: Path, timeout: float) -> None:
+        request = {"input": str(input_path), "output": str(output_path)}
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            raise ConnectionError("office instance is not running")
+
+        reply = self._wait_reply(timeout)
+        if reply is None:
+            raise TimeoutError()
+        if reply.get("exited"):
+            raise ConnectionError("office instance crashed")
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "conversion failed"))
+
+    def stop(self):
+        if self.process is not None:
+            try:
+                if os.name == "posix":
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                else:
+                    self.process.kill()
+            except (ProcessLookupError, OSError):
+                pass
+            self.process.wait()
+            self.process = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+
+class OfficeConverterPool:
+    """
+    Pool of long-running headless LibreOffice instances
+
+    Args:
+        instances: Number of LibreOffice instances (conversions run in parallel)
+        timeout: Seconds per conversion before the instance is restarted
+    """
+
+    def __init__(self, instances: int = 1, timeout: float = 60):
+        self.size = instances
+        self.timeout = timeout
+        self.available = True
+        self.unavailable_reason: Optional[str] = None
+        self._idle: "queue.Queue[_OfficeInstance]" = queue.Queue()
+        self._instances: List[_OfficeInstance] = []
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.conversions = 0
+        self.failures = 0
+        self.restarts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _disable(self, reason: str):
+        if self.available:
+            logger.warning(f"Office converter service unavailable, using CLI: {reason}")
+        self.available = False
+        self.unavailable_reason = reason
+
+    def _ensure_started(self) -> bool:
+        """Start instances on first use; the first failure disables the pool"""
+        with self._start_lock:
+            if self._started or not self.available:
+                return self.available
+            soffice = resolve_office_executable()
+            python = resolve_uno_python() if soffice else None
+            if not soffice:
+                self._disable("LibreOffice executable not found")
+                return False
+            if not python:
+                self._disable("no Python with the uno module (set LIBREOFFICE_PYTHON)")
+                return False
+            try:
+                for index in range(self.size):
+                    instance = _OfficeInstance(index, python, soffice)
+                    instance.start()
+                    self._instances.append(instance)
+                    self._idle.put(instance)
+            except Exception as e:
+                self.shutdown()
+                self._disable(f"instance failed to start: {e}")
+                return False
+            logger.info(
+                f"Started {self.size} LibreOffice instance(s) ({soffice}, {python})"
+            )
+            self._started = True
+            return True
+
+    def _restart(self, instance: _OfficeInstance, reason: str):
+        logger.warning(f"Restarting LibreOffice instance {instance.index}: {reason}")
+        instance.stop()
+        self.restarts += 1
+        try:
+            instance.start()
+        except Exception as e:
+            logger.error(f"LibreOffice instance {instance.index} failed to restart: {e}")
+            self._instances.remove(instance)
+            if not self._instances:
+                self._disable("all instances failed")
+            return
+        self._idle.put(instance)
+
+    def convert(self, doc_path: Path, output_dir: Path) -> Path:
+        """
+        Convert a document to <output_dir>/<stem>.pdf on a running instance
+
+        Raises:
+            RuntimeError: If the pool is unavailable or the conversion failed
+                (the caller should fall back to the CLI)
+        """
+        if not self._ensure_started():
+            raise RuntimeError(self.unavailable_reason)
+
+        while True:
+            if not self.available:
+                raise RuntimeError(self.unavailable_reason)
+            try:
+                instance = self._idle.get(timeout=1.0)
+                break
+            except queue.Empty:
+                continue
+
+        final_pdf = output_dir / f"{doc_path.stem}.pdf"
+        partial_pdf = output_dir / f".{doc_path.stem}.{instance.index}.pdf.part"
+        start = time.perf_counter()
+        try:
+            instance.convert(doc_path.resolve(), partial_pdf.resolve(), self.timeout)
+        except TimeoutError:
+            self._record(time.perf_counter() - start, ok=False)
+            self._restart(instance, f"timed out after {self.timeout}s on {doc_path.name}")
+            partial_pdf.unlink(missing_ok=True)
+            raise RuntimeError(f"conversion of {doc_path.name} timed out")
+        except ConnectionError as e:
+            self._record(time.perf_counter() - start, ok=False)
+            self._restart(instance, str(e))
+            partial_pdf.unlink(missing_ok=True)
+            raise RuntimeError(f"conversion of {doc_path.name} failed: {e}")
+        except Exception:
+            self._record(time.perf_counter() - start, ok=False)
+            self._idle.put(instance)
+            partial_pdf.unlink(missing_ok=True)
+            raise
+
+        self._idle.put(instance)
+        os.replace(partial_pdf, final_pdf)
+        seconds = time.perf_counter() - start
+        self._record(seconds, ok=True)
+        logger.info(
+            f"Converted {doc_path.name} to PDF in {seconds:.2f}s "
+            f"(LibreOffice instance {instance.index})"
+        )
+        return final_pdf
+
+    def _record(self, seconds: float, ok: bool):
+        with self._stats_lock:
+            if ok:
+                self.conversions += 1
+                self.total_seconds += seconds
+                self.max_seconds = max(self.max_seconds, seconds)
+            else:
+                self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "instances": len(self._instances),
+            "available": self.available,
+            "unavailable_reason": self.unavailable_reason,
+            "conversions": self.conversions,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "avg_seconds": round(self.total_seconds / self.conversions, 3)
+            if self.conversions
+            else 0.0,
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+    def shutdown(self):
+        for instance in self._instances:
+            instance.stop()
+        self._instances = []
+        self._started = False
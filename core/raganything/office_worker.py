@@ -0,0 +1,126 @@
+"""
+Headless LibreOffice conversion worker
+
+Run by OfficeConverterPool with a Python interpreter that can ``import uno``
+(LibreOffice's bundled python, or the system python with python3-uno). It
+starts one headless soffice listening on a local socket, then converts
+documents to PDF for JSON-line requests on stdin:
+
+    {"input": "/path/doc.docx", "output": "/path/doc.pdf"}
+
+and answers each with {"ok": true} or {"ok": false, "error": "..."} on stdout.
+Not imported by raganything itself.
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+
+# Export filter per document service, most specific first
+PDF_FILTERS = [
+    ("com.sun.star.text.WebDocument", "writer_web_pdf_Export"),
+    ("com.sun.star.text.TextDocument", "writer_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+]
+
+
+def reply(**message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+
+    soffice, port, profile_dir = sys.argv[1], sys.argv[2], sys.argv[3]
+
+    def props(**values):
+        result = []
+        for name, value in values.items():
+            prop = PropertyValue()
+            prop.Name, prop.Value = name, value
+            result.append(prop)
+        return tuple(result)
+
+    # Private profile per instance: concurrent instances must not share one
+    office = subprocess.Popen(
+        [
+            soffice,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nodefault",
+            "--nolockcheck",
+            f"-env:UserInstallation={uno.systemPathToFileUrl(profile_dir)}",
+            f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local
+    )
+    context = None
+    for _ in range(240):
+        if office.poll() is not None:
+            reply(ok=False, error=f"soffice exited with code {office.returncode}")
+            return
+        try:
+            context = resolver.resolve(
+                f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+            )
+            break
+        except NoConnectException:
+            time.sleep(0.25)
+    if context is None:
+        office.kill()
+        reply(ok=False, error="soffice did not accept connections")
+        return
+
+    desktop = context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+    reply(ok=True, ready=True)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            document = desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(os.path.abspath(request["input"])),
+                "_blank",
+                0,
+                props(Hidden=True, ReadOnly=True),
+            )
+            if document is None:
+                raise RuntimeError("document could not be loaded")
+            try:
+                filter_name = next(
+                    (f for service, f in PDF_FILTERS if document.supportsService(service)),
+                    "writer_pdf_Export",
+                )
+                document.storeToURL(
+                    uno.systemPathToFileUrl(os.path.abspath(request["output"])),
+                    props(FilterName=filter_name),
+                )
+            finally:
+                document.close(True)
+            reply(ok=True)
+        except Exception as e:
+            reply(ok=False, error=f"{type(e).__name__}: {e}")
+
+    office.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Parse result cache for RAGAnything
+
+Parse results are keyed by the sha256 of the file bytes (plus the parser
+configuration), so a document that is moved, copied or uploaded again is
+parsed once. FileDigestIndex remembers path -> (size, mtime, digest) so files
+that have not changed since they were last seen are not hashed again.
+ParseCacheStore keeps the results in SQLite, one compressed row per entry.
+"""
+
+import os
+import json
+import time
+import zlib
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from lightrag.utils import logger
+
+
+DIGEST_INDEX_VERSION = 1
+
+# Read size for hashing; large enough that syscalls do not dominate
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def sha256_file(file_path: Union[str, Path]) -> str:
+    """sha256 of a file's bytes, read in chunks so memory stays flat"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileDigestIndex:
+    """
+    Path -> content digest index with an mtime/size short-circuit
+
+    A file is re-hashed only when its size or modification time differs from
+    the recorded one. The index is a small JSON file written every
+    ``flush_every`` new digests and on ``flush()``.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, flush_every: int = 64):
+        self.index_path = index_path
+        self.flush_every = flush_every
+        self._entries: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hashed = 0
+        self.reused = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"File digest index unreadable, starting empty: {e}")
+            return
+        if index.get("version") != DIGEST_INDEX_VERSION:
+            logger.info("File digest index is incompatible, starting empty")
+            return
+        self._entries = index.get("entries", {})
+
+    def flush(self):
+        """Persist the index if it changed. Safe to call repeatedly."""
+        if not self.index_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            index = {"version": DIGEST_INDEX_VERSION, "entries": dict(self._entries)}
+            self._dirty = 0
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def digest(self, file_path: Union[str, Path]) -> str:
+        """sha256 of the file, reusing the recorded digest if size and mtime match"""
+        key = str(Path(file_path).resolve())
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            self.reused += 1
+            return entry[2]
+
+        digest = sha256_file(key)
+        self.hashed += 1
+        with self._lock:
+            self._entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty += 1
+            due = self._dirty >= self.flush_every
+        if due:
+            self.flush()
+        return digest
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hashed": self.hashed, "reused": self.reused}
+
+
+CACHE_VERSION = 2
+"""Version of cached entries. 1: LightRAG JSON KV (path+mtime or sha256 keys); 2: this store."""
+
+SCHEMA_VERSION = 1
+
+
+def _migrate_v1(entry: Dict) -> Optional[Dict]:
+    """Entries from the JSON KV are valid only if they were keyed by content"""
+    if not entry.get("sha256"):
+        return None  # path+mtime key: cannot be re-keyed, parse again
+    entry.pop("mtime", None)
+    return entry
+
+
+# cache_version -> function upgrading an entry to the next version (None drops it)
+_ENTRY_MIGRATIONS = {1: _migrate_v1}
+
+
+def _entry_version(entry: Dict) -> int:
+    try:
+        return int(float(entry.get("cache_version", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def migrate_entry(entry: Dict, version: int) -> Optional[Dict]:
+    """Upgrade an entry to CACHE_VERSION, or None if it cannot be upgraded"""
+    while entry is not None and version < CACHE_VERSION:
+        migrate = _ENTRY_MIGRATIONS.get(version)
+        entry = migrate(entry) if migrate else None
+        version += 1
+    return entry
+
+
+class ParseCacheStore:
+    """
+    SQLite-backed parse result cache
+
+    Each entry is one row holding zlib-compressed JSON, so a write costs the
+    same with 10 or 10,000 cached documents and nothing is loaded at startup.
+    Rows carry their cache_version and last access time; when the compressed
+    size exceeds ``max_bytes`` the least recently used rows are evicted.
+
+    Exposes the async subset of LightRAG's KV storage interface the processor
+    uses (initialize, get_by_id, upsert, index_done_callback, finalize).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+        legacy_json_path: Optional[str] = None,
+    ):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.legacy_json_path = legacy_json_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Connection and schema
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                cache_version INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            """
+        )
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None:
+            conn.execute(
+                "INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+        elif int(row[0]) > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Parse cache {self.db_path} has schema {row[0]}, newer than supported "
+                f"{SCHEMA_VERSION}"
+            )
+        conn.commit()
+        self._conn = conn
+        self._total_bytes = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _import_legacy_json(self):
+        """One-time import of the LightRAG JSON KV parse cache, migrating entries"""
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+        done = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'legacy_json_imported'"
+        ).fetchone()
+        if done:
+            return
+        try:
+            with open(self.legacy_json_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Legacy parse cache unreadable, not imported: {e}")
+            legacy = {}
+
+        imported = 0
+        for key, entry in legacy.items():
+            if not isinstance(entry, dict):
+                continue
+            entry = migrate_entry(entry, _entry_version(entry))
+            if entry is not None:
+                self._put(key, entry, commit=False)
+                imported += 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('legacy_json_imported', ?)",
+            (str(time.time()),),
+        )
+        self._conn.commit()
+        self._evict_if_needed()
+        logger.info(
+            f"Imported {imported} of {len(legacy)} parse cache entries from "
+            f"{self.legacy_json_path}"
+        )
+
+    async def initialize(self):
+        def init():
+            with self._lock:
+                self._open()
+                self._import_legacy_json()
+
+        await asyncio.to_thread(init)
+        logger.info(
+            f"Parse cache at {self.db_path} ({self._total_bytes / 2**20:.1f} MB)"
+        )
+
+    async def finalize(self):
+        def close():
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+
+        await asyncio.to_thread(close)
+
+    # ------------------------------------------------------------------
+    # Lookup and insertion
+    # ------------------------------------------------------------------
+
+    def _put(self, key: str, entry: Dict, commit: bool = True):
+        entry = {k: v for k, v in entry.items() if k != "cache_version"}
+        data = zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+            (key, CACHE_VERSION, data, len(data), now, now),
+        )
+        if commit:
+            self._conn.commit()
+        self._total_bytes += len(data) - (old[0] if old else 0)
+
+    def _evict_if_needed(self):
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        # Evict down to 90% so eviction is not triggered on every write
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append((key,))
+                self._total_bytes -= size
+                if self._total_bytes <= target:
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+            self.evictions += len(evicted)
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT cache_version, data FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        version, data = row
+        entry = json.loads(zlib.decompress(data).decode("utf-8"))
+        if version < CACHE_VERSION:
+            entry = migrate_entry(entry, version)
+            if entry is None:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._put(key, entry)
+        else:
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        self.hits += 1
+        entry["cache_version"] = CACHE_VERSION
+        return entry
+
+    async def get_by_id(self, key: str) -> Optional[Dict]:
+        def get():
+            with self._lock:
+                return self._get(key)
+
+        return await asyncio.to_thread(get)
+
+    async def upsert(self, data: Dict[str, Dict]) -> None:
+        def put():
+            with self._lock:
+                for key, entry in data.items():
+                    self._put(key, entry, commit=False)
+                self._conn.commit()
+                self._evict_if_needed()
+
+        await asyncio.to_thread(put)
+
+    async def delete(self, keys: List[str]) -> None:
+        def delete():
+            with self._lock:
+                for key in keys:
+                    row = self._conn.execute(
+                        "SELECT size FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row:
+                        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        self._total_bytes -= row[0]
+                self._conn.commit()
+
+        await asyncio.to_thread(delete)
+
+    async def index_done_callback(self) -> None:
+        """Writes are committed by upsert; kept for KV interface compatibility"""
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size_mb": round(self._total_bytes / 2**20, 2),
+            "max_mb": round(self.max_bytes / 2**20, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
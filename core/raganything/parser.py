@@ -12,15 +12,27 @@ For Office documents (.doc, .docx, .ppt, .pptx), please convert them to PDF form
 from __future__ import annotations
 
 
+import os
+import re
 import json
+import time
+import codecs
+import signal
+import shutil
+import filecmp
+import asyncio
 import argparse
 import base64
+import platform
 import subprocess
 import tempfile
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import (
+    Callable,
     Dict,
+    Iterator,
     List,
     Optional,
     Union,
@@ -29,8 +41,30 @@ from typing import (
     TypeVar,
 )
 
+from raganything.mineru_pool import MineruWorkerPool, MineruWorkerUnavailable
+from raganything.office_converter import (
+    OfficeConverterPool,
+    resolve_office_executable,
+)
+
 T = TypeVar("T")
 
+# A paragraph ending in one of these is not continued on the next page
+_SENTENCE_END = frozenset(".!?;:。！？；：…\"'”’)）」』")
+
+# content_list block types that are not part of the running text
+_PAGE_FURNITURE = frozenset(
+    ["header", "footer", "page_number", "page_header", "page_footer", "page_footnote"]
+)
+
+
+def _is_cjk(char: str) -> bool:
+    return (
+        "\u4e00" <= char <= "\u9fff"
+        or "\u3040" <= char <= "\u30ff"
+        or "\uac00" <= char <= "\ud7af"
+    )
+
 
 class MineruExecutionError(Exception):
     """catch mineru error"""
@@ -43,6 +77,28 @@ class MineruExecutionError(Exception):
         )
 
 
+class MineruTimeoutError(MineruExecutionError):
+    """mineru did not finish within the per-file timeout and was killed"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        super().__init__(None, [f"timed out after {timeout}s"])
+
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Uses a private event loop, in a helper thread if the caller is itself
+    running inside an event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 class Parser:
     """
     Base class for document parsing utilities.
@@ -58,10 +114,43 @@ class Parser:
     # Class-level logger
     logger = logging.getLogger(__name__)
 
+    # Shared persistent LibreOffice instances (None = one soffice CLI per document)
+    _office_converter: Optional[OfficeConverterPool] = None
+
     def __init__(self) -> None:
         """Initialize the base parser."""
         pass
 
+    @classmethod
+    def configure_office_converter(
+        cls, instances: int, timeout: float = 60
+    ) -> Optional[OfficeConverterPool]:
+        """
+        Set up (or replace) the shared pool of headless LibreOffice instances
+
+        Instances are started on the first conversion and kept running, so Office
+        documents skip LibreOffice's start-up cost. Falls back to the CLI
+        whenever the pool is unavailable.
+
+        Args:
+            instances: Number of LibreOffice instances; 0 disables the pool
+            timeout: Seconds per conversion before the instance is restarted
+        """
+        Parser.shutdown_office_converter()
+        if instances > 0:
+            Parser._office_converter = OfficeConverterPool(instances, timeout=timeout)
+        return Parser._office_converter
+
+    @classmethod
+    def shutdown_office_converter(cls) -> None:
+        """Stop the shared LibreOffice instances, if any"""
+        if Parser._office_converter is not None:
+            logging.info(
+                f"Office converter stats: {Parser._office_converter.stats()}"
+            )
+            Parser._office_converter.shutdown()
+            Parser._office_converter = None
+
     @staticmethod
     def convert_office_to_pdf(
         doc_path: Union[str, Path], output_dir: Optional[str] = None
@@ -93,18 +182,32 @@ class Parser:
 
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
+            # Prefer a running LibreOffice instance; use the CLI if that fails
+            converter = Parser._office_converter
+            if converter is not None and converter.available:
+                try:
+                    final_pdf_path = converter.convert(doc_path, base_output_dir)
+                    if final_pdf_path.stat().st_size >= 100:
+                        return final_pdf_path
+                    logging.warning(
+                        f"LibreOffice instance produced an empty PDF for {doc_path.name}"
+                    )
+                except Exception as e:
+                    logging.warning(
+                        f"LibreOffice instance conversion failed, using CLI: {e}"
+                    )
+
             # Create temporary directory for PDF conversion
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
 
                 # Convert to PDF using LibreOffice
                 logging.info(f"Converting {doc_path.name} to PDF using LibreOffice...")
+                start_time = time.perf_counter()
 
-                # Prepare subprocess parameters to hide console window on Windows
-                import platform
-
-                # Try LibreOffice commands in order of preference
-                commands_to_try = ["libreoffice", "soffice"]
+                # Try the resolved executable, else LibreOffice commands in order of preference
+                executable = resolve_office_executable()
+                commands_to_try = [executable] if executable else ["libreoffice", "soffice"]
 
                 conversion_successful = False
                 for cmd in commands_to_try:
@@ -141,7 +244,8 @@ class Parser:
                         if result.returncode == 0:
                             conversion_successful = True
                             logging.info(
-                                f"Successfully converted {doc_path.name} to PDF using {cmd}"
+                                f"Successfully converted {doc_path.name} to PDF using {cmd} "
+                                f"in {time.perf_counter() - start_time:.2f}s"
                             )
                             break
                         else:
@@ -190,8 +294,6 @@ class Parser:
 
                 # Copy PDF to final output directory
                 final_pdf_path = base_output_dir / f"{name_without_suff}.pdf"
-                import shutil
-
                 shutil.copy2(pdf_path, final_pdf_path)
 
                 return final_pdf_path
@@ -200,6 +302,26 @@ class Parser:
             logging.error(f"Error in convert_office_to_pdf: {str(e)}")
             raise
 
+    @staticmethod
+    def _read_text_file(text_path: Path) -> str:
+        """Read a text file as UTF-8, falling back to common legacy encodings"""
+        try:
+            with open(text_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except UnicodeDecodeError:
+            # Try with different encodings
+            for encoding in ["gbk", "latin-1", "cp1252"]:
+                try:
+                    with open(text_path, "r", encoding=encoding) as f:
+                        text_content = f.read()
+                    logging.info(f"Successfully read file with {encoding} encoding")
+                    return text_content
+                except UnicodeDecodeError:
+                    continue
+            raise RuntimeError(
+                f"Could not decode text file {text_path.name} with any supported encoding"
+            )
+
     @staticmethod
     def convert_text_to_pdf(
         text_path: Union[str, Path], output_dir: Optional[str] = None
@@ -225,23 +347,7 @@ class Parser:
                 raise ValueError(f"Unsupported text format: {text_path.suffix}")
 
             # Read the text content
-            try:
-                with open(text_path, "r", encoding="utf-8") as f:
-                    text_content = f.read()
-            except UnicodeDecodeError:
-                # Try with different encodings
-                for encoding in ["gbk", "latin-1", "cp1252"]:
-                    try:
-                        with open(text_path, "r", encoding=encoding) as f:
-                            text_content = f.read()
-                        logging.info(f"Successfully read file with {encoding} encoding")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    raise RuntimeError(
-                        f"Could not decode text file {text_path.name} with any supported encoding"
-                    )
+            text_content = Parser._read_text_file(text_path)
 
             # Prepare output directory
             if output_dir:
@@ -580,12 +686,57 @@ class MineruParser(Parser):
     # Class-level logger
     logger = logging.getLogger(__name__)
 
+    # Shared warm worker pool (None = always use the mineru CLI)
+    _worker_pool: Optional[MineruWorkerPool] = None
+
     def __init__(self) -> None:
         """Initialize MineruParser"""
         super().__init__()
 
+    @classmethod
+    def configure_worker_pool(
+        cls,
+        size: int,
+        max_jobs_per_worker: int = 50,
+        max_memory_growth_mb: int = 2048,
+    ) -> Optional[MineruWorkerPool]:
+        """
+        Start (or replace) the shared pool of warm MinerU workers
+
+        With a pool, parses run in long-lived processes that keep MinerU's models
+        loaded instead of starting the CLI per document. Falls back to the CLI
+        whenever the pool is unavailable.
+
+        Args:
+            size: Number of worker processes; 0 disables the pool
+            max_jobs_per_worker: Recycle a worker after this many jobs (0 = never)
+            max_memory_growth_mb: Recycle a worker whose RSS grew this much (0 = never)
+        """
+        cls.shutdown_worker_pool()
+        if size > 0:
+            cls._worker_pool = MineruWorkerPool(
+                size,
+                max_jobs_per_worker=max_jobs_per_worker,
+                max_memory_growth_mb=max_memory_growth_mb,
+            )
+            logging.info(f"Started MinerU worker pool with {size} workers")
+        return cls._worker_pool
+
+    @classmethod
+    def shutdown_worker_pool(cls) -> None:
+        """Stop the shared worker pool, if any"""
+        if cls._worker_pool is not None:
+            logging.info(f"MinerU worker pool stats: {cls._worker_pool.stats()}")
+            cls._worker_pool.shutdown()
+            cls._worker_pool = None
+
+    # tqdm progress lines, e.g. "Layout Predict: 45%|####5     | 9/20 [00:03<00:04]"
+    _PROGRESS_PATTERN = re.compile(
+        r"(?P<stage>[A-Za-z][\w ./-]*?):\s*\d+%\|[^|]*\|\s*(?P<done>\d+)/(?P<total>\d+)"
+    )
+
     @staticmethod
-    def _run_mineru_command(
+    def _build_mineru_command(
         input_path: Union[str, Path],
         output_dir: Union[str, Path],
         method: str = "auto",
@@ -598,24 +749,8 @@ class MineruParser(Parser):
         device: Optional[str] = None,
         source: Optional[str] = None,
         vlm_url: Optional[str] = None,
-    ) -> None:
-        """
-        Run mineru command line tool
-
-        Args:
-            input_path: Path to input file or directory
-            output_dir: Output directory path
-            method: Parsing method (auto, txt, ocr)
-            lang: Document language for OCR optimization
-            backend: Parsing backend
-            start_page: Starting page number (0-based)
-            end_page: Ending page number (0-based)
-            formula: Enable formula parsing
-            table: Enable table parsing
-            device: Inference device
-            source: Model source
-            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
-        """
+    ) -> List[str]:
+        """Build the mineru command line for the given options"""
         cmd = [
             "mineru",
             "-p",
@@ -644,143 +779,268 @@ class MineruParser(Parser):
             cmd.extend(["-d", device])
         if vlm_url:
             cmd.extend(["-u", vlm_url])
+        return cmd
 
-        output_lines = []
-        error_lines = []
+    @staticmethod
+    async def _kill_process_group(
+        process: asyncio.subprocess.Process, grace: float = 5.0
+    ) -> None:
+        """Terminate mineru and every child it spawned, escalating to SIGKILL"""
+        if process.returncode is not None and os.name != "posix":
+            return
 
-        try:
-            # Prepare subprocess parameters to hide console window on Windows
-            import platform
-            import threading
-            from queue import Queue, Empty
+        def signal_group(sig):
+            try:
+                if os.name == "posix":
+                    os.killpg(process.pid, sig)
+                elif sig == signal.SIGTERM:
+                    process.terminate()
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
 
-            # Log the command being executed
-            logging.info(f"Executing mineru command: {' '.join(cmd)}")
+        signal_group(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except asyncio.TimeoutError:
+            pass
+        # Sweep workers that outlived the leader as well
+        signal_group(getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
 
-            subprocess_kwargs = {
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.PIPE,
-                "text": True,
-                "encoding": "utf-8",
-                "errors": "ignore",
-                "bufsize": 1,  # Line buffered
-            }
+    @staticmethod
+    async def _run_mineru_command_async(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Run mineru command line tool without blocking the event loop
 
-            # Hide console window on Windows
-            if platform.system() == "Windows":
-                subprocess_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        stdout/stderr are streamed line by line as they arrive. mineru runs in
+        its own process group, which is killed on timeout or when the awaiting
+        task is cancelled, so no orphaned workers keep running. If a warm
+        worker pool is configured the job runs there instead (no progress
+        events), falling back to the CLI when the pool is unavailable.
 
-            # Function to read output from subprocess and add to queue
-            def enqueue_output(pipe, queue, prefix):
-                try:
-                    for line in iter(pipe.readline, ""):
-                        if line.strip():  # Only add non-empty lines
-                            queue.put((prefix, line.strip()))
-                    pipe.close()
-                except Exception as e:
-                    queue.put((prefix, f"Error reading {prefix}: {e}"))
+        Args:
+            input_path: Path to input file or directory
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            backend: Parsing backend
+            start_page: Starting page number (0-based)
+            end_page: Ending page number (0-based)
+            formula: Enable formula parsing
+            table: Enable table parsing
+            device: Inference device
+            source: Model source
+            vlm_url: When the backend is `vlm-sglang-client`, you need to specify the server_url
+            timeout: Seconds before mineru is killed (None or 0 for no limit)
+            progress_callback: Called with {"input", "stage", "done", "total"}
+                for each progress update parsed from mineru output
+        """
+        pool = MineruParser._worker_pool
+        # Workers parse single files; directories (grouped batches) use the CLI
+        if pool is not None and pool.available and not Path(input_path).is_dir():
+            job = {
+                "input_path": str(input_path),
+                "output_dir": str(output_dir),
+                "method": method,
+                "lang": lang,
+                "backend": backend,
+                "start_page": start_page,
+                "end_page": end_page,
+                "formula": formula,
+                "table": table,
+                "device": device,
+                "source": source,
+                "vlm_url": vlm_url,
+            }
+            try:
+                logging.info(f"Parsing {input_path} on warm MinerU worker")
+                await pool.run_async(job, timeout)
+                return
+            except MineruWorkerUnavailable as e:
+                logging.warning(f"MinerU worker pool unavailable ({e}), using CLI")
+
+        cmd = MineruParser._build_mineru_command(
+            input_path,
+            output_dir,
+            method=method,
+            lang=lang,
+            backend=backend,
+            start_page=start_page,
+            end_page=end_page,
+            formula=formula,
+            table=table,
+            device=device,
+            source=source,
+            vlm_url=vlm_url,
+        )
 
-            # Start subprocess
-            process = subprocess.Popen(cmd, **subprocess_kwargs)
+        # Log the command being executed
+        logging.info(f"Executing mineru command: {' '.join(cmd)}")
 
-            # Create queues for stdout and stderr
-            stdout_queue = Queue()
-            stderr_queue = Queue()
+        subprocess_kwargs = {}
+        if platform.system() == "Windows":
+            # Hide console window on Windows
+            subprocess_kwargs["creationflags"] = (
+                subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+            )
+        else:
+            # Own process group so the whole tree can be killed at once
+            subprocess_kwargs["start_new_session"] = True
 
-            # Start threads to read output
-            stdout_thread = threading.Thread(
-                target=enqueue_output, args=(process.stdout, stdout_queue, "STDOUT")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **subprocess_kwargs,
             )
-            stderr_thread = threading.Thread(
-                target=enqueue_output, args=(process.stderr, stderr_queue, "STDERR")
+        except FileNotFoundError:
+            raise RuntimeError(
+                "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
+                "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
             )
 
-            stdout_thread.daemon = True
-            stderr_thread.daemon = True
-            stdout_thread.start()
-            stderr_thread.start()
-
-            # Process output in real time
-            while process.poll() is None:
-                # Check stdout queue
-                try:
-                    while True:
-                        prefix, line = stdout_queue.get_nowait()
-                        output_lines.append(line)
-                        # Log mineru output with INFO level, prefixed with [MinerU]
-                        logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
-
-                # Check stderr queue
-                try:
-                    while True:
-                        prefix, line = stderr_queue.get_nowait()
-                        # Log mineru errors with WARNING level
-                        if "warning" in line.lower():
-                            logging.warning(f"[MinerU] {line}")
-                        elif "error" in line.lower():
-                            logging.error(f"[MinerU] {line}")
-                            error_message = line.split("\n")[0]
-                            error_lines.append(error_message)
-                        else:
-                            logging.info(f"[MinerU] {line}")
-                except Empty:
-                    pass
-
-                # Small delay to prevent busy waiting
-                import time
-
-                time.sleep(0.1)
-
-            # Process any remaining output after process completion
-            try:
-                while True:
-                    prefix, line = stdout_queue.get_nowait()
-                    output_lines.append(line)
-                    logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
-
-            try:
-                while True:
-                    prefix, line = stderr_queue.get_nowait()
-                    if "warning" in line.lower():
-                        logging.warning(f"[MinerU] {line}")
-                    elif "error" in line.lower():
-                        logging.error(f"[MinerU] {line}")
-                        error_message = line.split("\n")[0]
-                        error_lines.append(error_message)
-                    else:
-                        logging.info(f"[MinerU] {line}")
-            except Empty:
-                pass
+        error_lines = []
+        last_progress = {}
+
+        def handle_line(line: str, is_stderr: bool):
+            line = line.strip()
+            if not line:
+                return
+
+            match = MineruParser._PROGRESS_PATTERN.search(line)
+            if match:
+                stage = match.group("stage").strip()
+                event = {
+                    "input": str(input_path),
+                    "stage": stage,
+                    "done": int(match.group("done")),
+                    "total": int(match.group("total")),
+                }
+                # tqdm redraws the same state several times
+                if last_progress.get(stage) == event["done"]:
+                    return
+                last_progress[stage] = event["done"]
+                if event["done"] == event["total"]:
+                    logging.info(f"[MinerU] {stage}: {event['done']}/{event['total']}")
+                else:
+                    logging.debug(f"[MinerU] {line}")
+                if progress_callback is not None:
+                    try:
+                        progress_callback(event)
+                    except Exception as e:
+                        logging.warning(f"MinerU progress callback failed: {e}")
+                return
+
+            if not is_stderr:
+                # Log mineru output with INFO level, prefixed with [MinerU]
+                logging.info(f"[MinerU] {line}")
+            elif "warning" in line.lower():
+                logging.warning(f"[MinerU] {line}")
+            elif "error" in line.lower():
+                logging.error(f"[MinerU] {line}")
+                error_lines.append(line)
+            else:
+                logging.info(f"[MinerU] {line}")
+
+        async def pump(stream, is_stderr: bool):
+            # Split on \r as well: tqdm redraws progress bars with carriage returns
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+            pending = ""
+            while True:
+                data = await stream.read(4096)
+                if not data:
+                    break
+                pending += decoder.decode(data)
+                *lines, pending = re.split(r"[\r\n]", pending)
+                for line in lines:
+                    handle_line(line, is_stderr)
+            handle_line(pending + decoder.decode(b"", final=True), is_stderr)
 
-            # Wait for process to complete and get return code
-            return_code = process.wait()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    pump(process.stdout, False),
+                    pump(process.stderr, True),
+                    process.wait(),
+                ),
+                timeout or None,
+            )
+        except asyncio.TimeoutError:
+            logging.error(f"[MinerU] Timed out after {timeout}s, killing {input_path}")
+            await MineruParser._kill_process_group(process)
+            raise MineruTimeoutError(timeout)
+        except asyncio.CancelledError:
+            logging.warning(f"[MinerU] Cancelled, killing {input_path}")
+            await MineruParser._kill_process_group(process)
+            raise
 
-            # Wait for threads to finish
-            stdout_thread.join(timeout=5)
-            stderr_thread.join(timeout=5)
+        return_code = process.returncode
+        if return_code != 0 or error_lines:
+            logging.info("[MinerU] Command executed failed")
+            raise MineruExecutionError(return_code, error_lines)
+        logging.info("[MinerU] Command executed successfully")
 
-            if return_code != 0 or error_lines:
-                logging.info("[MinerU] Command executed failed")
-                raise MineruExecutionError(return_code, error_lines)
-            else:
-                logging.info("[MinerU] Command executed successfully")
+    @staticmethod
+    def _run_mineru_command(
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        method: str = "auto",
+        lang: Optional[str] = None,
+        backend: Optional[str] = None,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        formula: bool = True,
+        table: bool = True,
+        device: Optional[str] = None,
+        source: Optional[str] = None,
+        vlm_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        Run mineru command line tool
 
-        except MineruExecutionError:
-            raise
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Error running mineru subprocess command: {e}")
-            logging.error(f"Command: {' '.join(cmd)}")
-            logging.error(f"Return code: {e.returncode}")
-            raise
-        except FileNotFoundError:
-            raise RuntimeError(
-                "mineru command not found. Please ensure MinerU 2.0 is properly installed:\n"
-                "pip install -U 'mineru[core]' or uv pip install -U 'mineru[core]'"
+        Blocking wrapper around _run_mineru_command_async, see there for arguments.
+        """
+        try:
+            _run_coroutine_sync(
+                MineruParser._run_mineru_command_async(
+                    input_path,
+                    output_dir,
+                    method=method,
+                    lang=lang,
+                    backend=backend,
+                    start_page=start_page,
+                    end_page=end_page,
+                    formula=formula,
+                    table=table,
+                    device=device,
+                    source=source,
+                    vlm_url=vlm_url,
+                    timeout=timeout,
+                    progress_callback=progress_callback,
+                )
             )
+        except (MineruExecutionError, RuntimeError):
+            raise
         except Exception as e:
             error_message = f"Unexpected error running mineru command: {e}"
             logging.error(error_message)
@@ -871,6 +1131,32 @@ class MineruParser(Parser):
             lang: Document language for OCR optimization
             **kwargs: Additional parameters for mineru command
 
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        return _run_coroutine_sync(
+            self.parse_pdf_async(pdf_path, output_dir, method, lang, **kwargs)
+        )
+
+    async def parse_pdf_async(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse PDF document using MinerU 2.0 without blocking the event loop
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            **kwargs: Additional parameters for mineru command, including
+                timeout (seconds) and progress_callback
+
         Returns:
             List[Dict[str, Any]]: List of content blocks
         """
@@ -891,7 +1177,7 @@ class MineruParser(Parser):
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
             # Run mineru command
-            self._run_mineru_command(
+            await self._run_mineru_command_async(
                 input_path=pdf_path,
                 output_dir=base_output_dir,
                 method=method,
@@ -900,12 +1186,15 @@ class MineruParser(Parser):
             )
 
             # Read the generated output files
-            backend = kwargs.get("backend", "")
+            backend = kwargs.get("backend") or ""
             if backend.startswith("vlm-"):
                 method = "vlm"
 
-            content_list, _ = self._read_output_files(
-                base_output_dir, name_without_suff, method=method
+            content_list, _ = await asyncio.to_thread(
+                self._read_output_files,
+                base_output_dir,
+                name_without_suff,
+                method=method,
             )
             return content_list
 
@@ -1102,6 +1391,310 @@ class MineruParser(Parser):
             logging.error(f"Error in parse_office_doc: {str(e)}")
             raise
 
+    @staticmethod
+    def _count_pdf_pages(pdf_path: Union[str, Path]) -> Optional[int]:
+        """Number of pages in a PDF, or None if no PDF library can tell"""
+        try:
+            import pypdfium2
+
+            pdf = pypdfium2.PdfDocument(str(pdf_path))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except ImportError:
+            pass
+        except Exception as e:
+            logging.warning(f"Could not count pages of {pdf_path}: {e}")
+            return None
+        try:
+            from pypdf import PdfReader
+
+            return len(PdfReader(str(pdf_path)).pages)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _merge_shard(
+        content_list: List[Dict[str, Any]],
+        shard_index: int,
+        first_page: int,
+        images_dir: Path,
+    ) -> Dict[str, str]:
+        """
+        Rebase one shard's content_list onto the unsharded output (in place)
+
+        MinerU parses ``-s``/``-e`` ranges as a sliced PDF, so a shard's
+        page_idx values start at 0 and are shifted by first_page. Images are
+        moved into images_dir. MinerU names images by content hash, so the same
+        image lands on the same path as in an unsharded parse; a different
+        image with a clashing name gets a shard prefix instead.
+
+        Returns:
+            Dict[str, str]: Renamed image file names (old -> new), for the markdown
+        """
+        renamed = {}
+        for item in content_list:
+            if not isinstance(item, dict):
+                continue
+            if isinstance(item.get("page_idx"), int):
+                item["page_idx"] += first_page
+            for field_name in ["img_path", "table_img_path", "equation_img_path"]:
+                if not item.get(field_name):
+                    continue
+                source = Path(item[field_name])
+                target = images_dir / source.name
+                if source.exists():
+                    if target.exists() and not filecmp.cmp(
+                        source, target, shallow=False
+                    ):
+                        target = images_dir / f"shard{shard_index:04d}_{source.name}"
+                        renamed[source.name] = target.name
+                    if not target.exists():
+                        shutil.move(str(source), str(target))
+                item[field_name] = str(target.resolve())
+        return renamed
+
+    @staticmethod
+    def _join_split_paragraph(head: str, tail: str) -> Optional[str]:
+        """
+        Join a paragraph cut at a shard boundary, or None if it was not cut
+
+        Mirrors MinerU's cross-page paragraph merge: the head must not end a
+        sentence and the tail must continue it (lower-case or CJK start).
+        Hyphenated words are rejoined; CJK text is joined without a space.
+        """
+        head, tail = head.rstrip(), tail.lstrip()
+        if not head or not tail or head[-1] in _SENTENCE_END:
+            return None
+        if not (tail[0].islower() or _is_cjk(tail[0])):
+            return None
+        if head[-1] == "-" and len(head) > 1 and head[-2].isalpha():
+            return head[:-1] + tail
+        if _is_cjk(head[-1]):
+            return head + tail
+        return f"{head} {tail}"
+
+    @classmethod
+    def _stitch_shards(
+        cls, previous: List[Dict[str, Any]], following: List[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Merge a paragraph split across two shards back into one block (in place)
+
+        The last body text block of ``previous`` absorbs the first body text
+        block of ``following``, which is removed, like MinerU does for a
+        paragraph that runs onto the next page. Page furniture (headers,
+        footers, page numbers) between them is skipped.
+
+        Returns:
+            The (head, tail) texts that were joined, or None if nothing was
+        """
+
+        def body_text(items, positions):
+            for i in positions:
+                item = items[i]
+                if not isinstance(item, dict) or item.get("type") in _PAGE_FURNITURE:
+                    continue
+                if item.get("type") == "text" and not item.get("text_level"):
+                    return i
+                return None
+            return None
+
+        last = body_text(previous, range(len(previous) - 1, -1, -1))
+        first = body_text(following, range(len(following)))
+        if last is None or first is None:
+            return None
+        head = previous[last].get("text") or ""
+        tail = following[first].get("text") or ""
+        joined = cls._join_split_paragraph(head, tail)
+        if joined is None:
+            return None
+        previous[last]["text"] = joined
+        del following[first]
+        return head, tail
+
+    async def parse_pdf_sharded_async(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        method: str = "auto",
+        lang: Optional[str] = None,
+        shard_pages: int = 50,
+        max_parallel_shards: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a large PDF as concurrent page-range shards
+
+        Each shard of shard_pages pages is parsed by its own MinerU run (or warm
+        worker) on an explicit ``-s``/``-e`` page range of the same file, in a
+        scratch directory. The results are merged into the same output layout,
+        page_idx values and image paths as an unsharded parse, and a paragraph
+        cut at a shard boundary is joined back into one block, so the
+        content-based doc_id does not depend on shard_pages.
+
+        PDFs with at most shard_pages pages, or calls with an explicit
+        start_page/end_page, are parsed unsharded.
+
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: Output directory path
+            method: Parsing method (auto, txt, ocr)
+            lang: Document language for OCR optimization
+            shard_pages: Pages per shard
+            max_parallel_shards: Concurrent shards (default: half the CPU cores)
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        pdf_path = Path(pdf_path)
+        page_count = (
+            await asyncio.to_thread(self._count_pdf_pages, pdf_path)
+            if pdf_path.exists()
+            else None
+        )
+        if (
+            not page_count
+            or shard_pages <= 0
+            or page_count <= shard_pages
+            or kwargs.get("start_page") is not None
+            or kwargs.get("end_page") is not None
+        ):
+            return await self.parse_pdf_async(pdf_path, output_dir, method, lang, **kwargs)
+
+        if not max_parallel_shards:
+            max_parallel_shards = max(1, (os.cpu_count() or 2) // 2)
+        ranges = [
+            (start, min(start + shard_pages, page_count) - 1)
+            for start in range(0, page_count, shard_pages)
+        ]
+        logging.info(
+            f"Parsing {pdf_path.name} ({page_count} pages) as {len(ranges)} shards "
+            f"of {shard_pages} pages, {max_parallel_shards} at a time"
+        )
+
+        base_output_dir = Path(output_dir) if output_dir else pdf_path.parent / "mineru_output"
+        shards_dir = base_output_dir / f".{pdf_path.stem}_shards"
+        read_method = "vlm" if (kwargs.get("backend") or "").startswith("vlm-") else method
+        semaphore = asyncio.Semaphore(max_parallel_shards)
+
+        async def parse_shard(index: int, first: int, last: int):
+            shard_dir = shards_dir / f"{index:04d}"
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            async with semaphore:
+                await self._run_mineru_command_async(
+                    input_path=pdf_path,
+                    output_dir=shard_dir,
+                    method=method,
+                    lang=lang,
+                    start_page=first,
+                    end_page=last,
+                    **kwargs,
+                )
+            return await asyncio.to_thread(
+                self._read_output_files, shard_dir, pdf_path.stem, method=read_method
+            )
+
+        tasks = [
+            asyncio.create_task(parse_shard(i, first, last))
+            for i, (first, last) in enumerate(ranges)
+        ]
+        try:
+            shard_results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed shard fails the document; stop the rest
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            shutil.rmtree(shards_dir, ignore_errors=True)
+            raise
+
+        # Merge into the layout of an unsharded parse
+        final_dir = base_output_dir / pdf_path.stem / read_method
+        images_dir = final_dir / "images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+
+        content_list: List[Dict[str, Any]] = []
+        markdown = ""
+        for index, ((shard_list, shard_md), (first, _)) in enumerate(
+            zip(shard_results, ranges)
+        ):
+            renamed = self._merge_shard(shard_list, index, first, images_dir)
+            for old, new in renamed.items():
+                shard_md = shard_md.replace(f"images/{old}", f"images/{new}")
+
+            stitched = self._stitch_shards(content_list, shard_list) if index else None
+            content_list.extend(shard_list)
+            if not index:
+                markdown = shard_md
+                continue
+            head_md, tail_md = markdown.rstrip(), shard_md.lstrip()
+            if (
+                stitched
+                and head_md.endswith(stitched[0].rstrip())
+                and tail_md.startswith(stitched[1].lstrip())
+            ):
+                markdown = self._join_split_paragraph(head_md, tail_md)
+            else:
+                markdown = f"{markdown}\n\n{shard_md}"
+
+        def write_outputs():
+            relative = []
+            for item in content_list:
+                item = dict(item) if isinstance(item, dict) else item
+                if isinstance(item, dict):
+                    for field_name in ["img_path", "table_img_path", "equation_img_path"]:
+                        if item.get(field_name):
+                            item[field_name] = f"images/{Path(item[field_name]).name}"
+                relative.append(item)
+            with open(
+                final_dir / f"{pdf_path.stem}_content_list.json", "w", encoding="utf-8"
+            ) as f:
+                json.dump(relative, f, ensure_ascii=False, indent=4)
+            with open(final_dir / f"{pdf_path.stem}.md", "w", encoding="utf-8") as f:
+                f.write(markdown)
+            shutil.rmtree(shards_dir, ignore_errors=True)
+
+        await asyncio.to_thread(write_outputs)
+        logging.info(
+            f"Merged {len(ranges)} shards of {pdf_path.name}: {len(content_list)} blocks"
+        )
+        return content_list
+
+    async def parse_office_doc_async(
+        self,
+        doc_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of parse_office_doc: LibreOffice conversion runs in a
+        worker thread, the MinerU parse on the event loop
+
+        Args:
+            doc_path: Path to the document file (.doc, .docx, .ppt, .pptx, .xls, .xlsx)
+            output_dir: Output directory path
+            lang: Document language for OCR optimization
+            **kwargs: Additional parameters for mineru command
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        try:
+            pdf_path = await asyncio.to_thread(
+                self.convert_office_to_pdf, doc_path, output_dir
+            )
+            return await self.parse_pdf_async(
+                pdf_path=pdf_path, output_dir=output_dir, lang=lang, **kwargs
+            )
+
+        except Exception as e:
+            logging.error(f"Error in parse_office_doc: {str(e)}")
+            raise
+
     def parse_text_file(
         self,
         text_path: Union[str, Path],
@@ -1436,119 +2029,284 @@ class DoclingParser(Parser):
         content_list = []
         if json_file.exists():
             try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    docling_content = json.load(f)
-                    # Convert docling format to minerU format
-                    content_list = self.read_from_block_recursive(
-                        docling_content["body"],
-                        "body",
-                        file_subdir,
-                        0,
-                        "0",
-                        docling_content,
-                    )
+                # Convert docling format to minerU format
+                content_list = list(self.iter_content_list(json_file, file_subdir))
             except Exception as e:
                 logging.warning(f"Could not read or convert JSON file {json_file}: {e}")
         return content_list, md_content
 
-    def read_from_block_recursive(
+    # Top-level DoclingDocument arrays that body/group children refer to
+    _DOCLING_COLLECTIONS = ("groups", "texts", "pictures", "tables")
+
+    @staticmethod
+    def _stream_docling_json(json_file: Path) -> Iterator[Tuple[str, Optional[int], Any]]:
+        """
+        Yield ("body", None, body) and (collection, index, item) for every item of
+        the top-level groups/texts/pictures/tables arrays, in file order.
+
+        With ijson installed the file is parsed incrementally, so only one item
+        (e.g. one base64 picture) is materialised at a time; otherwise it is
+        loaded whole with json.load.
+        """
+        try:
+            import ijson
+        except ImportError:
+            with open(json_file, "r", encoding="utf-8") as f:
+                document = json.load(f)
+            yield "body", None, document.get("body") or {}
+            for key in DoclingParser._DOCLING_COLLECTIONS:
+                for index, item in enumerate(document.get(key) or []):
+                    yield key, index, item
+            return
+
+        with open(json_file, "rb") as f:
+            builder, key, index, depth = None, None, None, 0
+            counters: Dict[str, int] = {}
+            for prefix, event, value in ijson.parse(f):
+                if builder is None:
+                    if event != "start_map":
+                        continue
+                    if prefix == "body":
+                        key, index = "body", None
+                    elif (
+                        prefix.endswith(".item")
+                        and prefix[:-5] in DoclingParser._DOCLING_COLLECTIONS
+                    ):
+                        key = prefix[:-5]
+                        index = counters.get(key, 0)
+                        counters[key] = index + 1
+                    else:
+                        continue
+                    builder, depth = ijson.ObjectBuilder(), 0
+
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                    if depth == 0:
+                        yield key, index, builder.value
+                        builder = None
+
+    @staticmethod
+    def _docling_page_idx(item: Dict[str, Any]) -> Optional[int]:
+        """0-based page index from the item's provenance (Docling pages are 1-based)"""
+        for prov in item.get("prov") or []:
+            page_no = prov.get("page_no")
+            if page_no is not None:
+                return int(page_no) - 1
+        return None
+
+    @staticmethod
+    def _docling_table_html(data: Dict[str, Any]) -> str:
+        """Render Docling TableData cells as an HTML table, as MinerU does"""
+        import html
+
+        rows: Dict[int, List[Dict[str, Any]]] = {}
+        for cell in data.get("table_cells") or []:
+            rows.setdefault(int(cell.get("start_row_offset_idx", 0)), []).append(cell)
+
+        parts = ["<table>"]
+        for row_index in sorted(rows):
+            parts.append("<tr>")
+            for cell in sorted(rows[row_index], key=lambda c: c.get("start_col_offset_idx", 0)):
+                tag = "th" if cell.get("column_header") else "td"
+                span = ""
+                if int(cell.get("row_span", 1)) > 1:
+                    span += f' rowspan="{cell["row_span"]}"'
+                if int(cell.get("col_span", 1)) > 1:
+                    span += f' colspan="{cell["col_span"]}"'
+                parts.append(f"<{tag}{span}>{html.escape(cell.get('text', ''))}</{tag}>")
+            parts.append("</tr>")
+        parts.append("</table>")
+        return "".join(parts)
+
+    def _convert_docling_item(
         self,
-        block,
-        type: str,
+        collection: str,
+        index: int,
+        item: Dict[str, Any],
         output_dir: Path,
-        cnt: int,
-        num: str,
-        docling_content: Dict[str, Any],
-    ) -> List[Dict[str, Any]]:
-        content_list = []
-        if not block.get("children"):
-            cnt += 1
-            content_list.append(self.read_from_block(block, type, output_dir, cnt, num))
-        else:
-            if type not in ["groups", "body"]:
-                cnt += 1
-                content_list.append(
-                    self.read_from_block(block, type, output_dir, cnt, num)
-                )
-            members = block["children"]
-            for member in members:
-                cnt += 1
-                member_tag = member["$ref"]
-                member_type = member_tag.split("/")[1]
-                member_num = member_tag.split("/")[2]
-                member_block = docling_content[member_type][int(member_num)]
-                content_list.extend(
-                    self.read_from_block_recursive(
-                        member_block,
-                        member_type,
-                        output_dir,
-                        cnt,
-                        member_num,
-                        docling_content,
-                    )
-                )
-        return content_list
+        json_dir: Path,
+        notes: Dict[str, str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Convert one Docling item to a MinerU content block
 
-    def read_from_block(
-        self, block, type: str, output_dir: Path, cnt: int, num: str
-    ) -> Dict[str, Any]:
-        if type == "texts":
-            if block["label"] == "formula":
+        Returns None for captions/footnotes of pictures and tables, which are
+        folded into the owning block instead. ``page_idx`` is None when the item
+        has no provenance; the caller fills it in from reading order.
+        """
+        page_idx = self._docling_page_idx(item)
+
+        def resolve(refs) -> List[str]:
+            return [
+                notes[ref["$ref"]]
+                for ref in refs or []
+                if isinstance(ref, dict) and ref.get("$ref") in notes
+            ]
+
+        if collection == "texts":
+            label = item.get("label")
+            parent = (item.get("parent") or {}).get("$ref", "")
+            if label in ("caption", "footnote") and parent.startswith(
+                ("#/pictures/", "#/tables/")
+            ):
+                return None
+            if label == "formula":
                 return {
                     "type": "equation",
                     "img_path": "",
-                    "text": block["orig"],
+                    "text": item.get("orig", ""),
                     "text_format": "unknown",
-                    "page_idx": cnt // 10,
-                }
-            else:
-                return {
-                    "type": "text",
-                    "text": block["orig"],
-                    "page_idx": cnt // 10,
+                    "page_idx": page_idx,
                 }
-        elif type == "pictures":
+            block = {"type": "text", "text": item.get("orig", ""), "page_idx": page_idx}
+            if label == "title":
+                block["text_level"] = 1
+            elif label == "section_header":
+                block["text_level"] = min(int(item.get("level", 1)) + 1, 6)
+            return block
+
+        if collection == "pictures":
             try:
-                base64_uri = block["image"]["uri"]
-                base64_str = base64_uri.split(",")[1]
-                # Create images directory within the docling subdirectory
+                uri = item["image"]["uri"]
                 image_dir = output_dir / "images"
-                image_dir.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-                image_path = image_dir / f"image_{num}.png"
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(base64_str))
+                image_dir.mkdir(parents=True, exist_ok=True)
+                image_path = image_dir / f"image_{index}.png"
+                if uri.startswith("data:"):
+                    with open(image_path, "wb") as f:
+                        f.write(base64.b64decode(uri.split(",", 1)[1]))
+                else:
+                    # Image exported as a file next to the JSON
+                    image_path = (json_dir / uri).resolve()
                 return {
                     "type": "image",
                     "img_path": str(image_path.resolve()),  # Convert to absolute path
-                    "image_caption": block.get("caption", ""),
-                    "image_footnote": block.get("footnote", ""),
-                    "page_idx": cnt // 10,
+                    "image_caption": resolve(item.get("captions")),
+                    "image_footnote": resolve(item.get("footnotes")),
+                    "page_idx": page_idx,
                 }
             except Exception as e:
-                logging.warning(f"Failed to process image {num}: {e}")
+                logging.warning(f"Failed to process image {index}: {e}")
                 return {
                     "type": "text",
-                    "text": f"[Image processing failed: {block.get('caption', '')}]",
-                    "page_idx": cnt // 10,
-                }
-        else:
-            try:
-                return {
-                    "type": "table",
-                    "img_path": "",
-                    "table_caption": block.get("caption", ""),
-                    "table_footnote": block.get("footnote", ""),
-                    "table_body": block.get("data", []),
-                    "page_idx": cnt // 10,
-                }
-            except Exception as e:
-                logging.warning(f"Failed to process table {num}: {e}")
-                return {
-                    "type": "text",
-                    "text": f"[Table processing failed: {block.get('caption', '')}]",
-                    "page_idx": cnt // 10,
+                    "text": f"[Image processing failed: {' '.join(resolve(item.get('captions')))}]",
+                    "page_idx": page_idx,
                 }
 
+        try:
+            return {
+                "type": "table",
+                "img_path": "",
+                "table_caption": resolve(item.get("captions")),
+                "table_footnote": resolve(item.get("footnotes")),
+                "table_body": self._docling_table_html(item.get("data") or {}),
+                "page_idx": page_idx,
+            }
+        except Exception as e:
+            logging.warning(f"Failed to process table {index}: {e}")
+            return {
+                "type": "text",
+                "text": f"[Table processing failed: {' '.join(resolve(item.get('captions')))}]",
+                "page_idx": page_idx,
+            }
+
+    def iter_content_list(
+        self, json_file: Union[str, Path], output_dir: Optional[Union[str, Path]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Convert a Docling JSON export to MinerU content blocks, lazily
+
+        Walks body -> groups -> items iteratively (no recursion limit) in reading
+        order while the JSON is still being streamed, so blocks are yielded as
+        soon as every item before them has been read. Pictures are written to
+        ``<output_dir>/images`` as they stream past.
+
+        Args:
+            json_file: Docling JSON output (``docling --to json``)
+            output_dir: Directory for extracted images (default: the JSON's directory)
+
+        Yields:
+            Dict[str, Any]: Content blocks with ``page_idx`` from Docling provenance
+        """
+        json_file = Path(json_file)
+        output_dir = Path(output_dir) if output_dir else json_file.parent
+
+        groups: Dict[int, Dict[str, Any]] = {}
+        # Converted items waiting for the walk to reach them: ref -> (block, child refs)
+        ready: Dict[str, Tuple[Optional[Dict[str, Any]], List[str]]] = {}
+        notes: Dict[str, str] = {}  # caption/footnote texts by ref
+        stack: List[Iterator] = []
+        state = {"blocked": None, "page_idx": 0}
+
+        def walk(final: bool) -> Iterator[Dict[str, Any]]:
+            # Depth-first over child refs; pauses at refs not streamed yet
+            while stack:
+                ref = state["blocked"]
+                if ref is None:
+                    child = next(stack[-1], None)
+                    if child is None:
+                        stack.pop()
+                        continue
+                    ref = child.get("$ref", "") if isinstance(child, dict) else child
+                parts = ref.split("/")
+                collection = parts[1] if len(parts) == 3 else None
+                index = int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else None
+
+                if collection == "groups" and index is not None:
+                    if index not in groups:
+                        if not final:
+                            state["blocked"] = ref
+                            return
+                        logging.warning(f"Docling reference {ref} not found, skipping")
+                    else:
+                        stack.append(iter(groups.pop(index).get("children") or []))
+                    state["blocked"] = None
+                    continue
+
+                if collection not in self._DOCLING_COLLECTIONS or index is None:
+                    state["blocked"] = None
+                    continue
+
+                if ref not in ready:
+                    if not final:
+                        state["blocked"] = ref
+                        return
+                    logging.warning(f"Docling reference {ref} not found, skipping")
+                    state["blocked"] = None
+                    continue
+
+                state["blocked"] = None
+                block, children = ready.pop(ref)
+                if block is not None:
+                    # Items without provenance (e.g. DOCX, HTML) inherit the last page
+                    if block["page_idx"] is None:
+                        block["page_idx"] = state["page_idx"]
+                    else:
+                        state["page_idx"] = block["page_idx"]
+                    yield block
+                if children:
+                    stack.append(iter(children))
+
+        for collection, index, item in self._stream_docling_json(json_file):
+            if collection == "body":
+                stack.append(iter(item.get("children") or []))
+            elif collection == "groups":
+                groups[index] = item
+            else:
+                ref = f"#/{collection}/{index}"
+                if collection == "texts" and item.get("label") in ("caption", "footnote"):
+                    notes[ref] = item.get("orig", "")
+                ready[ref] = (
+                    self._convert_docling_item(
+                        collection, index, item, output_dir, json_file.parent, notes
+                    ),
+                    [c.get("$ref", "") for c in item.get("children") or []],
+                )
+            yield from walk(final=False)
+        yield from walk(final=True)
+
     def parse_office_doc(
         self,
         doc_path: Union[str, Path],
@@ -1699,6 +2457,329 @@ class DoclingParser(Parser):
             return False
 
 
+class TextParser(Parser):
+    """
+    Native parser for plain text and Markdown files.
+
+    Builds a MinerU-compatible content_list straight from the source instead of
+    rendering it to PDF and running layout analysis and OCR on the result.
+    Markdown headings become text blocks with ``text_level``, pipe tables become
+    ``table`` blocks (HTML body, as MinerU emits), ``$$`` blocks become
+    ``equation`` blocks and standalone local images become ``image`` blocks.
+    ``page_idx`` advances at form feeds and otherwise every ``page_chars``
+    characters, at block boundaries.
+    """
+
+    # Characters per synthetic page when the text has no form feeds
+    DEFAULT_PAGE_CHARS = 3000
+
+    _HEADING = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+    _SETEXT_UNDERLINE = re.compile(r"^ {0,3}(=+|-+)\s*$")
+    _THEMATIC_BREAK = re.compile(r"^ {0,3}([-*_])(\s*\1){2,}\s*$")
+    _FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*([\w+-]*)")
+    _IMAGE = re.compile(
+        r"^\s*!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+[\"'(].*[\"')])?\s*\)\s*$"
+    )
+    _TABLE_DIVIDER = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+    def __init__(self) -> None:
+        """Initialize TextParser"""
+        super().__init__()
+
+    @staticmethod
+    def _split_row(line: str) -> List[str]:
+        row = line.strip()
+        if row.startswith("|"):
+            row = row[1:]
+        if row.endswith("|") and not row.endswith("\\|"):
+            row = row[:-1]
+        return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", row)]
+
+    @classmethod
+    def _table_html(cls, header: str, rows: List[str]) -> str:
+        import html
+
+        head = "".join(f"<th>{html.escape(c)}</th>" for c in cls._split_row(header))
+        body = "".join(
+            "<tr>"
+            + "".join(f"<td>{html.escape(c)}</td>" for c in cls._split_row(row))
+            + "</tr>"
+            for row in rows
+        )
+        return f"<table><tr>{head}</tr>{body}</table>"
+
+    @staticmethod
+    def _split_long_text(text: str, page_chars: int) -> List[str]:
+        """Split an oversized paragraph at line boundaries"""
+        if len(text) <= page_chars:
+            return [text]
+        pieces, current = [], ""
+        for line in text.split("\n"):
+            if current and len(current) + len(line) + 1 > page_chars:
+                pieces.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _image_block(self, alt: str, target: str, base_dir: Path) -> Optional[Dict]:
+        from urllib.parse import unquote, urlparse
+
+        if urlparse(target).scheme not in ("", "file"):
+            return None  # remote or data URI: nothing to hand to the vision model
+        image_path = (base_dir / unquote(urlparse(target).path)).resolve()
+        if not image_path.is_file():
+            return None
+        return {
+            "type": "image",
+            "img_path": str(image_path),
+            "image_caption": [alt] if alt else [],
+            "image_footnote": [],
+        }
+
+    def _markdown_blocks(self, text: str, base_dir: Path) -> List[Dict[str, Any]]:
+        """Turn one form-feed-delimited section of Markdown into content blocks"""
+        lines = text.split("\n")
+        blocks: List[Dict[str, Any]] = []
+        paragraph: List[str] = []
+
+        def flush_paragraph():
+            if paragraph:
+                blocks.append({"type": "text", "text": "\n".join(paragraph).strip()})
+                paragraph.clear()
+
+        i = 0
+        # YAML front matter is kept as a plain text block
+        if lines and lines[0].strip() == "---":
+            for j in range(1, len(lines)):
+                if lines[j].strip() in ("---", "..."):
+                    blocks.append({"type": "text", "text": "\n".join(lines[: j + 1])})
+                    i = j + 1
+                    break
+
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                flush_paragraph()
+                i += 1
+                continue
+
+            # Setext heading: the paragraph so far, underlined with === or ---
+            if paragraph and self._SETEXT_UNDERLINE.match(line):
+                level = 1 if stripped.startswith("=") else 2
+                blocks.append(
+                    {"type": "text", "text": " ".join(p.strip() for p in paragraph), "text_level": level}
+                )
+                paragraph.clear()
+                i += 1
+                continue
+
+            heading = self._HEADING.match(line)
+            if heading:
+                flush_paragraph()
+                blocks.append(
+                    {"type": "text", "text": heading.group(2), "text_level": len(heading.group(1))}
+                )
+                i += 1
+                continue
+
+            if self._THEMATIC_BREAK.match(line):
+                flush_paragraph()
+                i += 1
+                continue
+
+            fence = self._FENCE.match(line)
+            if fence:
+                flush_paragraph()
+                marker, info = fence.group(1), fence.group(2).lower()
+                j = i + 1
+                while j < len(lines) and not lines[j].strip().startswith(marker):
+                    j += 1
+                body = "\n".join(lines[i + 1 : j])
+                if info in ("math", "latex", "tex"):
+                    blocks.append(
+                        {"type": "equation", "text": f"$$\n{body.strip()}\n$$", "text_format": "latex"}
+                    )
+                else:
+                    blocks.append({"type": "text", "text": "\n".join(lines[i : j + 1])})
+                i = j + 1
+                continue
+
+            if stripped.startswith("$$"):
+                flush_paragraph()
+                if len(stripped) > 4 and stripped.endswith("$$"):
+                    latex, i = stripped[2:-2], i + 1
+                else:
+                    j = i + 1
+                    while j < len(lines) and not lines[j].strip().endswith("$$"):
+                        j += 1
+                    latex = "\n".join([stripped[2:]] + lines[i + 1 : j + 1])
+                    latex = latex.strip()
+                    if latex.endswith("$$"):
+                        latex = latex[:-2]
+                    i = j + 1
+                blocks.append(
+                    {"type": "equation", "text": f"$$\n{latex.strip()}\n$$", "text_format": "latex"}
+                )
+                continue
+
+            image = self._IMAGE.match(line)
+            if image:
+                block = self._image_block(image.group(1), image.group(2), base_dir)
+                if block is not None:
+                    flush_paragraph()
+                    blocks.append(block)
+                    i += 1
+                    continue
+
+            if (
+                "|" in line
+                and i + 1 < len(lines)
+                and "-" in lines[i + 1]
+                and self._TABLE_DIVIDER.match(lines[i + 1])
+            ):
+                flush_paragraph()
+                j = i + 2
+                while j < len(lines) and lines[j].strip() and "|" in lines[j]:
+                    j += 1
+                blocks.append(
+                    {
+                        "type": "table",
+                        "img_path": "",
+                        "table_caption": [],
+                        "table_body": self._table_html(line, lines[i + 2 : j]),
+                        "table_footnote": [],
+                    }
+                )
+                i = j
+                continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush_paragraph()
+        return blocks
+
+    @staticmethod
+    def _plain_text_blocks(text: str) -> List[Dict[str, Any]]:
+        """Blank-line separated paragraphs of a plain text section"""
+        return [
+            {"type": "text", "text": paragraph.strip()}
+            for paragraph in re.split(r"\n\s*\n", text)
+            if paragraph.strip()
+        ]
+
+    def parse_text_file(
+        self,
+        text_path: Union[str, Path],
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        page_chars: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a text or Markdown file directly into content blocks
+
+        Args:
+            text_path: Path to the text file (.txt, .md)
+            output_dir: If given, content_list.json is also written to
+                <output_dir>/<stem>/native/ like the other parsers' output
+            lang: Unused, accepted for interface compatibility
+            page_chars: Characters per synthetic page (default DEFAULT_PAGE_CHARS)
+            **kwargs: Ignored parser options (backend, device, ...)
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        text_path = Path(text_path)
+        if not text_path.exists():
+            raise FileNotFoundError(f"Text file does not exist: {text_path}")
+        if text_path.suffix.lower() not in self.TEXT_FORMATS:
+            raise ValueError(f"Unsupported text format: {text_path.suffix}")
+
+        page_chars = page_chars or self.DEFAULT_PAGE_CHARS
+        text = self._read_text_file(text_path).replace("\r\n", "\n").replace("\r", "\n")
+        is_markdown = text_path.suffix.lower() == ".md"
+
+        content_list: List[Dict[str, Any]] = []
+        page_idx = -1
+        for section in text.split("\f"):
+            blocks = (
+                self._markdown_blocks(section, text_path.parent)
+                if is_markdown
+                else self._plain_text_blocks(section)
+            )
+            page_idx += 1
+            page_used = 0
+            for block in blocks:
+                pieces = (
+                    self._split_long_text(block["text"], page_chars)
+                    if block["type"] == "text" and "text_level" not in block
+                    else [None]
+                )
+                for piece in pieces:
+                    if piece is not None:
+                        block = {"type": "text", "text": piece}
+                    size = len(block.get("text") or block.get("table_body") or "")
+                    if page_used and page_used + size > page_chars:
+                        page_idx += 1
+                        page_used = 0
+                    page_used += size
+                    content_list.append({**block, "page_idx": page_idx})
+
+        if output_dir:
+            result_dir = Path(output_dir) / text_path.stem / "native"
+            result_dir.mkdir(parents=True, exist_ok=True)
+            with open(
+                result_dir / f"{text_path.stem}_content_list.json", "w", encoding="utf-8"
+            ) as f:
+                json.dump(content_list, f, ensure_ascii=False, indent=2)
+
+        logging.info(
+            f"Parsed {text_path.name} natively: {len(content_list)} blocks, "
+            f"{page_idx + 1} pages"
+        )
+        return content_list
+
+    def parse_document(
+        self,
+        file_path: Union[str, Path],
+        method: str = "auto",
+        output_dir: Optional[str] = None,
+        lang: Optional[str] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse a text or Markdown document without MinerU or Docling
+
+        Args:
+            file_path: Path to the file to be parsed (.txt, .md)
+            method: Unused, accepted for interface compatibility
+            output_dir: Output directory path
+            lang: Unused, accepted for interface compatibility
+            **kwargs: Additional parameters passed to parse_text_file
+
+        Returns:
+            List[Dict[str, Any]]: List of content blocks
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File does not exist: {file_path}")
+        if file_path.suffix.lower() not in self.TEXT_FORMATS:
+            raise ValueError(
+                f"TextParser only supports {sorted(self.TEXT_FORMATS)}, got '{file_path.suffix}'"
+            )
+        return self.parse_text_file(file_path, output_dir, lang, **kwargs)
+
+    def check_installation(self) -> bool:
+        """TextParser has no external dependencies"""
+        return True
+
+
 def main():
     """
     Main function to run the document parser from command line
@@ -1763,9 +2844,9 @@ def main():
     )
     parser.add_argument(
         "--parser",
-        choices=["mineru", "docling"],
+        choices=["mineru", "docling", "text"],
         default="mineru",
-        help="Parser selection",
+        help="Parser selection (text: native .txt/.md parsing, no PDF conversion)",
     )
     parser.add_argument(
         "--vlm_url",
@@ -1774,9 +2855,11 @@ def main():
 
     args = parser.parse_args()
 
+    parsers = {"mineru": MineruParser, "docling": DoclingParser, "text": TextParser}
+
     # Check installation if requested
     if args.check:
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = parsers[args.parser]()
         if doc_parser.check_installation():
             print(f"✅ {args.parser.title()} is properly installed")
             return 0
@@ -1786,7 +2869,7 @@ def main():
 
     try:
         # Parse the document
-        doc_parser = DoclingParser() if args.parser == "docling" else MineruParser()
+        doc_parser = parsers[args.parser]()
         content_list = doc_parser.parse_document(
             file_path=args.file_path,
             method=args.method,
@@ -5,14 +5,22 @@ Contains methods for parsing documents and processing multimodal content
 """
 
 import os
+import copy
 import time
 import hashlib
 import json
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Tuple, Optional
 from pathlib import Path
 
 from raganything.base import DocStatus
-from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
+from raganything.doc_status_buffer import DocStatusBuffer
+from raganything.parse_cache import sha256_file
+from raganything.parser import (
+    MineruParser,
+    DoclingParser,
+    TextParser,
+    MineruExecutionError,
+)
 from raganything.utils import (
     separate_content,
     insert_text_content,
@@ -23,6 +31,43 @@ import asyncio
 from lightrag.utils import compute_mdhash_id
 
 
+class _UnionUpsertStorage:
+    """
+    Storage proxy that unions list fields across repeated upserts of a key
+
+    merge_nodes_and_edges overwrites the document's full_entities and
+    full_relations record with the entities/relations of the chunks it was
+    given. Streaming merges call it once per micro-batch, so the records are
+    accumulated here to end up as if all chunks had been merged at once.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+        self._written: Dict[str, Dict[str, Any]] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def upsert(self, data: Dict[str, Dict[str, Any]]):
+        merged = {}
+        for key, value in data.items():
+            value = dict(value)
+            previous = self._written.get(key, {})
+            list_fields = [f for f, v in value.items() if isinstance(v, list)]
+            for field_name in list_fields:
+                seen = {}
+                for item in previous.get(field_name, []) + value[field_name]:
+                    seen.setdefault(
+                        tuple(item) if isinstance(item, list) else item, item
+                    )
+                value[field_name] = list(seen.values())
+            if "count" in value and len(list_fields) == 1:
+                value["count"] = len(value[list_fields[0]])
+            self._written[key] = value
+            merged[key] = value
+        await self._storage.upsert(merged)
+
+
 class ProcessorMixin:
     """ProcessorMixin class containing document processing functionality for RAGAnything"""
 
@@ -41,30 +86,63 @@ class ProcessorMixin:
         else:
             return os.path.basename(file_path)
 
+    def _uses_native_text_parser(self, file_path: Path) -> bool:
+        """Whether this file is parsed by TextParser instead of the configured parser"""
+        extensions = {
+            ext.strip().lower() for ext in self.config.native_text_extensions
+        }
+        return Path(file_path).suffix.lower() in extensions & TextParser.TEXT_FORMATS
+
+    def _parser_name_for(self, file_path: Path) -> str:
+        """Parser name recorded in the parse cache for this file"""
+        if self._uses_native_text_parser(file_path):
+            return "text"
+        return self.config.parser
+
+    def _parser_options_for(self, file_path: Path) -> Dict[str, Any]:
+        """Config-driven parser options that change the parse output of this file"""
+        if self._uses_native_text_parser(file_path):
+            return {"page_chars": self.config.text_page_chars}
+        return {}
+
+    def _file_digest(self, file_path: Path) -> str:
+        """Content digest of a file, via the path -> digest index when available"""
+        file_digests = getattr(self, "file_digests", None)
+        if file_digests is not None:
+            return file_digests.digest(file_path)
+        return sha256_file(file_path)
+
     def _generate_cache_key(
-        self, file_path: Path, parse_method: str = None, **kwargs
+        self,
+        file_path: Path,
+        parse_method: str = None,
+        file_digest: str = None,
+        **kwargs,
     ) -> str:
         """
-        Generate cache key based on file path and parsing configuration
+        Generate cache key based on file content and parsing configuration
+
+        The key does not depend on the file's path or mtime, so moved, copied or
+        re-uploaded documents hit the cache.
 
         Args:
             file_path: Path to the file
             parse_method: Parse method used
+            file_digest: sha256 of the file bytes (computed if not given)
             **kwargs: Additional parser parameters
 
         Returns:
             str: Cache key for the file and configuration
         """
-
-        # Get file modification time
-        mtime = file_path.stat().st_mtime
+        if file_digest is None:
+            file_digest = self._file_digest(file_path)
 
         # Create configuration dict for cache key
         config_dict = {
-            "file_path": str(file_path.absolute()),
-            "mtime": mtime,
-            "parser": self.config.parser,
+            "sha256": file_digest,
+            "parser": self._parser_name_for(file_path),
             "parse_method": parse_method or self.config.parse_method,
+            **self._parser_options_for(file_path),
         }
 
         # Add relevant kwargs to config
@@ -138,7 +216,7 @@ class ProcessorMixin:
 
         Args:
             cache_key: Cache key to look up
-            file_path: Path to the file for mtime check
+            file_path: Path to the file being parsed
             parse_method: Parse method used
             **kwargs: Additional parser parameters
 
@@ -153,19 +231,12 @@ class ProcessorMixin:
             if not cached_data:
                 return None
 
-            # Check file modification time
-            current_mtime = file_path.stat().st_mtime
-            cached_mtime = cached_data.get("mtime", 0)
-
-            if current_mtime != cached_mtime:
-                self.logger.debug(f"Cache invalid - file modified: {cache_key}")
-                return None
-
             # Check parsing configuration
             cached_config = cached_data.get("parse_config", {})
             current_config = {
-                "parser": self.config.parser,
+                "parser": self._parser_name_for(file_path),
                 "parse_method": parse_method or self.config.parse_method,
+                **self._parser_options_for(file_path),
             }
 
             # Add relevant kwargs to current config
@@ -193,6 +264,20 @@ class ProcessorMixin:
             content_list = cached_data.get("content_list", [])
             doc_id = cached_data.get("doc_id")
 
+            # A copy cached from another path may point at images that are gone
+            missing_images = [
+                item["img_path"]
+                for item in content_list
+                if isinstance(item, dict)
+                and item.get("img_path")
+                and not os.path.exists(item["img_path"])
+            ]
+            if missing_images:
+                self.logger.debug(
+                    f"Cache invalid - {len(missing_images)} image files missing: {cache_key}"
+                )
+                return None
+
             if content_list and doc_id:
                 self.logger.debug(
                     f"Found valid cached parsing result for key: {cache_key}"
@@ -216,6 +301,7 @@ class ProcessorMixin:
         doc_id: str,
         file_path: Path,
         parse_method: str = None,
+        file_digest: str = None,
         **kwargs,
     ) -> None:
         """
@@ -225,21 +311,20 @@ class ProcessorMixin:
             cache_key: Cache key to store under
             content_list: Content list to cache
             doc_id: Content-based document ID
-            file_path: Path to the file for mtime storage
+            file_path: Path to the parsed file (recorded for reference)
             parse_method: Parse method used
+            file_digest: sha256 of the file bytes
             **kwargs: Additional parser parameters
         """
         if not hasattr(self, "parse_cache") or self.parse_cache is None:
             return
 
         try:
-            # Get file modification time
-            file_mtime = file_path.stat().st_mtime
-
             # Create parsing configuration
             parse_config = {
-                "parser": self.config.parser,
+                "parser": self._parser_name_for(file_path),
                 "parse_method": parse_method or self.config.parse_method,
+                **self._parser_options_for(file_path),
             }
 
             # Add relevant kwargs to config
@@ -264,15 +349,14 @@ class ProcessorMixin:
                 cache_key: {
                     "content_list": content_list,
                     "doc_id": doc_id,
-                    "mtime": file_mtime,
+                    "sha256": file_digest,
+                    "source_path": str(file_path.absolute()),
                     "parse_config": parse_config,
                     "cached_at": time.time(),
-                    "cache_version": "1.0",
                 }
             }
+            # Committed per entry; no full-store rewrite per document
             await self.parse_cache.upsert(cache_data)
-            # Ensure data is persisted to disk
-            await self.parse_cache.index_done_callback()
             self.logger.info(f"Stored parsing result in cache: {cache_key}")
         except Exception as e:
             self.logger.warning(f"Error storing to parse cache: {e}")
@@ -312,8 +396,11 @@ class ProcessorMixin:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Generate cache key based on file and configuration
-        cache_key = self._generate_cache_key(file_path, parse_method, **kwargs)
+        # Generate cache key based on file content and configuration
+        file_digest = await asyncio.to_thread(self._file_digest, file_path)
+        cache_key = self._generate_cache_key(
+            file_path, parse_method, file_digest, **kwargs
+        )
 
         # Check cache first
         cached_result = await self._get_cached_result(
@@ -332,24 +419,55 @@ class ProcessorMixin:
         ext = file_path.suffix.lower()
 
         try:
-            doc_parser = (
-                DoclingParser() if self.config.parser == "docling" else MineruParser()
-            )
+            if self._uses_native_text_parser(file_path):
+                doc_parser = TextParser()
+            elif self.config.parser == "docling":
+                doc_parser = DoclingParser()
+            else:
+                doc_parser = MineruParser()
 
             # Log parser and method information
             self.logger.info(
-                f"Using {self.config.parser} parser with method: {parse_method}"
+                f"Using {self._parser_name_for(file_path)} parser with method: {parse_method}"
             )
 
+            if isinstance(doc_parser, MineruParser):
+                parser_kwargs = dict(kwargs)
+                if self.config.mineru_timeout > 0:
+                    parser_kwargs.setdefault("timeout", self.config.mineru_timeout)
+            elif isinstance(doc_parser, TextParser):
+                # Text files skip the PDF round-trip and fall through to parse_document
+                parser_kwargs = dict(kwargs, page_chars=self.config.text_page_chars)
+            else:
+                parser_kwargs = kwargs
+
             if ext in [".pdf"]:
                 self.logger.info("Detected PDF file, using parser for PDF...")
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_pdf,
-                    pdf_path=file_path,
-                    output_dir=output_dir,
-                    method=parse_method,
-                    **kwargs,
-                )
+                if isinstance(doc_parser, MineruParser) and self.config.pdf_shard_pages > 0:
+                    content_list = await doc_parser.parse_pdf_sharded_async(
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        shard_pages=self.config.pdf_shard_pages,
+                        max_parallel_shards=self.config.pdf_max_parallel_shards,
+                        **parser_kwargs,
+                    )
+                elif isinstance(doc_parser, MineruParser):
+                    # Native async subprocess: no worker thread held while MinerU runs
+                    content_list = await doc_parser.parse_pdf_async(
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        **parser_kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_pdf,
+                        pdf_path=file_path,
+                        output_dir=output_dir,
+                        method=parse_method,
+                        **parser_kwargs,
+                    )
             elif ext in [
                 ".jpg",
                 ".jpeg",
@@ -367,7 +485,7 @@ class ProcessorMixin:
                         doc_parser.parse_image,
                         image_path=file_path,
                         output_dir=output_dir,
-                        **kwargs,
+                        **parser_kwargs,
                     )
                 else:
                     # Fallback to MinerU for image parsing if current parser doesn't support it
@@ -391,12 +509,19 @@ class ProcessorMixin:
                 self.logger.info(
                     "Detected Office or HTML document, using parser for Office/HTML..."
                 )
-                content_list = await asyncio.to_thread(
-                    doc_parser.parse_office_doc,
-                    doc_path=file_path,
-                    output_dir=output_dir,
-                    **kwargs,
-                )
+                if isinstance(doc_parser, MineruParser):
+                    content_list = await doc_parser.parse_office_doc_async(
+                        doc_path=file_path,
+                        output_dir=output_dir,
+                        **parser_kwargs,
+                    )
+                else:
+                    content_list = await asyncio.to_thread(
+                        doc_parser.parse_office_doc,
+                        doc_path=file_path,
+                        output_dir=output_dir,
+                        **parser_kwargs,
+                    )
             else:
                 # For other or unknown formats, use generic parser
                 self.logger.info(
@@ -407,7 +532,7 @@ class ProcessorMixin:
                     file_path=file_path,
                     method=parse_method,
                     output_dir=output_dir,
-                    **kwargs,
+                    **parser_kwargs,
                 )
 
         except MineruExecutionError as e:
@@ -430,7 +555,7 @@ class ProcessorMixin:
 
         # Store result in cache
         await self._store_cached_result(
-            cache_key, content_list, doc_id, file_path, parse_method, **kwargs
+            cache_key, content_list, doc_id, file_path, parse_method, file_digest, **kwargs
         )
 
         # Display content statistics if requested
@@ -477,7 +602,7 @@ class ProcessorMixin:
 
         # Check multimodal processing status - handle LightRAG's early DocStatus.PROCESSED marking
         try:
-            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            existing_doc_status = await self._get_doc_status(doc_id)
             if existing_doc_status:
                 # Check if multimodal content is already processed
                 multimodal_processed = existing_doc_status.get(
@@ -520,9 +645,14 @@ class ProcessorMixin:
             # Ensure LightRAG is initialized
             await self._ensure_lightrag_initialized()
 
-            await self._process_multimodal_content_batch_type_aware(
-                multimodal_items=multimodal_items, file_path=file_path, doc_id=doc_id
-            )
+            if self.config.multimodal_streaming:
+                await self._process_multimodal_content_streaming(
+                    multimodal_items=multimodal_items, file_path=file_path, doc_id=doc_id
+                )
+            else:
+                await self._process_multimodal_content_batch_type_aware(
+                    multimodal_items=multimodal_items, file_path=file_path, doc_id=doc_id
+                )
 
             # Mark multimodal content as processed and update final status
             await self._mark_multimodal_processing_complete(doc_id)
@@ -564,7 +694,7 @@ class ProcessorMixin:
         multimodal_chunk_ids = []
 
         # Get current text chunks count to set proper order indexes for multimodal chunks
-        existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+        existing_doc_status = await self._get_doc_status(doc_id)
         existing_chunks_count = (
             existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
         )
@@ -628,35 +758,35 @@ class ProcessorMixin:
         if multimodal_chunk_ids:
             try:
                 # Get current document status
-                current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+                current_doc_status = await self._get_doc_status(doc_id)
 
                 if current_doc_status:
                     existing_chunks_list = current_doc_status.get("chunks_list", [])
                     existing_chunks_count = current_doc_status.get("chunks_count", 0)
 
-                    # Add multimodal chunks to the standard chunks_list
-                    updated_chunks_list = existing_chunks_list + multimodal_chunk_ids
-                    updated_chunks_count = existing_chunks_count + len(
-                        multimodal_chunk_ids
-                    )
+                    # Add multimodal chunks to the standard chunks_list; chunks
+                    # already listed (e.g. merged before a fallback) are skipped
+                    listed = set(existing_chunks_list)
+                    new_chunk_ids = [
+                        chunk_id
+                        for chunk_id in dict.fromkeys(multimodal_chunk_ids)
+                        if chunk_id not in listed
+                    ]
+                    updated_chunks_list = existing_chunks_list + new_chunk_ids
+                    updated_chunks_count = existing_chunks_count + len(new_chunk_ids)
 
                     # Update document status with integrated chunk list
-                    await self.lightrag.doc_status.upsert(
+                    await self._update_doc_status(
+                        doc_id,
                         {
-                            doc_id: {
-                                **current_doc_status,  # Keep existing fields
-                                "chunks_list": updated_chunks_list,  # Integrated chunks list
-                                "chunks_count": updated_chunks_count,  # Updated total count
-                                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                            }
-                        }
+                            "chunks_list": updated_chunks_list,  # Integrated chunks list
+                            "chunks_count": updated_chunks_count,  # Updated total count
+                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                        },
                     )
 
-                    # Ensure doc_status update is persisted to disk
-                    await self.lightrag.doc_status.index_done_callback()
-
                     self.logger.info(
-                        f"Updated doc_status with {len(multimodal_chunk_ids)} multimodal chunks integrated into chunks_list"
+                        f"Updated doc_status with {len(new_chunk_ids)} multimodal chunks integrated into chunks_list"
                     )
 
             except Exception as e:
@@ -716,17 +846,254 @@ class ProcessorMixin:
             self.logger.debug("No multimodal content to process")
             return
 
-        # Get existing chunks count for proper order indexing
+        # Stage 1: Concurrent generation of descriptions
+        multimodal_data_list = await self.generate_multimodal_descriptions(
+            multimodal_items, file_path
+        )
+
+        if not multimodal_data_list:
+            self.logger.warning("No valid multimodal descriptions generated")
+            return
+
+        # Stages 2-7: Chunks, entities, merge and doc_status update
+        await self.insert_multimodal_descriptions(
+            multimodal_data_list, file_path, doc_id
+        )
+
+    async def _process_multimodal_content_streaming(
+        self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
+    ):
+        """
+        Streaming variant of _process_multimodal_content_batch_type_aware
+
+        Each description goes through a bounded queue to extraction workers
+        (chunk conversion, chunk storage, entity extraction) as soon as it is
+        generated, so the extraction LLM works while the VLM is still
+        describing. Extracted chunks are merged into the graph in
+        micro-batches of config.multimodal_merge_batch_size, in item order,
+        so the graph receives the same chunk results in the same order as
+        the batch path.
+
+        Args:
+            multimodal_items: List of multimodal items with different types
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+        """
+        if not multimodal_items:
+            self.logger.debug("No multimodal content to process")
+            return
+
+        # Multimodal chunks follow the text chunks of the document
         try:
-            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            existing_doc_status = await self._get_doc_status(doc_id)
             existing_chunks_count = (
                 existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
             )
         except Exception:
             existing_chunks_count = 0
 
-        # Use LightRAG's concurrency control
-        semaphore = asyncio.Semaphore(getattr(self.lightrag, "max_parallel_insert", 2))
+        total_items = len(multimodal_items)
+        workers = max(1, getattr(self.lightrag, "llm_model_max_async", 4))
+        merge_batch_size = max(1, self.config.multimodal_merge_batch_size)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+        # index -> (data, chunks, chunk_results), None for items without a description
+        extracted: Dict[int, Optional[Tuple]] = {}
+        extracted_event = asyncio.Event()
+        extracted_chunk_ids = set()
+        merged_ids = set()
+        next_index = 0
+        merged_items = 0  # items before this index are merged (or had no description)
+        full_entities = _UnionUpsertStorage(self.lightrag.full_entities)
+        full_relations = _UnionUpsertStorage(self.lightrag.full_relations)
+
+        async def on_description(index: int, data: Optional[Dict[str, Any]]):
+            await queue.put((index, data))
+
+        async def describe():
+            # Every index is reported, so the workers only need to be told to stop
+            await self.generate_multimodal_descriptions(
+                multimodal_items, file_path, on_result=on_description
+            )
+            for _ in range(workers):
+                await queue.put(None)
+
+        async def extract_worker():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                index, data = entry
+                if data is None:
+                    extracted[index] = None
+                    extracted_event.set()
+                    continue
+
+                data["chunk_order_index"] = existing_chunks_count + data["index"]
+                chunks = self._convert_to_lightrag_chunks_type_aware(
+                    [data], file_path, doc_id
+                )
+                await self._store_chunks_to_lightrag_storage_type_aware(chunks)
+
+                # Identical items share a chunk, which is extracted once
+                new_chunks = {
+                    chunk_id: chunk
+                    for chunk_id, chunk in chunks.items()
+                    if chunk_id not in extracted_chunk_ids
+                }
+                extracted_chunk_ids.update(new_chunks)
+                chunk_results = []
+                if new_chunks:
+                    chunk_results = (
+                        await self._batch_extract_entities_lightrag_style_type_aware(
+                            new_chunks
+                        )
+                    )
+                    chunk_results = (
+                        await self._batch_add_belongs_to_relations_type_aware(
+                            chunk_results, [data]
+                        )
+                    )
+
+                extracted[index] = (data, chunks, chunk_results)
+                extracted_event.set()
+
+        async def merge_micro_batch(batch: List[Tuple]):
+            data_list = [data for data, _, _ in batch]
+            chunks = {}
+            for _, item_chunks, _ in batch:
+                chunks.update(item_chunks)
+            chunk_results = [result for _, _, results in batch for result in results]
+
+            await self._store_multimodal_main_entities(
+                data_list, chunks, file_path, doc_id
+            )
+            await self._batch_merge_lightrag_style_type_aware(
+                chunk_results,
+                file_path,
+                doc_id,
+                full_entities_storage=full_entities,
+                full_relations_storage=full_relations,
+                insert_done=False,
+            )
+            await self._update_doc_status_with_chunks_type_aware(
+                doc_id, [chunk_id for chunk_id in chunks if chunk_id not in merged_ids]
+            )
+            merged_ids.update(chunks)
+            self.logger.info(
+                f"Merged {len(batch)} multimodal chunks into the graph "
+                f"({next_index}/{total_items} items)"
+            )
+
+        async def merge():
+            nonlocal next_index, merged_items
+            batch = []
+            while next_index < total_items:
+                # Merge in item order: wait for the next item, not just any item
+                while next_index not in extracted:
+                    extracted_event.clear()
+                    await extracted_event.wait()
+                entry = extracted.pop(next_index)
+                next_index += 1
+                if entry is not None:
+                    batch.append(entry)
+                if batch and (
+                    len(batch) >= merge_batch_size or next_index == total_items
+                ):
+                    await merge_micro_batch(batch)
+                    batch = []
+                    merged_items = next_index
+
+        tasks = [asyncio.create_task(describe()), asyncio.create_task(merge())]
+        tasks += [asyncio.create_task(extract_worker()) for _ in range(workers)]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            # No task failed, so wait() only returned once all of them finished
+        except Exception as e:
+            if not merged_items:
+                raise
+            # Merged micro-batches are already in the graph and doc_status;
+            # only the rest may go through the caller's individual fallback
+            self.logger.error(
+                f"Streaming multimodal processing failed after {merged_items}/"
+                f"{total_items} items: {e}"
+            )
+            self.logger.warning(
+                "Falling back to individual processing for the remaining items"
+            )
+            remaining_items = multimodal_items[merged_items:]
+            if remaining_items:
+                await self._process_multimodal_content_individual(
+                    remaining_items, file_path, doc_id
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not merged_ids:
+            self.logger.warning("No valid multimodal descriptions generated")
+            return
+
+        await self.lightrag._insert_done()
+
+    def _document_scoped_processors(
+        self, content_list: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Shallow copies of the modal processors bound to one document's content
+
+        Lets several documents generate descriptions concurrently without
+        sharing (and overwriting) the processors' context content source.
+        """
+        scoped = {}
+        for name, processor in self.modal_processors.items():
+            scoped_processor = copy.copy(processor)
+            scoped_processor.content_source = content_list
+            scoped_processor.content_format = self.config.content_format
+            scoped[name] = scoped_processor
+        return scoped
+
+    async def generate_multimodal_descriptions(
+        self,
+        multimodal_items: List[Dict[str, Any]],
+        file_path: str,
+        content_list: Optional[List[Dict[str, Any]]] = None,
+        on_result: Optional[
+            Callable[[int, Optional[Dict[str, Any]]], Awaitable[None]]
+        ] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate descriptions for multimodal items (batch processing stage 1)
+
+        Only calls the VLM/LLM; nothing is written to storage, so this can run
+        ahead of (or alongside) insertion of the same or other documents.
+
+        Args:
+            multimodal_items: List of multimodal items with different types
+            file_path: File path for citation
+            content_list: Full content list of the document for context extraction.
+                If None, the content source set via set_content_source_for_context is used.
+            on_result: Awaited with (index, result) as soon as each item is done;
+                result is None if no description could be generated
+
+        Returns:
+            List[Dict[str, Any]]: Description results, input for insert_multimodal_descriptions
+        """
+        modal_processors = (
+            self._document_scoped_processors(content_list)
+            if content_list is not None
+            else self.modal_processors
+        )
+
+        # Own budget for description calls if configured, else LightRAG's
+        semaphore = asyncio.Semaphore(
+            self.config.multimodal_description_max_async
+            or getattr(self.lightrag, "max_parallel_insert", 2)
+        )
 
         # Progress tracking variables
         total_items = len(multimodal_items)
@@ -742,14 +1109,13 @@ class ProcessorMixin:
         ):
             """Process single item using the correct processor for its type"""
             nonlocal completed_count
+            content_type = "unknown"
             async with semaphore:
                 try:
                     content_type = item.get("type", "unknown")
 
                     # Select the correct processor based on content type
-                    processor = get_processor_for_type(
-                        self.modal_processors, content_type
-                    )
+                    processor = get_processor_for_type(modal_processors, content_type)
 
                     if not processor:
                         self.logger.warning(
@@ -793,7 +1159,6 @@ class ProcessorMixin:
                         "entity_info": entity_info,
                         "original_item": item,
                         "item_info": item_info,
-                        "chunk_order_index": existing_chunks_count + index,
                         "processor": processor,  # Keep reference to the processor used
                         "file_path": file_path,  # Add file_path to the result
                     }
@@ -816,11 +1181,25 @@ class ProcessorMixin:
                     )
                     return None
 
+        async def process_and_report(item: Dict[str, Any], index: int):
+            try:
+                result = await process_single_item_with_correct_processor(
+                    item, index, file_path
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Task failed: {e}")
+                result = None
+            # Report every item, outside the semaphore so a slow consumer does
+            # not hold VLM slots; consumers may wait for each index
+            if on_result is not None:
+                await on_result(index, result)
+            return result
+
         # Process all items concurrently with correct processors
         tasks = [
-            asyncio.create_task(
-                process_single_item_with_correct_processor(item, i, file_path)
-            )
+            asyncio.create_task(process_and_report(item, i))
             for i, item in enumerate(multimodal_items)
         ]
 
@@ -835,13 +1214,40 @@ class ProcessorMixin:
             if result is not None:
                 multimodal_data_list.append(result)
 
-        if not multimodal_data_list:
-            self.logger.warning("No valid multimodal descriptions generated")
-            return
-
         self.logger.info(
             f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items using correct processors"
         )
+        return multimodal_data_list
+
+    async def insert_multimodal_descriptions(
+        self, multimodal_data_list: List[Dict[str, Any]], file_path: str, doc_id: str
+    ):
+        """
+        Insert generated multimodal descriptions (batch processing stages 2-7)
+
+        Converts descriptions to chunks, stores them, extracts and merges
+        entities/relations and adds the chunks to the document's doc_status.
+
+        Args:
+            multimodal_data_list: Output of generate_multimodal_descriptions
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+        """
+        if not multimodal_data_list:
+            return
+
+        # Get existing chunks count for proper order indexing; read at insert
+        # time so multimodal chunks follow the text chunks of the document
+        try:
+            existing_doc_status = await self._get_doc_status(doc_id)
+            existing_chunks_count = (
+                existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
+            )
+        except Exception:
+            existing_chunks_count = 0
+
+        for data in multimodal_data_list:
+            data["chunk_order_index"] = existing_chunks_count + data["index"]
 
         # Stage 2: Convert to LightRAG chunks format
         lightrag_chunks = self._convert_to_lightrag_chunks_type_aware(
@@ -1264,7 +1670,13 @@ class ProcessorMixin:
         return enhanced_chunk_results
 
     async def _batch_merge_lightrag_style_type_aware(
-        self, enhanced_chunk_results: List[Tuple], file_path: str, doc_id: str = None
+        self,
+        enhanced_chunk_results: List[Tuple],
+        file_path: str,
+        doc_id: str = None,
+        full_entities_storage: Any = None,
+        full_relations_storage: Any = None,
+        insert_done: bool = True,
     ):
         """Use LightRAG's merge_nodes_and_edges for batch merge"""
         from lightrag.kg.shared_storage import (
@@ -1279,14 +1691,19 @@ class ProcessorMixin:
         # Use full path or basename based on config
         file_ref = self._get_file_reference(file_path)
 
+        if full_entities_storage is None:
+            full_entities_storage = self.lightrag.full_entities
+        if full_relations_storage is None:
+            full_relations_storage = self.lightrag.full_relations
+
         await merge_nodes_and_edges(
             chunk_results=enhanced_chunk_results,
             knowledge_graph_inst=self.lightrag.chunk_entity_relation_graph,
             entity_vdb=self.lightrag.entities_vdb,
             relationships_vdb=self.lightrag.relationships_vdb,
             global_config=self.lightrag.__dict__,
-            full_entities_storage=self.lightrag.full_entities,
-            full_relations_storage=self.lightrag.full_relations,
+            full_entities_storage=full_entities_storage,
+            full_relations_storage=full_relations_storage,
             doc_id=doc_id,
             pipeline_status=pipeline_status,
             pipeline_status_lock=pipeline_status_lock,
@@ -1296,7 +1713,40 @@ class ProcessorMixin:
             file_path=file_ref,
         )
 
-        await self.lightrag._insert_done()
+        if insert_done:
+            await self.lightrag._insert_done()
+
+    def _get_doc_status_buffer(self) -> DocStatusBuffer:
+        """Write-behind buffer over LightRAG's doc_status storage"""
+        if self.doc_status_buffer is None:
+            self.doc_status_buffer = DocStatusBuffer(
+                self.lightrag.doc_status,
+                flush_interval=self.config.doc_status_flush_interval,
+            )
+        return self.doc_status_buffer
+
+    async def _get_doc_status(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Document status including this process's not yet written updates"""
+        return await self._get_doc_status_buffer().get(doc_id)
+
+    async def _update_doc_status(
+        self, doc_id: str, fields: Dict[str, Any], create: bool = False
+    ):
+        """
+        Buffer a doc_status update; fields are merged per document and written
+        on the next flush (timer, batch boundary or finalize_storages)
+
+        Args:
+            doc_id: Document ID
+            fields: Fields to set on the record
+            create: Create the record if it does not exist at flush time
+        """
+        await self._get_doc_status_buffer().update(doc_id, fields, create=create)
+
+    async def flush_doc_status(self):
+        """Write all buffered doc_status updates now"""
+        if self.doc_status_buffer is not None:
+            await self.doc_status_buffer.flush()
 
     async def _update_doc_status_with_chunks_type_aware(
         self, doc_id: str, chunk_ids: List[str]
@@ -1304,33 +1754,35 @@ class ProcessorMixin:
         """Update document status with multimodal chunks"""
         try:
             # Get current document status
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            current_doc_status = await self._get_doc_status(doc_id)
 
             if current_doc_status:
                 existing_chunks_list = current_doc_status.get("chunks_list", [])
                 existing_chunks_count = current_doc_status.get("chunks_count", 0)
 
-                # Add multimodal chunks to the standard chunks_list
-                updated_chunks_list = existing_chunks_list + chunk_ids
-                updated_chunks_count = existing_chunks_count + len(chunk_ids)
+                # Add multimodal chunks to the standard chunks_list; chunks
+                # already listed (e.g. merged before a fallback) are skipped
+                listed = set(existing_chunks_list)
+                new_chunk_ids = [
+                    chunk_id
+                    for chunk_id in dict.fromkeys(chunk_ids)
+                    if chunk_id not in listed
+                ]
+                updated_chunks_list = existing_chunks_list + new_chunk_ids
+                updated_chunks_count = existing_chunks_count + len(new_chunk_ids)
 
                 # Update document status with integrated chunk list
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_id,
                     {
-                        doc_id: {
-                            **current_doc_status,  # Keep existing fields
-                            "chunks_list": updated_chunks_list,  # Integrated chunks list
-                            "chunks_count": updated_chunks_count,  # Updated total count
-                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                        }
-                    }
+                        "chunks_list": updated_chunks_list,  # Integrated chunks list
+                        "chunks_count": updated_chunks_count,  # Updated total count
+                        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                    },
                 )
 
-                # Ensure doc_status update is persisted to disk
-                await self.lightrag.doc_status.index_done_callback()
-
                 self.logger.info(
-                    f"Updated doc_status: added {len(chunk_ids)} multimodal chunks to standard chunks_list "
+                    f"Updated doc_status: added {len(new_chunk_ids)} multimodal chunks to standard chunks_list "
                     f"(total chunks: {updated_chunks_count})"
                 )
 
@@ -1342,18 +1794,15 @@ class ProcessorMixin:
     async def _mark_multimodal_processing_complete(self, doc_id: str):
         """Mark multimodal content processing as complete in the document status."""
         try:
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            current_doc_status = await self._get_doc_status(doc_id)
             if current_doc_status:
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_id,
                     {
-                        doc_id: {
-                            **current_doc_status,
-                            "multimodal_processed": True,
-                            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-                        }
-                    }
+                        "multimodal_processed": True,
+                        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                    },
                 )
-                await self.lightrag.doc_status.index_done_callback()
                 self.logger.debug(
                     f"Marked multimodal content processing as complete for document {doc_id}"
                 )
@@ -1373,7 +1822,7 @@ class ProcessorMixin:
             bool: True if both text and multimodal content are processed
         """
         try:
-            doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            doc_status = await self._get_doc_status(doc_id)
             if not doc_status:
                 return False
 
@@ -1399,7 +1848,7 @@ class ProcessorMixin:
             Dict with processing status details
         """
         try:
-            doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            doc_status = await self._get_doc_status(doc_id)
             if not doc_status:
                 return {
                     "exists": False,
@@ -1497,11 +1946,30 @@ class ProcessorMixin:
                 content_list, self.config.content_format
             )
 
+        if file_name is None:
+            # Use full path or basename based on config
+            file_name = self._get_file_reference(file_path)
+
+        # Steps 3-4 overlapped: text insertion and multimodal descriptions
+        if (
+            self.config.concurrent_text_multimodal
+            and text_content.strip()
+            and multimodal_items
+        ):
+            await self._process_text_and_multimodal_concurrently(
+                text_content,
+                multimodal_items,
+                content_list,
+                file_name,
+                doc_id,
+                split_by_character=split_by_character,
+                split_by_character_only=split_by_character_only,
+            )
+            self.logger.info(f"Document {file_path} processing complete!")
+            return
+
         # Step 3: Insert pure text content with all parameters
         if text_content.strip():
-            if file_name is None:
-                # Use full path or basename based on config
-                file_name = self._get_file_reference(file_path)
             await insert_text_content(
                 self.lightrag,
                 input=text_content,
@@ -1510,10 +1978,6 @@ class ProcessorMixin:
                 split_by_character_only=split_by_character_only,
                 ids=doc_id,
             )
-        else:
-            # Determine file reference even if no text content
-            if file_name is None:
-                file_name = self._get_file_reference(file_path)
 
         # Step 4: Process multimodal content (using specialized processors)
         if multimodal_items:
@@ -1528,6 +1992,112 @@ class ProcessorMixin:
 
         self.logger.info(f"Document {file_path} processing complete!")
 
+    async def _process_text_and_multimodal_concurrently(
+        self,
+        text_content: str,
+        multimodal_items: List[Dict[str, Any]],
+        content_list: List[Dict[str, Any]],
+        file_name: str,
+        doc_id: str,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+    ):
+        """
+        Insert the text and generate multimodal descriptions at the same time
+
+        The text branch is limited by LightRAG's LLM concurrency, the
+        description branch by config.multimodal_description_max_async, so the
+        LLM and the VLM are busy at once. The multimodal chunks are inserted
+        and merged in one step after both branches finished: their order
+        indexes follow the text chunks, and they never merge into the graph
+        while LightRAG is merging this document's text.
+
+        Args:
+            text_content: Text of the document
+            multimodal_items: Multimodal items of the document
+            content_list: Full content list, for context extraction
+            file_name: File reference used for citation
+            doc_id: Document ID
+            split_by_character: Optional character to split the text by
+            split_by_character_only: If True, split only by the specified character
+        """
+        from lightrag.kg.shared_storage import (
+            get_namespace_data,
+            get_pipeline_status_lock,
+        )
+
+        pipeline_status = await get_namespace_data("pipeline_status")
+        pipeline_status_lock = get_pipeline_status_lock()
+
+        existing_doc_status = await self._get_doc_status(doc_id)
+        describe = not (
+            existing_doc_status
+            and existing_doc_status.get("multimodal_processed", False)
+        )
+        if not describe:
+            self.logger.info(
+                f"Document {doc_id} multimodal content is already processed"
+            )
+
+        async def describe_multimodal() -> List[Dict[str, Any]]:
+            if not describe:
+                return []
+            return await self.generate_multimodal_descriptions(
+                multimodal_items, file_name, content_list=content_list
+            )
+
+        log_message = (
+            "Inserting text and generating multimodal descriptions concurrently..."
+        )
+        self.logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
+        text_task = asyncio.create_task(
+            insert_text_content(
+                self.lightrag,
+                input=text_content,
+                file_paths=file_name,
+                split_by_character=split_by_character,
+                split_by_character_only=split_by_character_only,
+                ids=doc_id,
+            )
+        )
+        describe_task = asyncio.create_task(describe_multimodal())
+        tasks = [text_task, describe_task]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not describe:
+            return
+
+        # Single finalization once the text is in: merge and doc_status
+        try:
+            await self.insert_multimodal_descriptions(
+                describe_task.result(), file_name, doc_id
+            )
+        except Exception as e:
+            self.logger.error(f"Error in multimodal processing: {e}")
+            self.logger.warning("Falling back to individual multimodal processing")
+            await self._process_multimodal_content_individual(
+                multimodal_items, file_name, doc_id
+            )
+        await self._mark_multimodal_processing_complete(doc_id)
+
+        log_message = "Multimodal content processing complete"
+        self.logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
     async def process_document_complete_lightrag_api(
         self,
         file_path: str,
@@ -1563,21 +2133,19 @@ class ProcessorMixin:
         if parser:
             self.config.parser = parser
 
-        current_doc_status = await self.lightrag.doc_status.get_by_id(doc_pre_id)
-
         try:
             # Ensure LightRAG is initialized
             result = await self._ensure_lightrag_initialized()
             if not result["success"]:
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_pre_id,
                     {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": result["error"],
-                        }
-                    }
+                        "status": DocStatus.FAILED,
+                        "error_msg": result["error"],
+                    },
+                    create=True,
                 )
+                await self.flush_doc_status()
                 return False
 
             # Use config defaults if not provided
@@ -1591,26 +2159,23 @@ class ProcessorMixin:
             self.logger.info(f"Starting complete document processing: {file_path}")
 
             # Initialize doc status
-            current_doc_status = await self.lightrag.doc_status.get_by_id(doc_pre_id)
+            current_doc_status = await self._get_doc_status(doc_pre_id)
             if not current_doc_status:
-                await self.lightrag.doc_status.upsert(
+                await self._update_doc_status(
+                    doc_pre_id,
                     {
-                        doc_pre_id: {
-                            "status": DocStatus.READY,
-                            "content": "",
-                            "error_msg": "",
-                            "content_summary": "",
-                            "multimodal_content": [],
-                            "scheme_name": scheme_name,
-                            "content_length": 0,
-                            "created_at": "",
-                            "updated_at": "",
-                            "file_path": file_name,
-                        }
-                    }
-                )
-                current_doc_status = await self.lightrag.doc_status.get_by_id(
-                    doc_pre_id
+                        "status": DocStatus.READY,
+                        "content": "",
+                        "error_msg": "",
+                        "content_summary": "",
+                        "multimodal_content": [],
+                        "scheme_name": scheme_name,
+                        "content_length": 0,
+                        "created_at": "",
+                        "updated_at": "",
+                        "file_path": file_name,
+                    },
+                    create=True,
                 )
 
             from lightrag.kg.shared_storage import (
@@ -1626,14 +2191,10 @@ class ProcessorMixin:
                 pipeline_status.update({"scan_disabled": True})
                 pipeline_status["history_messages"].append("Now is not allowed to scan")
 
-            await self.lightrag.doc_status.upsert(
-                {
-                    doc_pre_id: {
-                        **current_doc_status,
-                        "status": DocStatus.HANDLING,
-                        "error_msg": "",
-                    }
-                }
+            await self._update_doc_status(
+                doc_pre_id,
+                {"status": DocStatus.HANDLING, "error_msg": ""},
+                create=True,
             )
 
             content_list = []
@@ -1648,29 +2209,23 @@ class ProcessorMixin:
                 error_message = e.error_msg
                 if isinstance(e.error_msg, list):
                     error_message = "\n".join(e.error_msg)
-                await self.lightrag.doc_status.upsert(
-                    {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": error_message,
-                        }
-                    }
+                await self._update_doc_status(
+                    doc_pre_id,
+                    {"status": DocStatus.FAILED, "error_msg": error_message},
+                    create=True,
                 )
+                await self.flush_doc_status()
                 self.logger.info(
                     f"Error processing document {file_path}: MineruExecutionError"
                 )
                 return False
             except Exception as e:
-                await self.lightrag.doc_status.upsert(
-                    {
-                        doc_pre_id: {
-                            **current_doc_status,
-                            "status": DocStatus.FAILED,
-                            "error_msg": str(e),
-                        }
-                    }
+                await self._update_doc_status(
+                    doc_pre_id,
+                    {"status": DocStatus.FAILED, "error_msg": str(e)},
+                    create=True,
                 )
+                await self.flush_doc_status()
                 self.logger.info(f"Error processing document {file_path}: {str(e)}")
                 return False
 
@@ -1692,6 +2247,9 @@ class ProcessorMixin:
 
             # Step 3: Insert pure text content and multimodal content with all parameters
             if text_content.strip():
+                # LightRAG takes over the document here; write the buffered
+                # status first so a later flush cannot overwrite its changes
+                await self.flush_doc_status()
                 await insert_text_content_with_multimodal_content(
                     self.lightrag,
                     input=text_content,
@@ -1703,6 +2261,7 @@ class ProcessorMixin:
                     scheme_name=scheme_name,
                 )
 
+            await self.flush_doc_status()
             self.logger.info(f"Document {file_path} processing completed successfully")
             return True
 
@@ -1711,16 +2270,12 @@ class ProcessorMixin:
             self.logger.debug("Exception details:", exc_info=True)
 
             # Update doc status to Failed
-            await self.lightrag.doc_status.upsert(
-                {
-                    doc_pre_id: {
-                        **current_doc_status,
-                        "status": DocStatus.FAILED,
-                        "error_msg": str(e),
-                    }
-                }
+            await self._update_doc_status(
+                doc_pre_id,
+                {"status": DocStatus.FAILED, "error_msg": str(e)},
+                create=True,
             )
-            await self.lightrag.doc_status.index_done_callback()
+            await self.flush_doc_status()
 
             # Update pipeline status
             if pipeline_status_lock and pipeline_status:
@@ -33,7 +33,10 @@ from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
 from raganything.utils import get_processor_supports
-from raganything.parser import MineruParser, DoclingParser
+from raganything.parser import Parser, MineruParser, DoclingParser
+from raganything.embedding_cache import wrap_embedding_func
+from raganything.parse_cache import FileDigestIndex, ParseCacheStore
+from raganything.doc_status_buffer import DocStatusBuffer
 
 # Import specialized processors
 from raganything.modalprocessors import (
@@ -90,8 +93,14 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     context_extractor: Optional[ContextExtractor] = field(default=None, init=False)
     """Context extractor for providing surrounding content to modal processors."""
 
-    parse_cache: Optional[Any] = field(default=None, init=False)
-    """Parse result cache storage using LightRAG KV storage."""
+    parse_cache: Optional[ParseCacheStore] = field(default=None, init=False)
+    """Parse result cache (SQLite, one compressed row per document)."""
+
+    file_digests: Optional[FileDigestIndex] = field(default=None, init=False)
+    """Path -> content digest index; parse cache keys use file content, not path."""
+
+    doc_status_buffer: Optional[DocStatusBuffer] = field(default=None, init=False)
+    """Write-behind buffer merging doc_status updates per document."""
 
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
@@ -108,11 +117,31 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         # Set up logger (use existing logger, don't configure it)
         self.logger = logger
 
+        # Content digests for parse cache keys, remembered per path
+        self.file_digests = FileDigestIndex(
+            os.path.join(self.working_dir, "parse_cache_digests.json")
+        )
+
         # Set up document parser
         self.doc_parser = (
             DoclingParser() if self.config.parser == "docling" else MineruParser()
         )
 
+        # Start warm MinerU workers if configured
+        if self.config.parser != "docling" and self.config.mineru_workers > 0:
+            MineruParser.configure_worker_pool(
+                self.config.mineru_workers,
+                max_jobs_per_worker=self.config.mineru_worker_max_jobs,
+                max_memory_growth_mb=self.config.mineru_worker_max_memory_mb,
+            )
+
+        # Keep headless LibreOffice instances for Office-to-PDF conversion
+        if self.config.office_converter_instances > 0:
+            Parser.configure_office_converter(
+                self.config.office_converter_instances,
+                timeout=self.config.office_conversion_timeout,
+            )
+
         # Register close method for cleanup
         atexit.register(self.close)
 
@@ -121,6 +150,15 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             os.makedirs(self.working_dir)
             self.logger.info(f"Created working directory: {self.working_dir}")
 
+        # Wrap embedding function with the persistent embedding cache
+        if self.config.enable_embedding_cache and self.embedding_func is not None:
+            self.embedding_func = wrap_embedding_func(
+                self.embedding_func,
+                cache_dir=os.path.join(self.working_dir, "embedding_cache"),
+                model_name=self.config.embedding_cache_model,
+                max_bytes=self.config.embedding_cache_max_mb * 1024 * 1024,
+            )
+
         # Log configuration info
         self.logger.info("RAGAnything initialized with config:")
         self.logger.info(f"  Working directory: {self.config.working_dir}")
@@ -225,6 +263,19 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             else:
                 self.logger.warning(f"Unknown config parameter: {key}")
 
+    async def _initialize_parse_cache(self):
+        """Open the SQLite parse cache next to LightRAG's storages"""
+        storage_dir = os.path.join(
+            self.lightrag.working_dir, getattr(self.lightrag, "workspace", "") or ""
+        )
+        self.parse_cache = ParseCacheStore(
+            os.path.join(storage_dir, "parse_cache.sqlite"),
+            max_bytes=self.config.parse_cache_max_mb * 1024 * 1024,
+            # Entries from the former LightRAG JSON KV namespace are imported once
+            legacy_json_path=os.path.join(storage_dir, "kv_store_parse_cache.json"),
+        )
+        await self.parse_cache.initialize()
+
     async def _ensure_lightrag_initialized(self):
         """Ensure LightRAG instance is initialized, create if necessary"""
         try:
@@ -264,15 +315,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                         self.logger.info(
                             "Initializing parse cache for pre-provided LightRAG instance"
                         )
-                        self.parse_cache = (
-                            self.lightrag.key_string_value_json_storage_cls(
-                                namespace="parse_cache",
-                                workspace=self.lightrag.workspace,
-                                global_config=self.lightrag.__dict__,
-                                embedding_func=self.embedding_func,
-                            )
-                        )
-                        await self.parse_cache.initialize()
+                        await self._initialize_parse_cache()
 
                     # Initialize processors if not already done
                     if not self.modal_processors:
@@ -325,14 +368,8 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 await self.lightrag.initialize_storages()
                 await initialize_pipeline_status()
 
-                # Initialize parse cache storage using LightRAG's KV storage
-                self.parse_cache = self.lightrag.key_string_value_json_storage_cls(
-                    namespace="parse_cache",
-                    workspace=self.lightrag.workspace,
-                    global_config=self.lightrag.__dict__,
-                    embedding_func=self.embedding_func,
-                )
-                await self.parse_cache.initialize()
+                # Initialize parse cache storage
+                await self._initialize_parse_cache()
 
                 # Initialize processors after LightRAG is ready
                 self._initialize_processors()
@@ -377,11 +414,37 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
         try:
             tasks = []
 
+            # Write buffered doc_status updates before LightRAG closes its storages
+            if self.doc_status_buffer is not None:
+                await self.doc_status_buffer.close()
+                self.logger.info(
+                    f"Doc status buffer stats: {self.doc_status_buffer.stats()}"
+                )
+
             # Finalize parse cache if it exists
             if self.parse_cache is not None:
+                self.logger.info(f"Parse cache stats: {self.parse_cache.stats()}")
                 tasks.append(self.parse_cache.finalize())
                 self.logger.debug("Scheduled parse cache finalization")
 
+            # Persist the path -> digest index used for parse cache keys
+            if self.file_digests is not None:
+                self.file_digests.flush()
+
+            # Persist the embedding cache index, folding its log into one snapshot
+            embedding_cache = self.get_embedding_cache()
+            if embedding_cache is not None:
+                embedding_cache.compact()
+                self.logger.info(f"Embedding cache stats: {embedding_cache.stats()}")
+
+            # Stop warm MinerU workers started for this instance
+            if self.config.parser != "docling" and self.config.mineru_workers > 0:
+                MineruParser.shutdown_worker_pool()
+
+            # Stop LibreOffice instances started for this instance
+            if self.config.office_converter_instances > 0:
+                Parser.shutdown_office_converter()
+
             # Finalize LightRAG storages if LightRAG is initialized
             if self.lightrag is not None:
                 tasks.append(self.lightrag.finalize_storages())
@@ -398,6 +461,11 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             self.logger.error(f"Error during storage finalization: {e}")
             raise
 
+    def get_embedding_cache(self):
+        """Return the EmbeddingCache in use, or None if caching is disabled"""
+        func = getattr(self.embedding_func, "func", None)
+        return getattr(func, "cache", None)
+
     def check_parser_installation(self) -> bool:
         """
         Check if the configured parser is properly installed
@@ -443,6 +511,11 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "include_captions": self.config.include_captions,
                 "filter_content_types": self.config.context_filter_content_types,
             },
+            "embedding_cache": {
+                "enable_embedding_cache": self.config.enable_embedding_cache,
+                "embedding_cache_model": self.config.embedding_cache_model,
+                "embedding_cache_max_mb": self.config.embedding_cache_max_mb,
+            },
             "batch_processing": {
                 "max_concurrent_files": self.config.max_concurrent_files,
                 "supported_file_extensions": self.config.supported_file_extensions,
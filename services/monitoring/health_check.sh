@@ -23,6 +23,17 @@ else
 fi
 echo ""
 
+# Check reranker load (queue depth and score cache from /metrics)
+echo "🔁 Reranker Status:"
+reranker_metrics=$(docker exec reranker curl -s http://localhost:8080/metrics 2>/dev/null \
+    | grep -E "^reranker_(queue_depth|score_cache_entries|documents_limited_total) ")
+if [ -n "$reranker_metrics" ]; then
+    echo "$reranker_metrics" | awk '{print "  "$1": "$2}'
+else
+    echo "❌ Reranker metrics unavailable"
+fi
+echo ""
+
 # Check databases
 echo "💾 Database Status:"
 docker exec postgres_rag psql -U raguser -d ragdb -c "SELECT COUNT(*) as chunks FROM lightrag_vdb_chunks;" -t 2>/dev/null | xargs echo "  RAG DB chunks:"
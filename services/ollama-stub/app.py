@@ -0,0 +1,405 @@
+"""
+Offline Ollama stand-in for deterministic benchmarks
+
+Implements the parts of the Ollama API this stack calls (/api/generate,
+/api/chat, /api/embed and the legacy /api/embeddings) without any model,
+plus the OpenAI-compatible /v1/chat/completions and /v1/embeddings that
+Ollama also serves (used by the example scripts via --base-url).
+Responses are a pure function of (model, input), so two runs over the same
+documents produce the same chunks, entities and vectors:
+
+- modal processor prompts (image/table/equation/generic) get well-formed
+  JSON with detailed_description and entity_info
+- LightRAG entity extraction prompts get entity/relation records in the
+  delimiter format found in the prompt
+- keyword extraction prompts get high/low level keyword JSON
+- embeddings are signed feature hashes of the input words, L2-normalised,
+  so overlapping texts still have a meaningful cosine similarity
+
+Model time is simulated with STUB_LATENCY_MS (+ per output token) and
+STUB_NUM_PARALLEL bounds concurrent requests like OLLAMA_NUM_PARALLEL.
+Point LLM_BINDING_HOST / EMBEDDING_BINDING_HOST at this service to measure
+pipeline overhead without a GPU.
+"""
+
+import os
+import re
+import json
+import time
+import math
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ollama-stub")
+
+# Embedding configuration
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
+
+# Simulated model time
+# Generation sleeps STUB_LATENCY_MS plus STUB_TOKEN_LATENCY_MS per output
+# token; embedding sleeps STUB_EMBED_LATENCY_MS plus STUB_EMBED_TEXT_LATENCY_MS
+# per input text. All default to 0 (measure pure pipeline overhead).
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "0"))
+STUB_TOKEN_LATENCY_MS = float(os.getenv("STUB_TOKEN_LATENCY_MS", "0"))
+STUB_EMBED_LATENCY_MS = float(os.getenv("STUB_EMBED_LATENCY_MS", "0"))
+STUB_EMBED_TEXT_LATENCY_MS = float(os.getenv("STUB_EMBED_TEXT_LATENCY_MS", "0"))
+
+# Concurrency limit
+# Requests beyond STUB_NUM_PARALLEL queue, as they would on a real Ollama
+STUB_NUM_PARALLEL = int(os.getenv("STUB_NUM_PARALLEL", "4"))
+
+# Length of generic (free text) responses, in words
+STUB_RESPONSE_WORDS = int(os.getenv("STUB_RESPONSE_WORDS", "60"))
+
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is",
+    "are", "was", "were", "be", "by", "as", "at", "this", "that", "it", "from",
+    "its", "their", "which", "into", "these", "those", "has", "have", "not",
+    "text", "query", "data", "content",
+}
+
+app = FastAPI(title="Ollama Stub", version="1.0.0")
+
+_slots: Optional[asyncio.Semaphore] = None
+stats: Dict[str, float] = {
+    "generate": 0,
+    "chat": 0,
+    "embed": 0,
+    "embedded_texts": 0,
+    "output_tokens": 0,
+    "simulated_seconds": 0.0,
+}
+
+
+def slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(STUB_NUM_PARALLEL)
+    return _slots
+
+
+async def simulate(seconds: float):
+    """Hold a model slot for the simulated duration."""
+    async with slots():
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+    stats["simulated_seconds"] += seconds
+
+
+# ==========================================
+# Deterministic content
+# ==========================================
+
+
+def digest(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def words(text: str) -> List[str]:
+    return re.findall(r"[A-Za-z][A-Za-z0-9_-]{2,}", text)
+
+
+def key_terms(text: str, count: int) -> List[str]:
+    """Most frequent non-stopword terms, ties broken by first occurrence."""
+    counts = Counter(w.lower() for w in words(text) if w.lower() not in STOPWORDS)
+    order = {}
+    for i, w in enumerate(words(text)):
+        order.setdefault(w.lower(), i)
+    ranked = sorted(counts, key=lambda w: (-counts[w], order[w]))
+    return ranked[:count]
+
+
+def input_section(prompt: str) -> str:
+    """The document text of a LightRAG/RAGAnything prompt (after the examples)."""
+    for marker in ("Input Text", "Real Data", "Query:", "Content:", "Text:"):
+        pos = prompt.rfind(marker)
+        if pos != -1:
+            return prompt[pos + len(marker):]
+    return prompt[-4000:]
+
+
+def modal_response(prompt: str, model: str) -> str:
+    name_match = re.search(r'"entity_name":\s*"([^"]*)"', prompt)
+    type_match = re.search(r'"entity_type":\s*"([^"]*)"', prompt)
+    entity_name = name_match.group(1) if name_match else None
+    entity_type = type_match.group(1) if type_match else "content"
+    if not entity_name or "{" in entity_name or "descriptive name" in entity_name:
+        entity_name = f"{entity_type} {digest(model, prompt)[:8]}"
+
+    # The item itself follows the JSON skeleton of the prompt
+    terms = key_terms(prompt[prompt.rfind("}") + 1:], 12)
+    return json.dumps(
+        {
+            "detailed_description": (
+                f"The {entity_type} {entity_name} covers "
+                + ", ".join(terms or ["no recognisable terms"])
+                + "."
+            ),
+            "entity_info": {
+                "entity_name": entity_name,
+                "entity_type": entity_type,
+                "summary": f"{entity_type} about " + ", ".join(terms[:5]),
+            },
+        }
+    )
+
+
+def extraction_response(prompt: str) -> str:
+    """Entity/relation records in whichever LightRAG delimiter format is asked for."""
+    terms = [t.title() for t in key_terms(input_section(prompt), 4)] or ["Document"]
+    if "<|#|>" in prompt:
+        sep = "<|#|>"
+        lines = [
+            f"entity{sep}{t}{sep}concept{sep}{t} is discussed in the text."
+            for t in terms
+        ]
+        lines += [
+            f"relation{sep}{a}{sep}{b}{sep}co-occurrence{sep}{a} appears together with {b}."
+            for a, b in zip(terms, terms[1:])
+        ]
+        return "\n".join(lines + ["<|COMPLETE|>"])
+
+    sep = "<|>"
+    records = [
+        f'("entity"{sep}{t}{sep}concept{sep}{t} is discussed in the text.)'
+        for t in terms
+    ]
+    records += [
+        f'("relationship"{sep}{a}{sep}{b}{sep}{a} appears together with {b}.{sep}co-occurrence{sep}5)'
+        for a, b in zip(terms, terms[1:])
+    ]
+    return "##".join(records) + "##<|COMPLETE|>"
+
+
+def keywords_response(prompt: str) -> str:
+    terms = key_terms(input_section(prompt), 6)
+    return json.dumps(
+        {"high_level_keywords": terms[:2], "low_level_keywords": terms[2:]}
+    )
+
+
+def text_response(prompt: str, model: str) -> str:
+    terms = key_terms(input_section(prompt), STUB_RESPONSE_WORDS)
+    return f"[{model}:{digest(model, prompt)[:8]}] " + " ".join(terms)
+
+
+def respond(prompt: str, model: str, fmt=None) -> str:
+    """Pick a response shape from the prompt, the way the real callers parse it."""
+    if '"detailed_description"' in prompt and '"entity_info"' in prompt:
+        return modal_response(prompt, model)
+    if "high_level_keywords" in prompt:
+        return keywords_response(prompt)
+    if "<|COMPLETE|>" in prompt or "completion_delimiter" in prompt:
+        return extraction_response(prompt)
+    text = text_response(prompt, model)
+    if fmt:
+        return json.dumps({"response": text})
+    return text
+
+
+def embed_text(text: str) -> List[float]:
+    """Signed feature hashing of unigrams and bigrams, L2-normalised."""
+    vector = [0.0] * EMBEDDING_DIM
+    tokens = [w.lower() for w in words(text)]
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features or [text]:
+        h = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(h[:4], "little") % EMBEDDING_DIM
+        vector[index] += 1.0 if h[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+# ==========================================
+# Ollama API
+# ==========================================
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def timings(prompt: str, output: str, seconds: float) -> dict:
+    eval_count = len(output.split())
+    return {
+        "total_duration": int(seconds * 1e9),
+        "load_duration": 0,
+        "prompt_eval_count": len(prompt.split()),
+        "prompt_eval_duration": 0,
+        "eval_count": eval_count,
+        "eval_duration": int(seconds * 1e9),
+    }
+
+
+async def complete(prompt: str, model: str, fmt=None):
+    output = respond(prompt, model, fmt)
+    tokens = len(output.split())
+    seconds = (STUB_LATENCY_MS + STUB_TOKEN_LATENCY_MS * tokens) / 1000
+    await simulate(seconds)
+    stats["output_tokens"] += tokens
+    return output, seconds
+
+
+def ndjson(chunk: dict, final: dict):
+    async def body():
+        yield json.dumps(chunk) + "\n"
+        yield json.dumps(final) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@app.get("/", response_class=PlainTextResponse)
+async def root():
+    return "Ollama is running"
+
+
+@app.get("/api/version")
+async def version():
+    return {"version": "0.0.0-stub"}
+
+
+@app.get("/api/tags")
+async def tags():
+    return {"models": []}
+
+
+@app.get("/health")
+async def health():
+    """Health check endpoint."""
+    return {
+        "status": "healthy",
+        "embedding_dim": EMBEDDING_DIM,
+        "num_parallel": STUB_NUM_PARALLEL,
+        "latency_ms": STUB_LATENCY_MS,
+        "token_latency_ms": STUB_TOKEN_LATENCY_MS,
+        "stats": stats,
+    }
+
+
+@app.post("/api/generate")
+async def generate(body: dict):
+    model = body.get("model", "")
+    prompt = "\n".join(p for p in (body.get("system"), body.get("prompt")) if p)
+    output, seconds = await complete(prompt, model, body.get("format"))
+    stats["generate"] += 1
+
+    base = {"model": model, "created_at": now()}
+    final = {**base, "response": "", "done": True, "done_reason": "stop",
+             **timings(prompt, output, seconds)}
+    if body.get("stream", True):
+        return ndjson({**base, "response": output, "done": False}, final)
+    return {**final, "response": output, "context": []}
+
+
+@app.post("/api/chat")
+async def chat(body: dict):
+    model = body.get("model", "")
+    prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []))
+    output, seconds = await complete(prompt, model, body.get("format"))
+    stats["chat"] += 1
+
+    base = {"model": model, "created_at": now()}
+    final = {**base, "message": {"role": "assistant", "content": ""}, "done": True,
+             "done_reason": "stop", **timings(prompt, output, seconds)}
+    if body.get("stream", True):
+        return ndjson(
+            {**base, "message": {"role": "assistant", "content": output}, "done": False},
+            final,
+        )
+    return {**final, "message": {"role": "assistant", "content": output}}
+
+
+@app.post("/api/embed")
+async def embed(body: dict):
+    texts = body.get("input", [])
+    if isinstance(texts, str):
+        texts = [texts]
+    seconds = (STUB_EMBED_LATENCY_MS + STUB_EMBED_TEXT_LATENCY_MS * len(texts)) / 1000
+    t0 = time.perf_counter()
+    await simulate(seconds)
+    embeddings = [embed_text(t) for t in texts]
+    stats["embed"] += 1
+    stats["embedded_texts"] += len(texts)
+    return {
+        "model": body.get("model", ""),
+        "embeddings": embeddings,
+        "total_duration": int((time.perf_counter() - t0) * 1e9),
+        "load_duration": 0,
+        "prompt_eval_count": sum(len(t.split()) for t in texts),
+    }
+
+
+@app.post("/api/embeddings")
+async def embeddings(body: dict):
+    """Legacy single-prompt embedding endpoint."""
+    result = await embed({"model": body.get("model", ""), "input": [body.get("prompt", "")]})
+    return {"embedding": result["embeddings"][0]}
+
+
+# ==========================================
+# OpenAI-compatible API (as served by Ollama under /v1)
+# ==========================================
+
+
+def message_text(content) -> str:
+    if isinstance(content, list):
+        return "\n".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return content or ""
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat(body: dict):
+    model = body.get("model", "")
+    prompt = "\n".join(message_text(m.get("content")) for m in body.get("messages", []))
+    output, _ = await complete(prompt, model, body.get("response_format"))
+    stats["chat"] += 1
+
+    created = int(time.time())
+    completion_id = f"chatcmpl-{digest(model, prompt)[:12]}"
+    if body.get("stream"):
+        async def events():
+            for delta, finish in (({"role": "assistant", "content": output}, None), ({}, "stop")):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                         "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    prompt_tokens, completion_tokens = len(prompt.split()), len(output.split())
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": output}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+@app.post("/v1/embeddings")
+async def openai_embeddings(body: dict):
+    result = await embed({"model": body.get("model", ""), "input": body.get("input", [])})
+    return {
+        "object": "list",
+        "model": result["model"],
+        "data": [{"object": "embedding", "index": i, "embedding": e}
+                 for i, e in enumerate(result["embeddings"])],
+        "usage": {"prompt_tokens": result["prompt_eval_count"], "total_tokens": result["prompt_eval_count"]},
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    port = int(os.getenv("PORT", "11434"))
+    uvicorn.run(app, host="0.0.0.0", port=port)
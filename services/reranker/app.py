@@ -4,16 +4,32 @@ Model: BAAI/bge-reranker-v2-m3
 
 This service provides a Cohere-compatible /rerank endpoint
 that can be used with LightRAG's RERANK_BINDING=cohere setting.
+
+Benchmark the scoring backends against the fp32 PyTorch baseline with:
+    python app.py benchmark [fixtures.json]
+(POST /benchmark does the same when ENABLE_BENCHMARK_ENDPOINT=true.)
 """
 
 import os
+import re
+import json
 import time
+import math
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import sys
 
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, Header, HTTPException, Response
 from pydantic import BaseModel
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 from sentence_transformers import CrossEncoder
 
 # Configure logging
@@ -24,29 +40,1063 @@ logger = logging.getLogger("reranker")
 MODEL_NAME = os.getenv("RERANK_MODEL", "BAAI/bge-reranker-v2-m3")
 MAX_LENGTH = int(os.getenv("MAX_LENGTH", "512"))
 
+# Micro-batching configuration
+# Concurrent requests are coalesced into one forward pass within this window
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+BATCH_MAX_PAIRS = int(os.getenv("BATCH_MAX_PAIRS", "64"))
+
+# Scoring backend
+# "torch" runs the sentence-transformers CrossEncoder in fp32. "onnx" exports
+# RERANK_MODEL to ONNX once (cached under ONNX_CACHE_DIR) and runs it with
+# ONNX Runtime, dynamically quantized to int8 unless ONNX_QUANTIZE=false.
+RERANK_BACKEND = os.getenv("RERANK_BACKEND", "torch").lower()
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", "./onnx_models")
+ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "true").lower() in ("1", "true", "yes")
+BENCHMARK_FIXTURES = os.getenv(
+    "BENCHMARK_FIXTURES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_fixtures.json"),
+)
+# POST /benchmark loads every requested backend from scratch; it is an
+# unauthenticated admin action, so it is off unless explicitly enabled
+ENABLE_BENCHMARK_ENDPOINT = os.getenv("ENABLE_BENCHMARK_ENDPOINT", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Document limit configuration
+# At most MAX_DOCS documents per request reach the cross-encoder. In "cascade"
+# mode a cheap BM25 pass over every candidate picks which ones; in "truncate"
+# mode the first MAX_DOCS are taken (assumes pre-sorted by vector similarity).
+# CASCADE_KEEP_HEAD top vector-ranked documents always survive the BM25 pass,
+# so semantic matches with no term overlap are not pruned.
+RERANK_MODE = os.getenv("RERANK_MODE", "cascade").lower()
+MAX_DOCS = int(os.getenv("MAX_DOCS", "30"))
+CASCADE_KEEP_HEAD = int(os.getenv("CASCADE_KEEP_HEAD", "10"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Padding-aware batching
+# Pairs are sorted by token length and packed so that
+# (pairs in batch) x (longest pair in batch) stays within this budget.
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", "8192"))
+
+# Long-document passage windowing
+# With PASSAGE_WINDOWING on, documents that don't fit next to the query in
+# MAX_LENGTH tokens are split into overlapping token windows. All windows are
+# scored in the same batched pass and aggregated per document ("max" or
+# "top2mean"). MAX_WINDOWS_PER_REQUEST caps the extra work per request.
+PASSAGE_WINDOWING = os.getenv("PASSAGE_WINDOWING", "false").lower() in ("1", "true", "yes")
+WINDOW_OVERLAP_TOKENS = int(os.getenv("WINDOW_OVERLAP_TOKENS", "64"))
+PASSAGE_AGGREGATION = os.getenv("PASSAGE_AGGREGATION", "max").lower()
+MAX_WINDOWS_PER_REQUEST = int(os.getenv("MAX_WINDOWS_PER_REQUEST", "96"))
+
+# Inference executor configuration
+# Scoring runs off the event loop so /health stays responsive under load.
+# "thread" shares one model across a thread pool, "process" loads one model
+# per worker process. Each worker gets an equal share of the CPU for torch
+# intra-op parallelism unless TORCH_THREADS is set explicitly.
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "thread").lower()
+INFERENCE_WORKERS = max(1, int(os.getenv("INFERENCE_WORKERS", "1")))
+TORCH_THREADS = int(
+    os.getenv("TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // INFERENCE_WORKERS)))
+)
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "256"))
+
+# Admission control
+# Callers may send a deadline (X-Request-Deadline-Ms header or deadline_ms body
+# field: milliseconds they are still willing to wait). Requests that cannot be
+# scored in time, or that find INFERENCE_QUEUE_SIZE requests already queued,
+# are either rejected with Retry-After (OVERLOAD_POLICY=reject) or answered
+# with whatever the score cache holds (OVERLOAD_POLICY=degrade): cached
+# documents by score, then the rest in vector order with relevance_score null.
+# Degraded responses carry an X-Rerank-Degraded header and meta.degraded.
+DEFAULT_DEADLINE_MS = float(os.getenv("DEFAULT_DEADLINE_MS", "0"))
+OVERLOAD_POLICY = os.getenv("OVERLOAD_POLICY", "reject").lower()
+
+# Score cache configuration
+# Keyed by (normalized query, document, model); 0 entries disables the cache.
+# With SCORE_CACHE_PATH set, the cache is snapshotted to disk periodically and
+# on shutdown, and reloaded on startup.
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "50000"))
+SCORE_CACHE_PATH = os.getenv("SCORE_CACHE_PATH", "")
+SCORE_CACHE_SNAPSHOT_INTERVAL_S = float(
+    os.getenv("SCORE_CACHE_SNAPSHOT_INTERVAL_S", "300")
+)
+
+# Prometheus metrics (served on /metrics; process_* metrics such as
+# process_resident_memory_bytes come from the default process collector)
+REQUEST_LATENCY = Histogram(
+    "reranker_request_latency_seconds",
+    "End-to-end /rerank latency",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS = Counter("reranker_requests_total", "Rerank requests", ["outcome"])
+FORWARD_TIME = Histogram(
+    "reranker_forward_seconds",
+    "Model forward time per coalesced batch",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+BATCH_PAIRS = Histogram(
+    "reranker_batch_pairs",
+    "Pairs per coalesced batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+BATCH_TOKENS = Histogram(
+    "reranker_batch_tokens",
+    "Tokens per coalesced batch (before padding)",
+    buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536),
+)
+BATCH_PADDED_TOKENS = Counter(
+    "reranker_padded_tokens_total", "Tokens fed to the model including padding"
+)
+QUEUE_DEPTH = Gauge("reranker_queue_depth", "Requests waiting for an inference slot")
+CACHE_LOOKUPS = Counter("reranker_score_cache_lookups_total", "Score cache lookups", ["result"])
+CACHE_ENTRIES = Gauge("reranker_score_cache_entries", "Entries in the score cache")
+DOCUMENTS_RECEIVED = Counter("reranker_documents_received_total", "Documents received")
+DOCUMENTS_PROCESSED = Counter(
+    "reranker_documents_processed_total", "Documents scored by the cross-encoder"
+)
+DOCUMENTS_LIMITED = Counter(
+    "reranker_documents_limited_total", "Requests with more than MAX_DOCS documents"
+)
+
 # Global model instance
-model: CrossEncoder = None
+model: "ScoringBackend" = None
+tokenizer = None  # Used on the request path (windowing), not for inference
+executor: "InferenceExecutor" = None
+batcher: "MicroBatcher" = None
+score_cache: "ScoreCache" = None
+
+
+class ScoringBackend:
+    """Interface for cross-encoder scoring backends."""
+
+    name = "base"
+    tokenizer = None
+
+    def predict(self, pairs: List[List[str]]) -> np.ndarray:
+        """Score one batch of (query, document) pairs."""
+        raise NotImplementedError
+
+
+class TorchBackend(ScoringBackend):
+    """fp32 PyTorch inference through sentence-transformers."""
+
+    name = "torch"
+
+    def __init__(self):
+        import torch
+
+        torch.set_num_threads(TORCH_THREADS)
+        self.model = CrossEncoder(MODEL_NAME, max_length=MAX_LENGTH)
+        self.tokenizer = self.model.tokenizer
+
+    def predict(self, pairs: List[List[str]]) -> np.ndarray:
+        return self.model.predict(
+            pairs, show_progress_bar=False, batch_size=len(pairs)
+        )
+
+
+class OnnxBackend(ScoringBackend):
+    """
+    ONNX Runtime inference, optionally with dynamic int8 weight quantization.
+
+    The model is exported from the same RERANK_MODEL checkpoint on first use
+    and cached on disk. Scores go through the same sigmoid CrossEncoder
+    applies to single-label models, so they stay comparable to the torch
+    backend.
+    """
+
+    def __init__(self, quantize: bool = True):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.quantize = quantize
+        self.name = "onnx-int8" if quantize else "onnx-fp32"
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = TORCH_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            self.export(quantize), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    @staticmethod
+    def export(quantize: bool) -> str:
+        """Export (and quantize) the model if not cached yet; return its path."""
+        model_dir = os.path.join(ONNX_CACHE_DIR, MODEL_NAME.replace("/", "__"))
+        fp32_path = os.path.join(model_dir, "model.onnx")
+        int8_path = os.path.join(model_dir, "model.int8.onnx")
+
+        if not os.path.exists(fp32_path):
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+            logger.info(f"Exporting {MODEL_NAME} to ONNX at {fp32_path}")
+            os.makedirs(model_dir, exist_ok=True)
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            hf_model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+            hf_model.eval()
+            sample = dict(tokenizer(["query"], ["document"], return_tensors="pt"))
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in sample}
+            dynamic_axes["logits"] = {0: "batch"}
+            with torch.no_grad():
+                torch.onnx.export(
+                    hf_model,
+                    (sample,),
+                    f"{fp32_path}.tmp",
+                    input_names=list(sample),
+                    output_names=["logits"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                )
+            os.replace(f"{fp32_path}.tmp", fp32_path)
+
+        if not quantize:
+            return fp32_path
+
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"Quantizing ONNX model to int8 at {int8_path}")
+            quantize_dynamic(fp32_path, f"{int8_path}.tmp", weight_type=QuantType.QInt8)
+            os.replace(f"{int8_path}.tmp", int8_path)
+        return int8_path
+
+    def predict(self, pairs: List[List[str]]) -> np.ndarray:
+        encoded = self.tokenizer(
+            [query for query, _ in pairs],
+            [doc for _, doc in pairs],
+            padding=True,
+            truncation=True,
+            max_length=MAX_LENGTH,
+            return_tensors="np",
+        )
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in self.input_names
+            if name in encoded
+        }
+        logits = self.session.run(None, feeds)[0]
+        if logits.ndim == 2 and logits.shape[1] == 1:
+            return 1.0 / (1.0 + np.exp(-logits[:, 0]))
+        return logits
+
+
+def resolve_backend_name(name: str) -> str:
+    """Map "onnx" to its concrete variant according to ONNX_QUANTIZE."""
+    if name == "onnx":
+        return "onnx-int8" if ONNX_QUANTIZE else "onnx-fp32"
+    if name not in ("torch", "onnx-int8", "onnx-fp32"):
+        raise ValueError(f"Unknown RERANK_BACKEND: {name}")
+    return name
+
+
+def create_backend(name: str) -> ScoringBackend:
+    name = resolve_backend_name(name)
+    if name == "torch":
+        return TorchBackend()
+    return OnnxBackend(quantize=name == "onnx-int8")
+
+
+def backend_id(name: str) -> str:
+    """Stable identifier of what produces the scores (used in cache keys)."""
+    return f"{MODEL_NAME}@{resolve_backend_name(name)}"
+
+
+def _load_model() -> ScoringBackend:
+    return create_backend(RERANK_BACKEND)
+
+
+def _init_worker():
+    """Process pool initializer: load a private model copy in each worker."""
+    global model
+    model = _load_model()
+
+
+def _pair_lengths(backend: ScoringBackend, pairs: List[List[str]]) -> List[int]:
+    """Token length of each pair after truncation, as the model will see it."""
+    encoded = backend.tokenizer(
+        [query for query, _ in pairs],
+        [doc for _, doc in pairs],
+        truncation=True,
+        max_length=MAX_LENGTH,
+    )
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def plan_length_buckets(lengths: List[int], token_budget: int) -> List[List[int]]:
+    """
+    Group pair indices into batches of similar length.
+
+    Indices are sorted by length and packed greedily while the padded batch
+    (batch size x longest pair) fits the token budget, so short pairs are
+    never padded up to a long neighbour.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets: List[List[int]] = []
+    current: List[int] = []
+    for i in order:
+        # Lengths ascend, so the pair being added is the batch's longest
+        if current and (len(current) + 1) * lengths[i] > token_budget:
+            buckets.append(current)
+            current = []
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def score_pairs(
+    backend: ScoringBackend, pairs: List[List[str]], stats: Optional[dict] = None
+) -> List[float]:
+    """
+    Score pairs with length-bucketed batches, in the original pair order.
+
+    If stats is given, it is filled with token counts and forward time.
+    """
+    scores = [0.0] * len(pairs)
+    lengths = _pair_lengths(backend, pairs)
+    forward_s = 0.0
+    padded_tokens = 0
+    for bucket in plan_length_buckets(lengths, BATCH_TOKEN_BUDGET):
+        forward_start = time.perf_counter()
+        bucket_scores = backend.predict([pairs[i] for i in bucket])
+        forward_s += time.perf_counter() - forward_start
+        padded_tokens += len(bucket) * max(lengths[i] for i in bucket)
+        # Scatter back to the original pair order
+        for i, score in zip(bucket, bucket_scores):
+            scores[i] = float(score)
+
+    if stats is not None:
+        stats["tokens"] = sum(lengths)
+        stats["padded_tokens"] = padded_tokens
+        stats["forward_s"] = forward_s
+    return scores
+
+
+def _predict(pairs: List[List[str]]) -> Tuple[List[float], dict]:
+    """Score pairs with this process's model. Runs inside the executor."""
+    stats = {}
+    scores = score_pairs(model, pairs, stats)
+    return scores, stats
+
+
+def load_fixtures(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def spearman(a: List[float], b: List[float]) -> float:
+    """Spearman rank correlation (no tie correction)."""
+    if len(a) < 2:
+        return 1.0
+    rank_a = np.argsort(np.argsort(a)).astype(np.float64)
+    rank_b = np.argsort(np.argsort(b)).astype(np.float64)
+    if rank_a.std() == 0 or rank_b.std() == 0:
+        return 1.0
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def run_benchmark(
+    backend_names: List[str], fixtures: List[dict], repeats: int = 3
+) -> dict:
+    """
+    Measure throughput of each backend and its ranking agreement with the
+    fp32 torch baseline over the fixture queries.
+    """
+    pairs_per_query = [
+        [[item["query"], doc] for doc in item["documents"]] for item in fixtures
+    ]
+    total_pairs = sum(len(pairs) for pairs in pairs_per_query)
+
+    results = {}
+    baseline_scores = None
+    for name in ["torch"] + [n for n in backend_names if n != "torch"]:
+        load_start = time.time()
+        backend = create_backend(name)
+        load_s = time.time() - load_start
+
+        score_pairs(backend, pairs_per_query[0])  # warmup
+        start = time.time()
+        for _ in range(repeats):
+            scores = [score_pairs(backend, pairs) for pairs in pairs_per_query]
+        elapsed = time.time() - start
+
+        report = {
+            "load_s": round(load_s, 2),
+            "pairs_per_sec": round(total_pairs * repeats / elapsed, 1),
+        }
+        if baseline_scores is None:
+            baseline_scores = scores
+        else:
+            correlations = [spearman(b, s) for b, s in zip(baseline_scores, scores)]
+            top1 = [
+                int(np.argmax(b)) == int(np.argmax(s))
+                for b, s in zip(baseline_scores, scores)
+            ]
+            report["spearman_mean"] = round(float(np.mean(correlations)), 4)
+            report["spearman_min"] = round(float(np.min(correlations)), 4)
+            report["top1_agreement"] = round(float(np.mean(top1)), 4)
+            report["speedup"] = round(
+                report["pairs_per_sec"] / results["torch"]["pairs_per_sec"], 2
+            )
+        results[name] = report
+
+    return {
+        "model": MODEL_NAME,
+        "queries": len(fixtures),
+        "pairs": total_pairs,
+        "repeats": repeats,
+        "torch_threads": TORCH_THREADS,
+        "backends": results,
+    }
+
+
+class InferenceExecutor:
+    """
+    Runs CrossEncoder scoring on a dedicated worker pool.
+
+    In thread mode the workers share the model loaded in this process (torch
+    releases the GIL during the forward pass). In process mode every worker
+    loads its own copy at startup, which avoids GIL contention at the cost of
+    INFERENCE_WORKERS times the model memory.
+    """
+
+    def __init__(self, mode: str, workers: int):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown INFERENCE_MODE: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self._pool: Optional[Executor] = None
+
+    def start(self):
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="rerank-inference"
+            )
+
+    async def warmup(self):
+        """Make the workers load their model before we report healthy."""
+        await asyncio.gather(
+            *[self.run([["warmup", "warmup"]]) for _ in range(self.workers)]
+        )
+
+    async def run(self, pairs: List[List[str]]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        scores, stats = await loop.run_in_executor(self._pool, _predict, pairs)
+        # Recorded here because process-mode workers have their own registry
+        BATCH_PAIRS.observe(len(pairs))
+        BATCH_TOKENS.observe(stats["tokens"])
+        BATCH_PADDED_TOKENS.inc(stats["padded_tokens"])
+        FORWARD_TIME.observe(stats["forward_s"])
+        return scores
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class OverloadedError(Exception):
+    """Raised when a request is refused or abandoned by admission control."""
+
+    def __init__(self, status_code: int, reason: str, retry_after_s: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into shared CrossEncoder passes.
+
+    Callers submit their (query, document) pairs and await the scores. A single
+    collector task drains the queue, waits up to max_wait_ms for more requests
+    to arrive (or until max_pairs is reached), scores the merged pairs in one
+    predict call and splits the scores back to each caller.
+
+    At most `concurrency` batches are in flight at once. While all of them are
+    busy, new requests accumulate in the bounded queue (and get merged into
+    the next batch); once it is full, submit() raises OverloadedError instead
+    of queueing more work. Requests with a deadline are also refused up front
+    when the estimated queueing time already exceeds it, and abandoned if the
+    deadline passes while they wait.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable,
+        max_wait_ms: float,
+        max_pairs: int,
+        max_queue: int = 0,
+        concurrency: int = 1,
+    ):
+        self.score_fn = score_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pairs = max(1, max_pairs)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(0, max_queue))
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._carry: Optional[Tuple[list, asyncio.Future]] = None
+        self._task: Optional[asyncio.Task] = None
+        # Dispatch task -> its batch, so stop() can fail what a task leaves open
+        self._inflight: Dict[asyncio.Task, list] = {}
+        self._concurrency = max(1, concurrency)
+        self._queued_pairs = 0
+        self._seconds_per_pair: Optional[float] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() + (1 if self._carry else 0)
+
+    def estimate_wait(self, n_pairs: int) -> float:
+        """Rough seconds until n_pairs submitted now would be scored."""
+        if self._seconds_per_pair is None:
+            return self.max_wait
+        backlog = (self._queued_pairs + n_pairs) * self._seconds_per_pair
+        return self.max_wait + backlog / self._concurrency
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        inflight = dict(self._inflight)
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+
+        # Fail anything still waiting so callers don't hang on shutdown,
+        # including batches whose scoring was cancelled above
+        pending = [self._carry] if self._carry else []
+        for batch in inflight.values():
+            pending.extend(batch)
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Reranker is shutting down"))
+
+    async def submit(
+        self, pairs: List[List[str]], deadline: Optional[float] = None
+    ) -> List[float]:
+        """
+        Queue pairs for scoring and wait for their scores.
+
+        deadline is an absolute event-loop time. Raises OverloadedError if
+        the queue is full or the deadline can't (or didn't) get met.
+        """
+        loop = asyncio.get_running_loop()
+        eta = self.estimate_wait(len(pairs))
+        if deadline is not None and loop.time() + eta > deadline:
+            raise OverloadedError(503, "Deadline cannot be met", eta)
+
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait((pairs, future))
+        except asyncio.QueueFull:
+            raise OverloadedError(429, "Inference queue is full", eta)
+        self._queued_pairs += len(pairs)
+
+        if deadline is None:
+            return await future
+        try:
+            # On timeout the future is cancelled and the collector skips it
+            return await asyncio.wait_for(future, max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            raise OverloadedError(503, "Deadline exceeded while queued", eta)
+
+    async def _next_item(self, timeout: Optional[float]):
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        if timeout is None:
+            return await self._queue.get()
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    async def _collect(self) -> List[Tuple[list, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._next_item(None)]
+        total = len(batch[0][0])
+        self._queued_pairs -= total
+        deadline = loop.time() + self.max_wait
+
+        while total < self.max_pairs:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await self._next_item(remaining)
+            except asyncio.TimeoutError:
+                break
+            if total + len(item[0]) > self.max_pairs:
+                # Doesn't fit: hold it for the next batch
+                self._carry = item
+                break
+            batch.append(item)
+            total += len(item[0])
+            self._queued_pairs -= len(item[0])
+
+        return batch
+
+    async def _run(self):
+        while True:
+            # Wait for a free inference slot before collecting, so requests
+            # arriving while the workers are busy get merged into one batch
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight[task] = batch
+            task.add_done_callback(lambda done: self._inflight.pop(done, None))
+
+    async def _dispatch(self, batch: List[Tuple[list, asyncio.Future]]):
+        try:
+            await self._score_batch(batch)
+        finally:
+            self._slots.release()
+
+    async def _score_batch(self, batch: List[Tuple[list, asyncio.Future]]):
+        # Skip callers that disconnected while waiting in the queue
+        live = [(pairs, future) for pairs, future in batch if not future.done()]
+        if not live:
+            return
+
+        merged = [pair for pairs, _ in live for pair in pairs]
+        start = time.perf_counter()
+        try:
+            scores = await self.score_fn(merged)
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Exponentially weighted cost per pair, used for admission estimates
+        per_pair = (time.perf_counter() - start) / len(merged)
+        if self._seconds_per_pair is None:
+            self._seconds_per_pair = per_pair
+        else:
+            self._seconds_per_pair = 0.8 * self._seconds_per_pair + 0.2 * per_pair
+
+        logger.debug(f"Scored {len(merged)} pairs from {len(live)} requests")
+        offset = 0
+        for pairs, future in live:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(pairs)])
+            offset += len(pairs)
+
+
+class ScoreCache:
+    """
+    Bounded LRU cache of cross-encoder scores.
+
+    Entries are keyed by a sha256 over the model name, the normalized query and
+    the exact document text, so a model change never serves stale scores.
+    """
+
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, max_entries: int, model_name: str):
+        self.max_entries = max(0, max_entries)
+        self.model_name = model_name
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def normalize_query(cls, query: str) -> str:
+        return cls._WHITESPACE.sub(" ", query).strip().lower()
+
+    def make_key(self, query: str, document: str) -> str:
+        digest = hashlib.sha256()
+        for part in (self.model_name, self.normalize_query(query), document):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        if not self.enabled:
+            return None
+        score = self._entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key: str, score: float):
+        if not self.enabled:
+            return
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def snapshot(self) -> dict:
+        """Copy the entries (oldest first) so they can be written off-loop."""
+        return {"model": self.model_name, "entries": list(self._entries.items())}
+
+    @staticmethod
+    def write_snapshot(snapshot: dict, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Load a snapshot written by write_snapshot. Returns entries loaded."""
+        if not self.enabled or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable score cache snapshot {path}: {e}")
+            return 0
+        if data.get("model") != self.model_name:
+            logger.info("Score cache snapshot is for a different model, ignoring it")
+            return 0
+        for key, score in data.get("entries", [])[-self.max_entries :]:
+            self._entries[key] = float(score)
+        return len(self._entries)
+
+
+async def _save_score_cache():
+    snapshot = score_cache.snapshot()
+    try:
+        await asyncio.to_thread(ScoreCache.write_snapshot, snapshot, SCORE_CACHE_PATH)
+        logger.debug(f"Saved {len(snapshot['entries'])} cached scores")
+    except OSError as e:
+        logger.warning(f"Failed to save score cache snapshot: {e}")
+
+
+async def _snapshot_score_cache_periodically():
+    while True:
+        await asyncio.sleep(SCORE_CACHE_SNAPSHOT_INTERVAL_S)
+        await _save_score_cache()
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def bm25_scores(query: str, documents: List[str]) -> np.ndarray:
+    """
+    BM25 score of every document against the query, treating the candidate
+    list itself as the corpus. Term frequencies are counted with numpy over
+    the concatenated tokens of all documents.
+    """
+    query_terms = list(dict.fromkeys(_tokenize(query)))
+    if not query_terms or not documents:
+        return np.zeros(len(documents), dtype=np.float32)
+
+    tokenized = [_tokenize(doc) for doc in documents]
+    doc_lengths = np.fromiter(map(len, tokenized), dtype=np.int64, count=len(documents))
+
+    # Per-request vocabulary of the query terms; other tokens map to -1
+    vocab = {term: j for j, term in enumerate(query_terms)}
+    term_ids = np.fromiter(
+        map(vocab.get, itertools.chain.from_iterable(tokenized), itertools.repeat(-1)),
+        dtype=np.int64,
+        count=int(doc_lengths.sum()),
+    )
+    doc_ids = np.repeat(np.arange(len(documents)), doc_lengths)
+    matched = term_ids >= 0
+    tf = (
+        np.bincount(
+            doc_ids[matched] * len(query_terms) + term_ids[matched],
+            minlength=len(documents) * len(query_terms),
+        )
+        .reshape(len(documents), len(query_terms))
+        .astype(np.float32)
+    )
+
+    n_docs = len(documents)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    doc_lengths = doc_lengths.astype(np.float32)
+    avg_length = max(float(doc_lengths.mean()), 1.0)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / avg_length)
+    weighted = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+    return weighted @ idf.astype(np.float32)
+
+
+def cascade_prefilter(
+    query: str, documents: List[str], top_k: int, keep_head: int
+) -> List[int]:
+    """
+    First cascade stage: choose which documents reach the cross-encoder.
+
+    Keeps the first keep_head documents (vector order) plus the best BM25
+    scorers up to top_k in total. BM25 statistics cover all candidates,
+    including the kept head. Returns their indices in original order.
+    """
+    if len(documents) <= top_k:
+        return list(range(len(documents)))
+
+    head = min(keep_head, top_k)
+    scores = bm25_scores(query, documents)[head:]
+    # Stable sort keeps vector order among equal BM25 scores
+    ranked = np.argsort(-scores, kind="stable")[: top_k - head] + head
+    return list(range(head)) + sorted(int(i) for i in ranked)
+
+
+def split_windows(
+    query: str, documents: List[str], max_windows: int
+) -> Tuple[List[List[str]], List[bool]]:
+    """
+    Split each document into overlapping token windows that fit beside the
+    query in MAX_LENGTH tokens. Short documents yield a single window.
+
+    Windows are cut at token offsets in the original text, so no text is
+    re-decoded. When the request needs more than max_windows windows, every
+    document keeps its first window and the rest are handed out round-robin
+    in document order. Also returns, per document, whether all of its windows
+    were kept.
+
+    Uses the module tokenizer, a dedicated instance that is never configured
+    for truncation or padding, so concurrent calls do not mutate it.
+    """
+    query_tokens = len(tokenizer(query, add_special_tokens=False)["input_ids"])
+    # Room for [CLS] query [SEP] [SEP] window [SEP] (4 covers XLM-R style too)
+    window_size = max(32, MAX_LENGTH - query_tokens - 4)
+    stride = max(1, window_size - WINDOW_OVERLAP_TOKENS)
+
+    per_document = []
+    for doc in documents:
+        offsets = tokenizer(
+            doc, add_special_tokens=False, return_offsets_mapping=True
+        )["offset_mapping"]
+        if len(offsets) <= window_size:
+            per_document.append([doc])
+            continue
+        windows = []
+        for begin in range(0, len(offsets), stride):
+            end = min(begin + window_size, len(offsets))
+            windows.append(doc[offsets[begin][0] : offsets[end - 1][1]])
+            if end == len(offsets):
+                break
+        per_document.append(windows)
+
+    selected: List[List[str]] = [[] for _ in documents]
+    budget = max(max_windows, len(documents))
+    depth = 0
+    while budget > 0:
+        progressed = False
+        for i, windows in enumerate(per_document):
+            if depth < len(windows) and budget > 0:
+                selected[i].append(windows[depth])
+                budget -= 1
+                progressed = True
+        if not progressed:
+            break
+        depth += 1
+    complete = [len(s) == len(w) for s, w in zip(selected, per_document)]
+    return selected, complete
+
+
+def aggregate_window_scores(scores: List[float]) -> float:
+    if PASSAGE_AGGREGATION == "top2mean" and len(scores) > 1:
+        top = sorted(scores, reverse=True)[:2]
+        return sum(top) / 2
+    return max(scores)
+
+
+def scorer_id() -> str:
+    """Everything that affects a document's score, for cache keys."""
+    identity = backend_id(RERANK_BACKEND)
+    if PASSAGE_WINDOWING:
+        identity += f"|windows:{MAX_LENGTH}/{WINDOW_OVERLAP_TOKENS}/{PASSAGE_AGGREGATION}"
+    return identity
+
+
+async def _score_uncached(
+    query: str, documents: List[str], deadline: Optional[float]
+) -> Tuple[List[float], int, List[bool]]:
+    """
+    Score documents through the batcher.
+
+    Returns scores, pairs scored and, per document, whether the score covers
+    the whole document. Scores of documents whose windows were cut by the
+    request's window budget depend on the other documents in the request.
+    """
+    if not PASSAGE_WINDOWING:
+        pairs = [[query, doc] for doc in documents]
+        scores = await batcher.submit(pairs, deadline)
+        return scores, len(pairs), [True] * len(documents)
+
+    windows, complete = await asyncio.to_thread(
+        split_windows, query, documents, MAX_WINDOWS_PER_REQUEST
+    )
+    pairs = [[query, window] for doc_windows in windows for window in doc_windows]
+    window_scores = await batcher.submit(pairs, deadline)
+
+    scores = []
+    offset = 0
+    for doc_windows in windows:
+        scores.append(
+            aggregate_window_scores(window_scores[offset : offset + len(doc_windows)])
+        )
+        offset += len(doc_windows)
+    return scores, len(pairs), complete
+
+
+async def score_documents(
+    query: str,
+    documents: List[str],
+    deadline: Optional[float] = None,
+    degrade: bool = False,
+) -> Tuple[List[Optional[float]], dict]:
+    """
+    Score documents against the query, serving repeats from the score cache.
+
+    Only cache misses are sent to the batcher, and only scores that cover the
+    whole document are cached. Returns the scores in document order and stats
+    (cache hits, pairs sent to the model). With degrade, an overloaded batcher
+    leaves the misses as None and stats["degraded"] holds the reason instead
+    of raising OverloadedError.
+    """
+    scores: List[Optional[float]] = [None] * len(documents)
+    keys = [score_cache.make_key(query, doc) for doc in documents]
+    miss_indices = []
+    for i, key in enumerate(keys):
+        cached = score_cache.get(key)
+        if cached is None:
+            miss_indices.append(i)
+        else:
+            scores[i] = cached
+
+    if score_cache.enabled:
+        CACHE_LOOKUPS.labels(result="hit").inc(len(documents) - len(miss_indices))
+        CACHE_LOOKUPS.labels(result="miss").inc(len(miss_indices))
+
+    stats = {"cache_hits": len(documents) - len(miss_indices), "pairs_scored": 0}
+    if miss_indices:
+        try:
+            fresh, stats["pairs_scored"], complete = await _score_uncached(
+                query, [documents[i] for i in miss_indices], deadline
+            )
+        except OverloadedError as e:
+            if not degrade:
+                raise
+            stats["degraded"] = e.reason
+            return scores, stats
+        for i, score, whole in zip(miss_indices, fresh, complete):
+            scores[i] = score
+            if whole:
+                score_cache.put(keys[i], score)
+
+    return scores, stats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load model on startup, cleanup on shutdown."""
-    global model
+    global model, tokenizer, executor, batcher, score_cache
     logger.info(f"Loading reranker model: {MODEL_NAME}")
     start = time.time()
     
     try:
-        model = CrossEncoder(MODEL_NAME, max_length=MAX_LENGTH)
+        executor = InferenceExecutor(INFERENCE_MODE, INFERENCE_WORKERS)
+        if INFERENCE_MODE == "thread":
+            model = _load_model()
+        elif resolve_backend_name(RERANK_BACKEND) != "torch":
+            # Export once here so process workers don't race on the cache dir
+            OnnxBackend.export(resolve_backend_name(RERANK_BACKEND) == "onnx-int8")
+        executor.start()
+        await executor.warmup()
+        if PASSAGE_WINDOWING:
+            # Own instance: the backend's fast tokenizer is reconfigured for
+            # truncation/padding by inference threads and is not safe to share
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
         load_time = time.time() - start
         logger.info(f"Model loaded successfully in {load_time:.2f}s")
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
+        if executor is not None:
+            executor.shutdown()
         raise
-    
+
+    logger.info(
+        f"Inference executor: backend={RERANK_BACKEND}, mode={INFERENCE_MODE}, "
+        f"workers={INFERENCE_WORKERS}, torch_threads={TORCH_THREADS}"
+    )
+
+    batcher = MicroBatcher(
+        executor.run,
+        BATCH_MAX_WAIT_MS,
+        BATCH_MAX_PAIRS,
+        max_queue=INFERENCE_QUEUE_SIZE,
+        concurrency=INFERENCE_WORKERS,
+    )
+    batcher.start()
+    QUEUE_DEPTH.set_function(lambda: batcher.queue_depth if batcher else 0)
+    logger.info(
+        f"Micro-batching enabled (max_wait={BATCH_MAX_WAIT_MS}ms, max_pairs={BATCH_MAX_PAIRS})"
+    )
+
+    score_cache = ScoreCache(SCORE_CACHE_SIZE, scorer_id())
+    CACHE_ENTRIES.set_function(lambda: len(score_cache) if score_cache else 0)
+    snapshot_task = None
+    if score_cache.enabled and SCORE_CACHE_PATH:
+        loaded = score_cache.load(SCORE_CACHE_PATH)
+        logger.info(f"Loaded {loaded} cached scores from {SCORE_CACHE_PATH}")
+        if SCORE_CACHE_SNAPSHOT_INTERVAL_S > 0:
+            snapshot_task = asyncio.create_task(_snapshot_score_cache_periodically())
+
     yield
     
     # Cleanup
     logger.info("Shutting down reranker service")
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    if score_cache.enabled and SCORE_CACHE_PATH:
+        await _save_score_cache()
+    await batcher.stop()
+    executor.shutdown()
 
 
 app = FastAPI(
@@ -64,11 +1114,12 @@ class RerankRequest(BaseModel):
     top_n: Optional[int] = None
     model: Optional[str] = None  # Ignored, we use our loaded model
     return_documents: Optional[bool] = False
+    deadline_ms: Optional[float] = None  # Time budget the caller will still wait
 
 
 class RerankResult(BaseModel):
     index: int
-    relevance_score: float
+    relevance_score: Optional[float]  # None: not scored (degraded response)
     document: Optional[str] = None
 
 
@@ -83,49 +1134,134 @@ async def health():
     return {
         "status": "healthy",
         "model": MODEL_NAME,
-        "loaded": model is not None
+        "backend": RERANK_BACKEND,
+        "loaded": batcher is not None,
+        "inference": {
+            "mode": INFERENCE_MODE,
+            "workers": INFERENCE_WORKERS,
+            "queue_depth": batcher.queue_depth if batcher else 0,
+            "queue_size": INFERENCE_QUEUE_SIZE,
+        },
+        "score_cache": score_cache.stats() if score_cache else None,
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+_benchmark_lock = asyncio.Lock()
+
+
+@app.post("/benchmark")
+async def benchmark(backends: Optional[str] = None, repeats: int = 3):
+    """
+    Admin endpoint: compare scoring backends against the fp32 torch baseline.
+
+    Disabled unless ENABLE_BENCHMARK_ENDPOINT=true. Loads each backend from
+    scratch in a worker thread, so expect it to take a while and to
+    temporarily use extra memory; only one benchmark runs at a time.
+    """
+    if not ENABLE_BENCHMARK_ENDPOINT:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if _benchmark_lock.locked():
+        raise HTTPException(status_code=409, detail="A benchmark is already running")
+    if not 1 <= repeats <= 20:
+        raise HTTPException(status_code=400, detail="repeats must be between 1 and 20")
+
+    names = (backends or "onnx-int8,onnx-fp32").split(",")
+    async with _benchmark_lock:
+        try:
+            fixtures = load_fixtures(BENCHMARK_FIXTURES)
+            return await asyncio.to_thread(run_benchmark, names, fixtures, repeats)
+        except Exception as e:
+            logger.error(f"Benchmark error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/v1/rerank", response_model=RerankResponse)
 @app.post("/v2/rerank", response_model=RerankResponse)  # Cohere v2 compatibility
 @app.post("/rerank", response_model=RerankResponse)
-async def rerank(request: RerankRequest):
+async def rerank(
+    request: RerankRequest,
+    response: Response,
+    x_request_deadline_ms: Optional[float] = Header(default=None),
+):
     """
     Rerank documents based on relevance to query.
     
     Cohere-compatible endpoint that can be used with LightRAG.
-    OPTIMIZATION: Limits documents to MAX_DOCS for CPU performance.
+    OPTIMIZATION: At most MAX_DOCS documents reach the cross-encoder; in
+    cascade mode they are chosen by a BM25 pass over all candidates.
+    Under overload, see OVERLOAD_POLICY.
     """
-    if model is None:
+    if batcher is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     if not request.documents:
         return RerankResponse(results=[], meta={"model": MODEL_NAME})
     
     start_time = time.time()
+    budget_ms = request.deadline_ms or x_request_deadline_ms or DEFAULT_DEADLINE_MS
+    deadline = (
+        asyncio.get_running_loop().time() + budget_ms / 1000 if budget_ms else None
+    )
     
-    # OPTIMIZATION: Limit documents for CPU performance
-    # If too many docs, take first MAX_DOCS (assumes pre-sorted by vector similarity)
-    MAX_DOCS = 30  # Reasonable limit for CPU
     original_count = len(request.documents)
-    documents = request.documents[:MAX_DOCS] if len(request.documents) > MAX_DOCS else request.documents
-    
+    stages = {}
+
     try:
-        # Create query-document pairs for scoring
-        pairs = [[request.query, doc] for doc in documents]
-        
-        # Get relevance scores (batch_size for memory efficiency)
-        scores = model.predict(pairs, show_progress_bar=False, batch_size=8)
-        
-        # Create results with index and score
+        # OPTIMIZATION: Limit documents for CPU performance
+        if original_count > MAX_DOCS and RERANK_MODE == "cascade":
+            stage_start = time.time()
+            candidate_indices = await asyncio.to_thread(
+                cascade_prefilter,
+                request.query,
+                request.documents,
+                MAX_DOCS,
+                CASCADE_KEEP_HEAD,
+            )
+            stages["bm25"] = {
+                "documents_in": original_count,
+                "documents_out": len(candidate_indices),
+                "latency_ms": round((time.time() - stage_start) * 1000, 1),
+            }
+        else:
+            # Take first MAX_DOCS (assumes pre-sorted by vector similarity)
+            candidate_indices = list(range(min(original_count, MAX_DOCS)))
+        documents = [request.documents[i] for i in candidate_indices]
+
+        # Get relevance scores (cached, or coalesced with concurrent requests)
+        stage_start = time.time()
+        scores, score_stats = await score_documents(
+            request.query, documents, deadline, degrade=OVERLOAD_POLICY == "degrade"
+        )
+        degraded = score_stats.get("degraded")
+        if degraded:
+            response.headers["X-Rerank-Degraded"] = "true"
+        cache_hits = score_stats["cache_hits"]
+        stages["cross_encoder"] = {
+            "documents_in": len(documents),
+            "cache_hits": cache_hits,
+            "pairs_scored": score_stats["pairs_scored"],
+            "latency_ms": round((time.time() - stage_start) * 1000, 1),
+        }
+
+        # Create results with the caller's original index and score
         results = [
-            {"index": i, "score": float(score)}
+            {
+                "index": candidate_indices[i],
+                "score": None if score is None else float(score),
+            }
             for i, score in enumerate(scores)
         ]
         
-        # Sort by score descending
-        results.sort(key=lambda x: x["score"], reverse=True)
+        # Sort by score descending; unscored documents follow in vector order
+        results.sort(
+            key=lambda x: (x["score"] is not None, x["score"] or 0.0), reverse=True
+        )
         
         # Apply top_n limit
         top_n = request.top_n or 10
@@ -139,11 +1275,21 @@ async def rerank(request: RerankRequest):
                 relevance_score=r["score"]
             )
             if request.return_documents:
-                result.document = documents[r["index"]]
+                result.document = request.documents[r["index"]]
             formatted_results.append(result)
         
         latency_ms = (time.time() - start_time) * 1000
-        logger.info(f"Reranked {len(documents)} docs (from {original_count}) in {latency_ms:.1f}ms")
+        REQUEST_LATENCY.observe(latency_ms / 1000)
+        REQUESTS.labels(outcome="degraded" if degraded else "ok").inc()
+        DOCUMENTS_RECEIVED.inc(original_count)
+        DOCUMENTS_PROCESSED.inc(len(documents))
+        if original_count > MAX_DOCS:
+            DOCUMENTS_LIMITED.inc()
+        logger.info(
+            f"Reranked {len(documents)} docs (from {original_count}, "
+            f"{cache_hits} cached) in {latency_ms:.1f}ms"
+            + (f" [degraded: {degraded}]" if degraded else "")
+        )
         
         return RerankResponse(
             results=formatted_results,
@@ -152,16 +1298,35 @@ async def rerank(request: RerankRequest):
                 "latency_ms": round(latency_ms, 1),
                 "documents_processed": len(documents),
                 "documents_received": original_count,
-                "documents_limited": original_count > MAX_DOCS
+                "documents_limited": original_count > MAX_DOCS,
+                "rerank_mode": RERANK_MODE,
+                "cache_hits": cache_hits,
+                "stages": stages,
+                "degraded": degraded,
+                "unscored": sum(score is None for score in scores),
             }
         )
-        
+
+    except OverloadedError as e:
+        REQUESTS.labels(outcome="rejected").inc()
+        logger.warning(f"Rejected rerank request ({e.status_code}): {e.reason}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.reason,
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after_s)))},
+        )
+
     except Exception as e:
+        REQUESTS.labels(outcome="error").inc()
         logger.error(f"Reranking error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-if __name__ == "__main__":
+if __name__ == "__main__" and sys.argv[1:2] == ["benchmark"]:
+    fixtures_path = sys.argv[2] if len(sys.argv) > 2 else BENCHMARK_FIXTURES
+    report = run_benchmark(["onnx-int8", "onnx-fp32"], load_fixtures(fixtures_path))
+    print(json.dumps(report, indent=2))
+elif __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8080"))
     uvicorn.run(app, host="0.0.0.0", port=port)